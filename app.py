@@ -1,8 +1,23 @@
+import os
 import streamlit as st
 import pandas as pd
 from data_utils import (
-    load_data, create_leaderboard, get_top_models_by_category, 
-    get_summary_stats, get_all_models, create_mini_leaderboard  
+    DEFAULT_MLFLOW_TRACKING_URI, LIVE_DATA, load_data, create_leaderboard, create_all_leaderboards, empty_leaderboard,
+    get_summary_stats, get_all_models, create_mini_leaderboard, calculate_elo_history
+)
+from decayed_ratings import DecayedRatings
+from comparison_scheduler import DEFAULT_BATCH, schedule_comparisons
+from exports import EXPORT_FORMATS, EXPORT_MIME_TYPES, export_bytes, export_filename, export_leaderboards, export_matches
+from match_cube import MatchCube
+from page_style import (
+    APP_CSS, CARD_CLOSE_HTML, COMING_SOON_HTML, LEADERBOARD_DISPLAY_COLUMNS, category_card_open_html, top_model_rows_html
+)
+from shared_dataset import SharedDataset
+from mapped_dataset import attach_or_publish, deployment_id, expire_shared_dataset, shared_dataset_path
+from artifacts import ARTIFACTS_FILENAME, compute_data_fingerprint, load_artifacts, load_matching_artifacts
+from snapshot_store import (
+    attach_snapshot_dataset, current_version, load_category_partition, load_manifest, load_snapshot,
+    load_snapshot_cube, snapshot_pointer_key, version_path
 )
 
 # Page configuration
@@ -41,135 +56,274 @@ def require_company_login():
         st.button("Log out", on_click=st.logout, use_container_width=True)
         st.stop()
 
-# Custom CSS for modern styling
-st.markdown("""
-<style>
-    .category-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 1.5rem;
-        border-radius: 16px;
-        margin: 1rem 0;
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-        color: white;
-        position: relative;
-        overflow: hidden;
-    }
-    .category-card::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        bottom: 0;
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(10px);
-        z-index: 0;
-    }
-    .category-content {
-        position: relative;
-        z-index: 1;
-    }
-    .category-title {
-        font-size: 1.5rem;
-        font-weight: 700;
-        margin-bottom: 1rem;
-        display: flex;
-        align-items: center;
-        gap: 0.5rem;
-    }
-
-    .model-row {
-        background: rgba(255, 255, 255, 0.15);
-        padding: 0.75rem;
-        border-radius: 12px;
-        margin: 0.5rem 0;
-        backdrop-filter: blur(5px);
-        border: 1px solid rgba(255, 255, 255, 0.2);
-    }
-    .rank-badge {
-        background: linear-gradient(45deg, #ff6b6b, #ffa500);
-        color: white;
-        padding: 0.4rem 0.8rem;
-        border-radius: 20px;
-        font-size: 0.8rem;
-        font-weight: 700;
-        text-shadow: 0 1px 2px rgba(0, 0, 0, 0.2);
-        box-shadow: 0 2px 8px rgba(0, 0, 0, 0.15);
-        display: inline-flex;
-        align-items: center;
-        justify-content: center;
-        min-width: 2rem;
-    }
-    .rank-1 { background: linear-gradient(45deg, #ffd700, #ffed4e); color: #333; }
-    .rank-2 { background: linear-gradient(45deg, #c0c0c0, #e5e5e5); color: #333; }
-    .rank-3 { background: linear-gradient(45deg, #cd7f32, #daa520); color: white; }
-    .view-all-btn {
-        background: rgba(255, 255, 255, 0.2);
-        border: 1px solid rgba(255, 255, 255, 0.3);
-        color: white;
-        padding: 0.5rem 1rem;
-        border-radius: 25px;
-        font-weight: 600;
-        cursor: pointer;
-        transition: all 0.3s ease;
-        backdrop-filter: blur(5px);
-    }
-    .view-all-btn:hover {
-        background: rgba(255, 255, 255, 0.3);
-        transform: translateY(-1px);
-        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.15);
-    }
-    .nav-button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        padding: 0.75rem 1.5rem;
-        border-radius: 12px;
-        font-weight: 600;
-        margin: 0.25rem;
-        cursor: pointer;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3);
-    }
-    .nav-button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 6px 20px rgba(102, 126, 234, 0.4);
-    }
-         .nav-button.active {
-         background: linear-gradient(135deg, #ff6b6b 0%, #ffa500 100%);
-         box-shadow: 0 4px 15px rgba(255, 107, 107, 0.3);
-     }
-     .button-container .stButton > button {
-         background: rgba(255, 255, 255, 0.2) !important;
-         border: 1px solid rgba(255, 255, 255, 0.4) !important;
-         color: white !important;
-         border-radius: 20px !important;
-         font-weight: 600 !important;
-         font-size: 0.9rem !important;
-         padding: 8px 16px !important;
-         transition: all 0.2s ease !important;
-         box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1) !important;
-         backdrop-filter: blur(5px) !important;
-     }
-     .button-container .stButton > button:hover {
-         background: rgba(255, 255, 255, 0.3) !important;
-         transform: translateY(-1px) !important;
-         box-shadow: 0 4px 12px rgba(0, 0, 0, 0.15) !important;
-     }
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS for modern styling (shared with the static site)
+st.markdown(f"<style>{APP_CSS}</style>", unsafe_allow_html=True)
 
 def load_app_data(use_mlflow=True):
     """Load and cache the data."""
     return load_data(use_mlflow=use_mlflow)
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes when using MLflow
+LIVE_DATA_TTL = 300  # Seconds; cache for 5 minutes when using MLflow
+
+# Workers of this deployment share one dataset file; other checkouts or tracking servers on the host get their own
+DEPLOYMENT_ID = deployment_id(os.getenv("MLFLOW_TRACKING_URI", DEFAULT_MLFLOW_TRACKING_URI), 'leaderboard_data.json')
+SHARED_DATASET_PATH = shared_dataset_path(DEPLOYMENT_ID)
+
+@st.cache_resource(ttl=LIVE_DATA_TTL, max_entries=2)
+def get_live_dataset(use_mlflow=True, generation=0):
+    """
+    Process-wide read-only dataset, shared by reference instead of unpickled per call.
+
+    MLflow data is loaded by one worker per host and memory-mapped by the rest
+    (see mapped_dataset.py), so more workers do not mean more copies.
+    generation is LIVE_DATA.generation: it goes up when MLflow data arrives
+    after the saved data file was served for being over the latency budget.
+    """
+    if use_mlflow:
+        # The arrived MLflow data replaces the saved data this worker published
+        mapped = attach_or_publish(lambda: load_app_data(use_mlflow=True), SHARED_DATASET_PATH, LIVE_DATA_TTL,
+                                   replace=LIVE_DATA.has_upgrade(), source=lambda: LIVE_DATA.last_source,
+                                   deployment=DEPLOYMENT_ID)
+        if mapped is not None:
+            return SharedDataset.from_mapped(mapped)
+    df = load_app_data(use_mlflow=use_mlflow)
+    return SharedDataset(df, source=LIVE_DATA.last_source if use_mlflow else LIVE_DATA.fallback_name)
+
+@st.cache_resource(max_entries=2)
+def get_snapshot_mapped(snapshot_key):
+    """The current snapshot's memory-mapped dataset, or None for snapshots published without one."""
+    return attach_snapshot_dataset()
+
+@st.cache_resource(max_entries=2)
+def get_snapshot_dataset(snapshot_key):
+    """Data of the current snapshot. snapshot_key (the pointer's mtime) changes with every new version."""
+    mapped = get_snapshot_mapped(snapshot_key)
+    if mapped is not None:
+        return SharedDataset.from_mapped(mapped)
+    return SharedDataset(load_snapshot())
+
+def get_cached_dataset(use_mlflow=True):
+    """
+    The shared match dataset, preferring the latest snapshot published by `update_data.py --watch`.
+
+    Checking for a new snapshot is one stat() call, so every rerun picks up new
+    versions without re-reading anything until the pointer actually moves.
+    """
+    snapshot_key = snapshot_pointer_key()
+    if snapshot_key is not None:
+        return get_snapshot_dataset(snapshot_key)
+    return get_live_dataset(use_mlflow=use_mlflow, generation=LIVE_DATA.generation)
+
 def get_cached_data(use_mlflow=True):
-    """Cache data loading for better performance."""
-    return load_app_data(use_mlflow=use_mlflow)
+    """The match data as a zero-copy view of the shared dataset."""
+    return get_cached_dataset(use_mlflow=use_mlflow).frame()
 
-def get_data_source_info():
-    """Determine what data source is being used."""
+@st.cache_data(ttl=LIVE_DATA_TTL, max_entries=2)
+def get_live_artifacts(use_mlflow=True, generation=0):
+    """Precomputed leaderboards from update_data.py, or None if they weren't built from the current data."""
+    return load_matching_artifacts(get_live_dataset(use_mlflow=use_mlflow, generation=generation).frame())
+
+@st.cache_data(max_entries=2)
+def get_snapshot_artifacts(snapshot_key):
+    """Precomputed leaderboards stored alongside the current snapshot."""
+    manifest = get_snapshot_manifest(snapshot_key)
+    if manifest is None:
+        return None
+    # Both files come from the same publish, so comparing fingerprints avoids reading the match data
+    artifacts = load_artifacts(os.path.join(version_path(manifest['snapshot']), ARTIFACTS_FILENAME))
+    if artifacts is None or artifacts['fingerprint'] != manifest['fingerprint']:
+        return None
+    return artifacts
+
+def get_cached_artifacts(use_mlflow=True):
+    """Precomputed leaderboards matching get_cached_data, or None to compute live."""
+    snapshot_key = snapshot_pointer_key()
+    if snapshot_key is not None:
+        return get_snapshot_artifacts(snapshot_key)
+    return get_live_artifacts(use_mlflow=use_mlflow, generation=LIVE_DATA.generation)
+
+@st.cache_data(max_entries=2)
+def get_snapshot_manifest(snapshot_key):
+    """Categories, counts and summary stats of the current snapshot, without any match data."""
+    return load_manifest()
+
+def get_cached_manifest():
+    """The current snapshot's manifest, or None when there is no partitioned snapshot."""
+    snapshot_key = snapshot_pointer_key()
+    if snapshot_key is None:
+        return None
+    return get_snapshot_manifest(snapshot_key)
+
+@st.cache_resource(max_entries=32)
+def get_snapshot_category_dataset(snapshot_key, category):
+    """One category's partition of the current snapshot, shared read-only."""
+    mapped = get_snapshot_mapped(snapshot_key)
+    if mapped is not None and category in mapped.categories:
+        return SharedDataset.from_mapped(mapped, category)
+    return SharedDataset(load_category_partition(category, get_snapshot_manifest(snapshot_key)))
+
+def get_category_dataset(category, use_mlflow=True):
+    """
+    The shared dataset holding a category's matches: only that category's partition
+    when a snapshot has one, otherwise the full dataset.
+    """
+    snapshot_key = snapshot_pointer_key()
+    if snapshot_key is not None and get_snapshot_manifest(snapshot_key) is not None:
+        return get_snapshot_category_dataset(snapshot_key, category)
+    return get_cached_dataset(use_mlflow=use_mlflow)
+
+@st.cache_resource(max_entries=2)
+def get_snapshot_cube(snapshot_key):
+    """The current snapshot's match cube, aggregated from its data if it was published without one."""
+    cube = load_snapshot_cube()
+    return cube if cube is not None else MatchCube.from_frame(get_snapshot_dataset(snapshot_key).frame())
+
+def get_cached_cube(use_mlflow=True):
+    """Match counts per day, category and model pair, for filtered leaderboards (see match_cube.py)."""
+    snapshot_key = snapshot_pointer_key()
+    if snapshot_key is not None:
+        return get_snapshot_cube(snapshot_key)
+    dataset = get_live_dataset(use_mlflow=use_mlflow, generation=LIVE_DATA.generation)
+    return dataset.derived(('cube',), MatchCube.from_frame)
+
+def refresh_data():
+    """Drop every cached dataset and derived result so the next run reloads (button callback)."""
+    st.cache_data.clear()
+    expire_shared_dataset(SHARED_DATASET_PATH)
+    get_live_dataset.clear()
+    get_snapshot_mapped.clear()
+    get_snapshot_dataset.clear()
+    get_snapshot_category_dataset.clear()
+    get_snapshot_cube.clear()
+    get_decayed_ratings.clear()
+
+# Ranking views selectable on the overview and task pages
+ALL_TIME_VIEW = "All-time"
+RECENT_VIEW = "Recent (time-decayed)"
+HALF_LIFE_OPTIONS = [7, 14, 30, 60, 90, 180]
+
+@st.cache_resource
+def get_decayed_ratings(half_life_days, scope=None, source=None):
+    """
+    Process-wide decayed rating tracker for one half-life, fed incrementally.
+    
+    scope names the data the tracker is fed: None for the full dataset, or a
+    category when only that category's matches are fed. source is the
+    dataset's source, so data from MLflow and the saved data file never mix.
+    """
+    return DecayedRatings(half_life_days=half_life_days)
+
+def get_decayed_leaderboards(dataset, half_life_days, scope=None):
+    """
+    Feed the dataset's new matches to the tracker and return its decayed leaderboards as of now.
+    
+    The tracker outlives dataset versions: a new snapshot or live refresh only
+    feeds the appended rows, and the tracker rebuilds itself if rows were
+    backfilled (see DecayedRatings.update_from_frame).
+    """
+    tracker = get_decayed_ratings(half_life_days, scope, dataset.source)
+    tracker.update_from_frame(dataset.category(scope) if scope else dataset.frame())
+    return tracker.leaderboards(as_of=pd.Timestamp.now(tz='UTC'))
+
+def render_ranking_view_controls():
+    """Render the ranking view selector. Returns the half-life in days, or None for all-time."""
+    view = st.radio("Ranking view", [ALL_TIME_VIEW, RECENT_VIEW], horizontal=True, key="ranking_view")
+    if view != RECENT_VIEW:
+        return None
+    
+    half_life_days = st.select_slider("Half-life (days)", options=HALF_LIFE_OPTIONS, value=30, key="half_life_days")
+    st.caption(f"A match from {half_life_days} days ago counts half as much as today's. "
+               "Wins and matches are shown as effective (weighted) counts.")
+    return half_life_days
+
+def render_match_filters(cube):
+    """
+    Render the date-range and model filters.
+
+    Returns:
+        tuple or None: (start date, end date, models or None) when a filter is set, None for all matches
+    """
+    bounds = cube.date_bounds()
+    if bounds is None:
+        return None
+    
+    with st.expander("Filter matches"):
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            dates = st.date_input("Date range", value=bounds, min_value=bounds[0], max_value=bounds[1],
+                                  key="filter_dates")
+        with col2:
+            models = st.multiselect("Models", sorted(cube.models), key="filter_models", placeholder="All models",
+                                    help="Only matches between two of the selected models")
+    
+    # While the second date is being picked the range has only a start
+    start, end = (tuple(dates) + (bounds[1],))[:2] if dates else bounds
+    if (start, end) == bounds and not models:
+        return None
+    return start, end, (models or None)
+
+def render_filter_caption(match_filter):
+    """Explain what a filtered leaderboard shows."""
+    start, end, models = match_filter
+    scope = f"{len(models)} selected models" if models else "all models"
+    st.caption(f"Filtered to matches from {start:%Y-%m-%d} to {end:%Y-%m-%d} between {scope}. "
+               "ELO and Glicko-2 depend on the order of every match and are only shown unfiltered.")
+
+def render_export_controls(dataset, category, leaderboard, match_filter):
+    """
+    Download buttons for a category's matches and its leaderboard as shown.
+
+    The files are only built when "Prepare export" is clicked, a chunk at a
+    time (see exports.py); the active date and model filters apply to both.
+    The prepared files are kept in the session until the format, filters or
+    data change. The data is identified by its fingerprint, computed once per
+    data version, so new data with the same row count is never served stale.
+    """
+    df = dataset.category(category)
+    fingerprint = dataset.derived(('fingerprint', category), lambda frame: compute_data_fingerprint(df))
+    start, end, models = match_filter or (None, None, None)
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
+    with col1:
+        fmt = st.selectbox("Export format", EXPORT_FORMATS, key="export_format",
+                           format_func=lambda name: name.upper(), label_visibility="collapsed")
+    export_key = (category, fmt, start, end, tuple(models or ()), fingerprint)
+    with col2:
+        if st.button("📦 Prepare export", key="prepare_export", use_container_width=True):
+            st.session_state.prepared_export = {
+                'key': export_key,
+                'matches': export_bytes(export_matches(df, fmt, category=category, start=start, end=end,
+                                                       models=models)),
+                'leaderboard': export_bytes(export_leaderboards(df, fmt, category=category,
+                                                                leaderboards={category: leaderboard})),
+            }
+
+    prepared = st.session_state.get('prepared_export')
+    if not prepared or prepared['key'] != export_key:
+        return
+    with col3:
+        st.download_button(
+            "⬇️ Matches",
+            data=prepared['matches'],
+            file_name=export_filename("matches", fmt, category),
+            mime=EXPORT_MIME_TYPES[fmt],
+            use_container_width=True,
+        )
+    with col4:
+        st.download_button(
+            "⬇️ Leaderboard",
+            data=prepared['leaderboard'],
+            file_name=export_filename("leaderboard", fmt, category),
+            mime=EXPORT_MIME_TYPES[fmt],
+            use_container_width=True,
+        )
+
+def select_page(page):
+    """Switch the page shown in the page fragment (used as a button callback)."""
+    st.session_state.selected_page = page
+
+@st.cache_resource
+def get_available_sources():
+    """Whether mlflow can be imported and whether the saved data file exists (checked once per process)."""
     import os
     
     # Check if we can import mlflow (indicates MLflow is available)
@@ -181,9 +335,30 @@ def get_data_source_info():
     
     # Check if saved data file exists
     saved_data_exists = os.path.exists('leaderboard_data.json')
+    return mlflow_available, saved_data_exists
+
+def get_data_source_info():
+    """Determine what data source is being used (on every run, since the hedged loader can switch sources)."""
+    mlflow_available, saved_data_exists = get_available_sources()
+    
+    # What the served dataset was loaded from; attached processes read it from the published file's header
+    served_source = LIVE_DATA.last_source
+    if snapshot_pointer_key() is None:
+        served_source = get_live_dataset(generation=LIVE_DATA.generation).source or served_source
     
     # Determine likely data source
-    if mlflow_available:
+    if served_source == LIVE_DATA.fallback_name:
+        live_stats = LIVE_DATA.stats[LIVE_DATA.live_name]
+        if LIVE_DATA.last_source != LIVE_DATA.fallback_name:
+            reason = "Another app process loaded it while MLflow was unavailable"
+        elif live_stats.cooling_down():
+            reason = f"MLflow is slow or failing; retrying in {live_stats.as_dict()['cooldown_remaining']:.0f}s"
+        elif LIVE_DATA.awaiting_live():
+            reason = f"MLflow is slower than the {LIVE_DATA.budget:g}s budget; live data will replace this when it arrives"
+        else:
+            reason = "MLflow returned no data"
+        return "saved", "📁 Saved Data File", f"Using cached data file (leaderboard_data.json). {reason}"
+    elif served_source == LIVE_DATA.live_name or mlflow_available:
         return "live", "🔴 Live MLflow Data", "Loading fresh data from MLflow experiments"
     elif saved_data_exists:
         return "saved", "📁 Saved Data File", "Using cached data file (leaderboard_data.json)"
@@ -191,114 +366,36 @@ def get_data_source_info():
         return "none", "⚠️ No Data Source", "No MLflow connection or saved data file found"
 
 def render_task_category_card(category, top_models, coming_soon=False):
-    """Render a modern task category card with top models."""
-    # Category-specific styling and emojis
-    category_config = {
-        'Extract Dramatis': {'emoji': '🎭', 'icon': '👥'},
-        'Extract Claims': {'emoji': '📋', 'icon': '⚖️'},
-        'Summarize Relief': {'emoji': '📝', 'icon': '⚡'}
-    }
-    
-    config = category_config.get(category, {'emoji': '📊', 'icon': '🔍'})
-    
-    # Apply coming soon styling
-    if coming_soon:
-        card_style = '''
-            background: linear-gradient(135deg, #9ca3af 0%, #6b7280 100%);
-            opacity: 0.7;
-            filter: grayscale(0.3);
-        '''
-    else:
-        if category == 'Extract Dramatis':
-            card_style = 'background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);'
-        elif category == 'Extract Claims':
-            card_style = 'background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);'
-        elif category == 'Summarize Relief':
-            card_style = 'background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);'
-        else:
-            card_style = 'background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);'
-    
-    st.markdown(f'''
-        <div class="category-card" style="{card_style}">
-            <div class="category-content">
-                <div class="category-title">
-                    <span style="font-size: 2rem;">{config['emoji']}</span>
-                    <span>{category}</span>
-                    <span style="font-size: 1.2rem; opacity: 0.8;">{config['icon']}</span>
-                    {f'<span style="font-size: 0.9rem; opacity: 0.7; margin-left: 0.5rem;">• Coming Soon</span>' if coming_soon else ''}
-                
-    ''', unsafe_allow_html=True)
+    """Render a modern task category card with top models (markup shared with the static site)."""
+    st.markdown(category_card_open_html(category, coming_soon), unsafe_allow_html=True)
     
     if coming_soon:
-        # Coming soon content
-        st.markdown('''
-            <div style="text-align: center; padding: 2rem 0;">
-                <div style="font-size: 3rem; opacity: 0.6; margin-bottom: 1rem;">🚧</div>
-                <div style="font-size: 1.2rem; font-weight: 600; margin-bottom: 0.5rem;">Coming Soon</div>
-                <div style="font-size: 0.9rem; opacity: 0.8;">Vision task evaluations are being prepared</div>
-            </div>
-        ''', unsafe_allow_html=True)
+        st.markdown(COMING_SOON_HTML, unsafe_allow_html=True)
     else:
         # Top models
-        for i, model_data in enumerate(top_models[:3]):
-            rank = model_data['rank'] 
-            model = model_data['model']
-            win_rate = model_data['win_rate']
-            matches = model_data['total_matches']
-            elo = model_data['elo_rating']
-            
-            # Rank-specific styling
-            rank_class = f"rank-{rank}" if rank <= 3 else "rank-badge"
-            medal = "🥇" if rank == 1 else "🥈" if rank == 2 else "🥉" if rank == 3 else ""
-
-            
-            
-            
-            st.markdown(f'''
-                <div class="model-row">
-                    <div style="display: flex; justify-content: space-between; align-items: center;">
-                        <div style="display: flex; align-items: center; gap: 0.75rem;">
-                            <span class="rank-badge {rank_class}">{medal}#{rank}</span>
-                            <span style="font-weight: 600; font-size: 1rem;">{model}</span>
-                        </div>
-                        <div style="text-align: right; opacity: 0.9;">
-                            <div style="font-weight: 700; font-size: 1.1rem;">{win_rate}%</div>
-                            <div style="font-size: 0.8rem; opacity: 0.8;">{matches} matches • ELO {elo}</div>
-                        </div>
-                    </div>
-                </div>
-            ''', unsafe_allow_html=True)
+        for row_html in top_model_rows_html(top_models):
+            st.markdown(row_html, unsafe_allow_html=True)
         
         # Custom styled View All button container
         st.markdown('<div class="button-container">', unsafe_allow_html=True)
         col1, col2, col3 = st.columns([1, 1, 1])
         with col2:
-            if st.button("View Detailed Rankings", key=f"btn_{category}", help=f"See full {category} leaderboard"):
-                st.session_state.selected_page = category
-                st.rerun()
+            st.button("View Detailed Rankings", key=f"btn_{category}", help=f"See full {category} leaderboard",
+                      on_click=select_page, args=(category,))
         st.markdown('</div>', unsafe_allow_html=True)
     
-    st.markdown('</div></div>', unsafe_allow_html=True)
+    st.markdown(CARD_CLOSE_HTML, unsafe_allow_html=True)
 
-def render_mini_leaderboard(category, df):
+def render_mini_leaderboard(category, category_leaderboard):
     """Render a mini leaderboard for a specific task category."""
-    from data_utils import create_leaderboard
-    
     st.markdown(f"**{category}**")
     
-    # Create complete leaderboard for this category
-    category_leaderboard = create_leaderboard(df, category)
-    
-    if not category_leaderboard:
+    if category_leaderboard.empty:
         st.info(f"No data available")
         return
     
-    # Create a proper DataFrame with the correct columns
-    display_df = pd.DataFrame(category_leaderboard)
-    
-    # Select and rename only the columns we want to show
-    mini_df = display_df[['rank', 'model', 'win_rate']].copy()
-    mini_df.columns = ['Rank', 'Model', 'Win Rate (%)']
+    # Select and rename only the columns we want to show (no copy of the table)
+    mini_df = category_leaderboard[['rank', 'model', 'win_rate']].rename(columns=LEADERBOARD_DISPLAY_COLUMNS)
     
     st.dataframe(
         mini_df,
@@ -316,21 +413,56 @@ def render_mini_leaderboard(category, df):
     )
     
     # Add a "View Details" button with unique key
-    if st.button(f"View Full {category} Leaderboard →", key=f"mini_btn_{category}", help=f"See detailed {category} rankings", use_container_width=True):
-        st.session_state.selected_page = category
-        st.rerun()
+    st.button(f"View Full {category} Leaderboard →", key=f"mini_btn_{category}", help=f"See detailed {category} rankings", use_container_width=True,
+              on_click=select_page, args=(category,))
 
-def render_overview_page():
-    """Render the main overview page."""
-    # Always use MLflow data
-    use_mlflow = True
-    st.session_state.use_mlflow = use_mlflow
+def render_leaderboard_table(leaderboard):
+    """Render a full leaderboard table straight from the engine's columnar output."""
+    # Column selection and renaming share the table's memory, so no row is copied or rebuilt
+    display_df = leaderboard[list(LEADERBOARD_DISPLAY_COLUMNS)].rename(columns=LEADERBOARD_DISPLAY_COLUMNS)
     
+    st.dataframe(
+        display_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Rank": st.column_config.NumberColumn("Rank", width="small"),
+            "Tier": st.column_config.NumberColumn(
+                "Tier",
+                help="Models sharing a tier are statistically tied (head-to-head binomial tests, Holm-corrected, α = 0.05)",
+                width="small"
+            ),
+            "Win Rate (%)": st.column_config.ProgressColumn(
+                "Win Rate (%)",
+                min_value=0,
+                max_value=100,
+                format="%.1f%%"
+            ),
+            "95% CI (±)": st.column_config.TextColumn(
+                "95% CI (±)",
+                help="95% confidence interval for win rate (margin of error format)",
+                width="medium"
+            ),
+            "ELO Rating": st.column_config.NumberColumn("ELO Rating", width="medium"),
+            "Glicko-2": st.column_config.NumberColumn(
+                "Glicko-2",
+                help="Glicko-2 rating from daily rating periods (not available in the time-decayed view)",
+                width="small"
+            ),
+            "RD (±)": st.column_config.NumberColumn(
+                "RD (±)",
+                help="Glicko-2 rating deviation: the rating's uncertainty, large for models with few matches",
+                width="small"
+            )
+        }
+    )
+
+def render_data_source_sidebar(source_info):
+    """Render the data source status in the sidebar, given get_data_source_info()'s result for this run."""
     st.sidebar.markdown("---")
     st.sidebar.markdown("### Data Source")
     
-    # Get data source information
-    source_type, source_title, source_description = get_data_source_info()
+    source_type, source_title, source_description = source_info
     
     if source_type == "live":
         st.sidebar.success(f"**{source_title}**")
@@ -354,20 +486,49 @@ def render_overview_page():
         st.sidebar.error(f"**{source_title}**")
         st.sidebar.warning(source_description)
     
-    df = get_cached_data(use_mlflow=use_mlflow)
+    live_stats = LIVE_DATA.stats[LIVE_DATA.live_name]
+    if live_stats.loads:
+        st.sidebar.caption(
+            f"MLflow: last load {live_stats.last_latency:.1f}s, average {live_stats.mean_latency:.1f}s, "
+            f"{live_stats.failures} failed and {live_stats.over_budget} over budget of {live_stats.loads}"
+        )
+    if LIVE_DATA.awaiting_live():
+        with st.sidebar:
+            watch_live_upgrade(LIVE_DATA.generation)
+
+    snapshot_version = current_version()
+    if snapshot_version is not None:
+        st.sidebar.caption(f"Snapshot: {snapshot_version}")
+
+@st.fragment(run_every=2)
+def watch_live_upgrade(generation):
+    """Rerun the app as soon as MLflow data that was over the latency budget arrives."""
+    if LIVE_DATA.generation != generation:
+        st.rerun(scope="app")
+    st.caption("⏳ Waiting for live MLflow data...")
+
+def render_overview_page():
+    """Render the main overview page."""
+    # Always use MLflow data
+    use_mlflow = True
+    st.session_state.use_mlflow = use_mlflow
+    
+    # A partitioned snapshot's manifest lists categories and stats without loading matches
+    manifest = get_cached_manifest()
+    df = None if manifest is not None else get_cached_data(use_mlflow=use_mlflow)
     
     # Check if we have any data
-    if df.empty:
+    if (manifest is not None and not manifest['categories']) or (df is not None and df.empty):
         st.warning("No data available. Please check your MLflow connection.")
         st.info("Verify that your MLflow experiments contain evaluation data.")
         return
     
     # Define active categories from MLflow data
-    active_categories = []
-    if not df.empty:
+    if manifest is not None:
+        active_categories = list(manifest['categories'])
+    else:
         # Get actual categories from the data
-        available_categories = df['task_category'].unique().tolist()
-        active_categories = available_categories
+        active_categories = df['task_category'].unique().tolist()
     
     # Define categories we know about from MLflow
     expected_categories = ['Extract Dramatis', 'Extract Claims', 'Summarize Relief']
@@ -378,43 +539,70 @@ def render_overview_page():
     st.markdown("**Compare AI model performance across different task categories**")
     
     # Summary stats (only active categories)
-    active_df = df[df['task_category'].isin(active_categories)]
-    
-    if active_df.empty:
-        st.warning(f"No data found for categories: {', '.join(active_categories)}")
-        if use_mlflow:
-            available_categories = df['task_category'].unique().tolist()
-            st.info(f"Available categories in your data: {', '.join(available_categories)}")
-            st.info("Check if your MLflow experiment has runs with the expected task categories.")
-        return
+    active_df = None
+    if df is not None:
+        active_df = df[df['task_category'].isin(active_categories)]
+        
+        if active_df.empty:
+            st.warning(f"No data found for categories: {', '.join(active_categories)}")
+            if use_mlflow:
+                available_categories = df['task_category'].unique().tolist()
+                st.info(f"Available categories in your data: {', '.join(available_categories)}")
+                st.info("Check if your MLflow experiment has runs with the expected task categories.")
+            return
+    
+    artifacts = get_cached_artifacts(use_mlflow=use_mlflow)
+    
+    if manifest is not None:
+        stats = manifest['summary_stats']
+    else:
+        stats = artifacts['summary_stats'] if artifacts else get_summary_stats(active_df)
+    # Filled in once the filters below are known
+    metrics_row = st.container()
     
-    stats = get_summary_stats(active_df)
-    col1, col2, col3, col4 = st.columns(4)
+    st.markdown("---")
     
-    with col1:
-        st.metric("Total Matches", stats['total_matches'])
-    with col2:
-        st.metric("Active Models", stats['unique_models'])
-    with col3:
-        st.metric("Active Tasks", len(active_categories))
-
+    half_life_days = render_ranking_view_controls()
+    match_filter = None
+    if not half_life_days:
+        cube = get_cached_cube(use_mlflow=use_mlflow)
+        match_filter = render_match_filters(cube)
+    
+    if match_filter:
+        # Filtered boards are sums of cube cells, without touching the match rows
+        start, end, models = match_filter
+        stats = cube.slice(start, end, categories=active_categories, models=models).summary_stats()
+        leaderboards = cube.leaderboards(start, end, models)
+    elif half_life_days:
+        leaderboards = get_decayed_leaderboards(get_cached_dataset(use_mlflow=use_mlflow), half_life_days)
+    elif artifacts:
+        leaderboards = artifacts['leaderboards']
+    else:
+        # Every category board plus the overall board from a single pass, shared until the data changes
+        leaderboards = get_cached_dataset(use_mlflow=use_mlflow).derived(('leaderboards',), create_all_leaderboards)
     
-    st.markdown("---")
+    with metrics_row:
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Total Matches", stats['total_matches'])
+        with col2:
+            st.metric("Active Models", stats['unique_models'])
+        with col3:
+            st.metric("Active Tasks", len(active_categories))
     
     # Task Leaderboards section
     if active_categories:
         st.subheader("Task Leaderboards")
         st.markdown("**Performance rankings for each task category**")
         
-        top_models_by_category = get_top_models_by_category(active_df)
-        
         # Create columns for mini leaderboards
         mini_cols = st.columns(len(active_categories))
         
         for i, category in enumerate(active_categories):
             with mini_cols[i]:
-                if category in top_models_by_category:
-                    render_mini_leaderboard(category, active_df)
+                if category in leaderboards:
+                    render_mini_leaderboard(category, leaderboards[category])
 
 
 
@@ -423,103 +611,106 @@ def render_overview_page():
     
     # Overall leaderboard (only active categories)
     st.subheader("Overall Leaderboard")
-    overall_leaderboard = create_leaderboard(active_df)
+    if match_filter:
+        render_filter_caption(match_filter)
+    overall_leaderboard = leaderboards[None]
     
     # Check if we have any leaderboard data
-    if not overall_leaderboard:
+    if overall_leaderboard.empty:
         st.warning("No leaderboard data available.")
         st.info("Please check your data source or try refreshing the data.")
         return
     
-    # Create dataframe for display
-    display_df = pd.DataFrame(overall_leaderboard)
-    display_df = display_df[['rank', 'model', 'win_rate', 'ci_range', 'elo_rating', 'wins', 'total_matches']]
-    display_df.columns = ['Rank', 'Model', 'Win Rate (%)', '95% CI (±)', 'ELO Rating', 'Wins', 'Total Matches']
-    
-    # Display table
-    st.dataframe(
-        display_df,
-        use_container_width=True,
-        hide_index=True,
-        column_config={
-            "Rank": st.column_config.NumberColumn("Rank", width="small"),
-            "Win Rate (%)": st.column_config.ProgressColumn(
-                "Win Rate (%)",
-                min_value=0,
-                max_value=100,
-                format="%.1f%%"
-            ),
-            "95% CI (±)": st.column_config.TextColumn(
-                "95% CI (±)",
-                help="95% confidence interval for win rate (margin of error format)",
-                width="medium"
-            ),
-            "ELO Rating": st.column_config.NumberColumn("ELO Rating", width="medium")
-        }
-    )
+    render_leaderboard_table(overall_leaderboard)
 
 
 
 def render_task_detail_page(category):
     """Render detailed page for a specific task category."""
     use_mlflow = True
-    df = get_cached_data(use_mlflow=use_mlflow)
+    # Only this category's matches; with a partitioned snapshot no other category is read
+    dataset = get_category_dataset(category, use_mlflow=use_mlflow)
+    df = dataset.category(category)
     
     st.title(f"{category} Leaderboard")
     st.markdown(f"**Detailed performance analysis for {category} task**")
     
     # Back button
-    if st.button("← Back to Overview"):
-        st.session_state.selected_page = "Overview"
-        st.rerun()
+    st.button("← Back to Overview", on_click=select_page, args=("Overview",))
     
-    # Category-specific leaderboard
-    category_leaderboard = create_leaderboard(df, category)
+    artifacts = get_cached_artifacts(use_mlflow=use_mlflow)
     
     # Summary for this category
-    category_matches = len(df[df['task_category'] == category])
-    st.metric("Total Matches in Category", category_matches)
+    if artifacts:
+        category_matches = artifacts['category_match_counts'].get(category, 0)
+    else:
+        category_matches = len(df)
+    # Filled in once the filters below are known
+    metric_slot = st.empty()
+    
+    half_life_days = render_ranking_view_controls()
+    match_filter = None
+    if not half_life_days:
+        cube = get_cached_cube(use_mlflow=use_mlflow)
+        match_filter = render_match_filters(cube)
+    
+    # Category-specific leaderboard
+    if match_filter:
+        start, end, models = match_filter
+        category_slice = cube.slice(start, end, categories=[category], models=models)
+        category_matches = category_slice.summary_stats()['total_matches']
+        category_leaderboard = category_slice.leaderboard()
+    elif half_life_days:
+        category_leaderboard = get_decayed_leaderboards(dataset, half_life_days, scope=category).get(category, empty_leaderboard())
+    elif artifacts:
+        category_leaderboard = artifacts['leaderboards'].get(category, empty_leaderboard())
+    else:
+        category_leaderboard = dataset.derived(('leaderboard', category), lambda frame: create_leaderboard(frame, category))
+    metric_slot.metric("Total Matches in Category", category_matches)
     
     st.markdown("---")
     
     # Detailed leaderboard
     st.subheader(f"{category} Rankings")
+    if match_filter:
+        render_filter_caption(match_filter)
     
     # Check if we have any data for this category
-    if not category_leaderboard:
+    if category_leaderboard.empty:
         st.warning(f"No data available for {category} category.")
         st.info("Try checking a different category or verify your data source.")
         return
     
-    display_df = pd.DataFrame(category_leaderboard)
-    display_df = display_df[['rank', 'model', 'win_rate', 'ci_range', 'elo_rating', 'wins', 'total_matches']]
-    display_df.columns = ['Rank', 'Model', 'Win Rate (%)', '95% CI (±)', 'ELO Rating', 'Wins', 'Total Matches']
+    render_leaderboard_table(category_leaderboard)
+    render_export_controls(dataset, category, category_leaderboard, match_filter)
     
-    st.dataframe(
-        display_df,
-        use_container_width=True,
-        hide_index=True,
-        column_config={
-            "Rank": st.column_config.NumberColumn("Rank", width="small"),
-            "Win Rate (%)": st.column_config.ProgressColumn(
-                "Win Rate (%)",
-                min_value=0,
-                max_value=100,
-                format="%.1f%%"
-            ),
-            "95% CI (±)": st.column_config.TextColumn(
-                "95% CI (±)",
-                help="95% confidence interval for win rate (margin of error format)",
-                width="medium"
-            ),
-            "ELO Rating": st.column_config.NumberColumn("ELO Rating", width="medium")
-        }
-    )
+    # Rating history for this category
+    st.markdown("---")
+    st.subheader("ELO Rating History")
+    
+    if artifacts:
+        history = pd.DataFrame(artifacts['rating_histories'].get(category, []))
+    else:
+        history = dataset.derived(('elo_history', category), lambda frame: calculate_elo_history(frame, category))
+    
+    if history.empty:
+        st.info(f"No rating history available for {category} category.")
+    else:
+        st.line_chart(history.pivot(index='date', columns='model', values='elo_rating'))
     
     # Recent matches for this category
     st.markdown("---")
     st.subheader("Recent Matches")
     
+    if artifacts:
+        recent_display = pd.DataFrame(artifacts['recent_matches'].get(category, []))
+        if recent_display.empty:
+            st.info(f"No recent matches found for {category} category.")
+        else:
+            recent_display.columns = ['Timestamp', 'Model A', 'Model B', 'Winner']
+            st.dataframe(recent_display, use_container_width=True, hide_index=True)
+        return
+    
     category_matches_df = df[df['task_category'] == category].copy()
     
     if category_matches_df.empty:
@@ -533,6 +724,79 @@ def render_task_detail_page(category):
         
         st.dataframe(recent_display, use_container_width=True, hide_index=True)
 
+SCHEDULER_PAGE = "Next Comparisons"
+
+def render_scheduler_page():
+    """Render the recommended next model pairs to evaluate."""
+    use_mlflow = True
+    dataset = get_cached_dataset(use_mlflow=use_mlflow)
+
+    st.title("🎯 Next Comparisons")
+    st.markdown("**Model pairs where new judge calls would most reduce ranking uncertainty**")
+    st.button("← Back to Overview", on_click=select_page, args=("Overview",))
+
+    if dataset.empty:
+        st.warning("No data available. Please check your MLflow connection.")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        category = st.selectbox("Category", ["All categories"] + sorted(dataset.categories), key="scheduler_category")
+    with col2:
+        top_n = st.slider("Pairs to recommend", min_value=5, max_value=50, value=20, step=5, key="scheduler_top_n")
+    category = None if category == "All categories" else category
+
+    schedule = dataset.derived(
+        ('schedule', category, top_n),
+        lambda frame: schedule_comparisons(frame, top_n=top_n, category=category)
+    )
+    if schedule.empty:
+        st.info("No comparisons needed: every pair's order is already settled, or there are fewer than two models.")
+        return
+
+    st.metric("Suggested Judge Calls", int(schedule['suggested_samples'].sum()))
+    display_df = schedule.rename(columns={
+        'category': 'Category', 'model_a': 'Model A', 'model_b': 'Model B', 'suggested_samples': 'Samples',
+        'expected_reduction': 'Expected Gain', 'misorder_probability': 'P(Misordered)',
+        'win_probability': 'P(A Wins)', 'matches': 'Matches So Far'
+    })
+    st.dataframe(
+        display_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Samples": st.column_config.NumberColumn(
+                "Samples",
+                help="Matches needed until the pair's order is 95% certain (capped for near-identical models)"
+            ),
+            "Expected Gain": st.column_config.NumberColumn(
+                "Expected Gain",
+                help=f"Expected reduction in the summed rank variance from {DEFAULT_BATCH} more matches"
+            ),
+            "P(Misordered)": st.column_config.NumberColumn(
+                "P(Misordered)", help="Probability the current ranking has this pair in the wrong order"
+            ),
+        }
+    )
+
+@st.fragment
+def render_page():
+    """
+    Render the selected page as a fragment.
+    
+    Buttons inside the page switch pages through callbacks, so clicking them
+    reruns only this fragment instead of the login gate, sidebar and data
+    source checks. The sidebar navigation sits outside the fragment (Streamlit
+    cannot put sidebar widgets in a main-area fragment), so its buttons still
+    rerun the whole script.
+    """
+    if st.session_state.selected_page == "Overview":
+        render_overview_page()
+    elif st.session_state.selected_page == SCHEDULER_PAGE:
+        render_scheduler_page()
+    else:
+        render_task_detail_page(st.session_state.selected_page)
+
 def main():
     """Main application logic."""
     # Enforce login before doing anything expensive or loading data
@@ -558,18 +822,22 @@ def main():
     # Always use MLflow data
     use_mlflow = True
     
-    # Load data to get available categories
-    df = get_cached_data(use_mlflow=use_mlflow)
+    # Get available categories from the snapshot manifest, or from the data itself
+    manifest = get_cached_manifest()
+    if manifest is not None:
+        available_categories = list(manifest['categories'])
+    else:
+        df = get_cached_data(use_mlflow=use_mlflow)
+        available_categories = df['task_category'].unique().tolist() if not df.empty else []
     
     # Build navigation dynamically based on available data
     nav_items = [("Overview", "", "Main dashboard with all categories", False)]
     
-    if not df.empty:
-        available_categories = df['task_category'].unique().tolist()
-        
+    if available_categories:
         for category in available_categories:
             description = f"{category} analysis tasks"
             nav_items.append((category, "", description, False))
+        nav_items.append((SCHEDULER_PAGE, "", "Model pairs to evaluate next", False))
     
     st.sidebar.markdown("### Navigation")
     
@@ -586,21 +854,22 @@ def main():
                 disabled=True
             )
         else:
-            if st.sidebar.button(
+            # The callback updates the page before this run renders it, so no extra rerun is needed
+            st.sidebar.button(
                 page, 
                 key=f"nav_{page}",
                 help=description,
-                use_container_width=True
-            ):
-                if st.session_state.selected_page != page:
-                    st.session_state.selected_page = page
-                    st.rerun()
+                use_container_width=True,
+                on_click=select_page,
+                args=(page,)
+            )
+    
+    # Checked once per run; the status panel and the update button below share it
+    source_info = get_data_source_info()
+    render_data_source_sidebar(source_info)
     
     # Render appropriate page
-    if st.session_state.selected_page == "Overview":
-        render_overview_page()
-    else:
-        render_task_detail_page(st.session_state.selected_page)
+    render_page()
     
     # Sidebar info
     st.sidebar.markdown("---")
@@ -612,12 +881,11 @@ def main():
     st.sidebar.markdown("---")
     
     # Regular refresh button (always available)
-    if st.sidebar.button("🔄 Refresh Data", use_container_width=True, help="Clear cache and reload data"):
-        st.cache_data.clear()
-        st.rerun()
+    st.sidebar.button("🔄 Refresh Data", use_container_width=True, help="Clear cache and reload data",
+                      on_click=refresh_data)
     
     # Manual data update button (only show if MLflow is available)
-    source_type, _, _ = get_data_source_info()
+    source_type, _, _ = source_info
     if source_type == "live":
         st.sidebar.markdown("### Update Saved Data")
         if st.sidebar.button("💾 Update Data File", use_container_width=True, help="Save current MLflow data to file for deployment"):
@@ -0,0 +1,151 @@
+"""
+Precomputed leaderboard artifacts materialized next to the data snapshot.
+
+update_data.py writes every category and overall leaderboard, the summary
+stats, recent-match slices and daily ELO histories to
+leaderboard_artifacts.json, tagged with a fingerprint of the match data they
+were built from. The app serves them directly when the fingerprint matches
+the data it loaded, and falls back to live computation otherwise.
+
+Leaderboards are stored column-wise ({column: [values]}), so loading one is a
+single DataFrame construction rather than one dict per model.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from data_utils import (
+    LEADERBOARD_COLUMNS, LEADERBOARD_DTYPES, calculate_elo_history, create_all_leaderboards, empty_leaderboard,
+    get_summary_stats
+)
+
+ARTIFACTS_FILENAME = 'leaderboard_artifacts.json'
+ARTIFACTS_VERSION = 4  # Bump when the rating engines change what they compute
+
+# Columns that determine every derived number; order matters because ELO is sequential
+FINGERPRINT_COLUMNS = ['timestamp', 'task_category', 'model_a', 'model_b', 'winner']
+
+RECENT_MATCHES = 10
+
+
+def compute_data_fingerprint(df):
+    """
+    Fingerprint the match data independently of how it was loaded.
+
+    Timestamps are normalized to UTC nanoseconds so a frame read back from the
+    JSON snapshot hashes the same as the one fetched from MLflow.
+    """
+    if df.empty:
+        return hashlib.sha256(b'empty').hexdigest()[:16]
+
+    canonical = pd.DataFrame({
+        'timestamp': pd.to_datetime(df['timestamp'], utc=True).dt.as_unit('ns').astype('int64'),
+        **{column: df[column].astype(str) for column in FINGERPRINT_COLUMNS[1:]},
+    })
+    row_hashes = pd.util.hash_pandas_object(canonical, index=False).to_numpy()
+    return hashlib.sha256(row_hashes.tobytes()).hexdigest()[:16]
+
+
+def _recent_matches(df, category, n=RECENT_MATCHES):
+    """Most recent matches for a category, formatted like the task page table."""
+    recent = df[df['task_category'] == category].sort_values('timestamp', ascending=False).head(n)
+    recent = recent[['timestamp', 'model_a', 'model_b', 'winner']].copy()
+    recent['timestamp'] = pd.to_datetime(recent['timestamp']).dt.strftime('%Y-%m-%d %H:%M')
+    return recent.to_dict('records')
+
+
+def _leaderboard_to_json(table):
+    """Leaderboard table as JSON-ready column lists (missing values become null)."""
+    return {
+        column: table[column].astype(object).where(table[column].notna(), None).tolist()
+        for column in LEADERBOARD_COLUMNS
+    }
+
+
+def _leaderboard_from_json(columns):
+    return pd.DataFrame(columns, columns=LEADERBOARD_COLUMNS).astype(LEADERBOARD_DTYPES)
+
+
+def build_artifacts(df):
+    """Compute every artifact the overview and task pages display."""
+    categories = df['task_category'].unique().tolist() if not df.empty else []
+    leaderboards = create_all_leaderboards(df)
+
+    return {
+        'version': ARTIFACTS_VERSION,
+        'fingerprint': compute_data_fingerprint(df),
+        'generated_at': datetime.now().isoformat(),
+        'categories': categories,
+        'summary_stats': get_summary_stats(df),
+        'category_match_counts': {
+            category: int((df['task_category'] == category).sum()) for category in categories
+        },
+        'leaderboards': {
+            category: _leaderboard_to_json(leaderboards.get(category, empty_leaderboard())) for category in categories
+        },
+        'overall_leaderboard': _leaderboard_to_json(leaderboards.get(None, empty_leaderboard())),
+        'recent_matches': {category: _recent_matches(df, category) for category in categories},
+        'rating_histories': {
+            category: calculate_elo_history(df, category).to_dict('records') for category in categories
+        },
+        'overall_rating_history': calculate_elo_history(df).to_dict('records'),
+    }
+
+
+def save_artifacts(artifacts, filename=ARTIFACTS_FILENAME):
+    """Write artifacts atomically so a running app never reads a half-written file."""
+    try:
+        tmp_filename = f"{filename}.tmp"
+        with open(tmp_filename, 'w') as f:
+            json.dump(artifacts, f, default=str)
+        os.replace(tmp_filename, filename)
+        print(f"✅ Saved leaderboard artifacts ({artifacts['fingerprint']}) to {filename}")
+        return True
+    except Exception as e:
+        print(f"❌ Error saving leaderboard artifacts: {e}")
+        return False
+
+
+def materialize_artifacts(df, filename=ARTIFACTS_FILENAME):
+    """Build and save artifacts for a data snapshot."""
+    return save_artifacts(build_artifacts(df), filename)
+
+
+def load_artifacts(filename=ARTIFACTS_FILENAME):
+    """Load artifacts from disk, or None if missing, unreadable or from another format version."""
+    if not os.path.exists(filename):
+        # Same fallback as load_data_from_json: look next to this module
+        filename = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.path.basename(filename))
+        if not os.path.exists(filename):
+            return None
+    try:
+        with open(filename, 'r') as f:
+            artifacts = json.load(f)
+    except Exception as e:
+        print(f"❌ Error loading leaderboard artifacts: {e}")
+        return None
+
+    if artifacts.get('version') != ARTIFACTS_VERSION:
+        return None
+    artifacts['leaderboards'] = {
+        category: _leaderboard_from_json(columns) for category, columns in artifacts['leaderboards'].items()
+    }
+    # JSON has no None keys, so restore the create_all_leaderboards convention
+    artifacts['leaderboards'][None] = _leaderboard_from_json(artifacts['overall_leaderboard'])
+    artifacts['rating_histories'][None] = artifacts['overall_rating_history']
+    return artifacts
+
+
+def load_matching_artifacts(df, filename=ARTIFACTS_FILENAME):
+    """Return the saved artifacts only if they were built from exactly this data."""
+    artifacts = load_artifacts(filename)
+    if artifacts is None:
+        return None
+    if artifacts['fingerprint'] != compute_data_fingerprint(df):
+        print("⚠️ Leaderboard artifacts are stale, computing live")
+        return None
+    return artifacts
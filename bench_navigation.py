@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-interaction latency of app navigation against a real local server.
+
+Serves a synthetic MLflow fixture from the stand-in, runs app.py under
+`streamlit run` and drives it with a headless websocket client through
+overview → task detail → back and the sidebar navigation, timing each
+interaction from click to script (or fragment) completion.
+
+Usage:
+    python bench_navigation.py
+    python bench_navigation.py --runs 2000 --iterations 30
+"""
+
+import argparse
+import asyncio
+import statistics
+
+from headless_client import HeadlessSession, launch_app_server, stop_app_server
+from mlflow_standin import start_standin, synthetic_fixture
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+async def run_navigation(base_url, category, iterations):
+    """Drive one session through the navigation loop and collect latencies per interaction."""
+    session = HeadlessSession(base_url)
+    initial = await session.connect()
+
+    interactions = [
+        ("overview → task (card button)", f"View Full {category} Leaderboard"),
+        ("task → overview (back button)", "← Back to Overview"),
+        ("sidebar nav → task", category),
+        ("sidebar nav → overview", "Overview"),
+    ]
+    timings = {name: [] for name, _ in interactions}
+
+    # One warm-up pass so every page's caches are populated
+    for iteration in range(iterations + 1):
+        for name, label in interactions:
+            result = await session.click(label)
+            if iteration:
+                timings[name].append(result.elapsed)
+
+    await session.close()
+    return initial, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-interaction navigation latency")
+    parser.add_argument('--runs', type=int, default=500, help="Synthetic MLflow runs to serve")
+    parser.add_argument('--iterations', type=int, default=20, help="Timed passes through the navigation loop")
+    parser.add_argument('--category', default="Extract Claims")
+    args = parser.parse_args()
+
+    standin, tracking_uri = start_standin(synthetic_fixture(n_runs=args.runs))
+    process, base_url, _ = launch_app_server(tracking_uri)
+    try:
+        initial, timings = asyncio.run(run_navigation(base_url, args.category, args.iterations))
+    finally:
+        stop_app_server(process)
+        standin.shutdown()
+
+    print(f"🧪 {args.runs} synthetic runs, {args.iterations} timed iterations")
+    print(f"Cold first load: {initial.elapsed * 1000:.1f} ms")
+    print("=" * 72)
+    print(f"{'Interaction':<34}{'p50 (ms)':>12}{'p95 (ms)':>12}{'mean (ms)':>12}")
+    for name, values in timings.items():
+        print(
+            f"{name:<34}{_percentile(values, 50) * 1000:>12.1f}"
+            f"{_percentile(values, 95) * 1000:>12.1f}{statistics.mean(values) * 1000:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark the leaderboard render path with hundreds of models.
+
+Builds a synthetic match set with --models models, computes every leaderboard
+once, then times each stage between the engine's output and Streamlit:
+
+- CI formatting: per-model Python formatting (the old win_rate_row loop)
+  against the column-wise win_rate_table
+- display table: rebuilding a DataFrame from one dict per model (the old
+  list-of-dicts round trip) against selecting and renaming the engine's
+  columnar table
+- Arrow conversion of the display table, which st.dataframe does for every table
+- a full script run rendering the overview's tables under Streamlit's AppTest
+
+Usage:
+    python bench_render.py
+    python bench_render.py --models 1000 --matches 500000 --iterations 50
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_utils import (
+    calculate_wilson_confidence_interval, create_all_leaderboards, win_rate_table
+)
+
+CATEGORIES = ['Extract Dramatis', 'Extract Claims', 'Summarize Relief']
+
+
+def synthetic_matches(n_models, n_matches, seed=0):
+    """Matches between n_models models with hidden strengths, spread over a year."""
+    rng = np.random.default_rng(seed)
+    models = np.array([f"model-{i:04d}" for i in range(n_models)], dtype=object)
+    strength = rng.normal(0, 1, n_models)
+
+    a = rng.integers(0, n_models, n_matches)
+    b = (a + rng.integers(1, n_models, n_matches)) % n_models
+    a_wins = rng.random(n_matches) < 1 / (1 + np.exp(strength[b] - strength[a]))
+    start = pd.Timestamp("2025-01-01", tz="UTC")
+    return pd.DataFrame({
+        'timestamp': start + pd.to_timedelta(np.sort(rng.integers(0, 365 * 86400, n_matches)), unit='s'),
+        'task_category': np.array(CATEGORIES, dtype=object)[rng.integers(0, len(CATEGORIES), n_matches)],
+        'model_a': models[a],
+        'model_b': models[b],
+        'winner': np.where(a_wins, models[a], models[b]),
+    })
+
+
+def _time(fn, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def _format_rows(models, wins, total_matches):
+    """The pre-columnar formatting: one dict and two f-strings per model."""
+    rows = []
+    for model, w, n in zip(models, wins.tolist(), total_matches.tolist()):
+        win_rate = (w / n * 100) if n > 0 else 0
+        ci_lower, ci_upper = calculate_wilson_confidence_interval(w, n)
+        plus_margin = ci_upper - win_rate
+        minus_margin = win_rate - ci_lower
+        if abs(plus_margin - minus_margin) < 0.1:
+            ci_display = f"± {(plus_margin + minus_margin) / 2:.1f}%"
+        else:
+            ci_display = f"+{plus_margin:.1f}%/-{minus_margin:.1f}%"
+        rows.append({'model': model, 'wins': w, 'total_matches': n, 'win_rate': round(win_rate, 1),
+                     'ci_lower': ci_lower, 'ci_upper': ci_upper, 'plus_margin': round(plus_margin, 1),
+                     'minus_margin': round(minus_margin, 1), 'ci_range': ci_display})
+    return sorted(rows, key=lambda x: x['win_rate'], reverse=True)
+
+
+def _render_script():
+    """Renders the overview's mini leaderboards and overall table from cached boards (run by AppTest)."""
+    import streamlit as st
+
+    import app
+    from bench_render import synthetic_matches
+    from data_utils import create_all_leaderboards
+
+    @st.cache_resource
+    def boards(n_models, n_matches):
+        return create_all_leaderboards(synthetic_matches(n_models, n_matches))
+
+    leaderboards = boards(st.session_state.n_models, st.session_state.n_matches)
+    for category in sorted(key for key in leaderboards if key is not None):
+        app.render_mini_leaderboard(category, leaderboards[category])
+    app.render_leaderboard_table(leaderboards[None])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the leaderboard render path")
+    parser.add_argument('--models', type=int, default=600, help="Number of models")
+    parser.add_argument('--matches', type=int, default=200000, help="Number of synthetic matches")
+    parser.add_argument('--iterations', type=int, default=20, help="Timed repetitions per stage")
+    args = parser.parse_args()
+
+    df = synthetic_matches(args.models, args.matches)
+    start = time.perf_counter()
+    leaderboards = create_all_leaderboards(df)
+    print(f"🧪 {args.models} models, {len(df)} matches; engine built {len(leaderboards)} boards "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    overall = leaderboards[None]
+    display_columns = ['rank', 'tier', 'model', 'win_rate', 'ci_range', 'elo_rating', 'glicko_rating',
+                       'glicko_rd', 'wins', 'total_matches']
+    display_names = ['Rank', 'Tier', 'Model', 'Win Rate (%)', '95% CI (±)', 'ELO Rating', 'Glicko-2', 'RD (±)',
+                     'Wins', 'Total Matches']
+    records = overall.to_dict('records')
+    models = overall['model'].to_numpy()
+    wins = overall['wins'].to_numpy()
+    total_matches = overall['total_matches'].to_numpy()
+
+    def from_records():
+        display = pd.DataFrame(records)[display_columns]
+        display.columns = display_names
+        return display
+
+    def columnar():
+        return overall[display_columns].rename(columns=dict(zip(display_columns, display_names)))
+
+    import pyarrow as pa
+
+    display = columnar()
+    results = [
+        ("CI formatting, per-model loop", _time(lambda: _format_rows(models, wins, total_matches), args.iterations)),
+        ("CI formatting, win_rate_table", _time(lambda: win_rate_table(models, wins, total_matches), args.iterations)),
+        ("display table from dict rows", _time(from_records, args.iterations)),
+        ("display table from columns", _time(columnar, args.iterations)),
+        ("Arrow conversion", _time(lambda: pa.Table.from_pandas(display, preserve_index=False), args.iterations)),
+    ]
+
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_function(_render_script, default_timeout=600)
+    at.session_state.n_models = args.models
+    at.session_state.n_matches = args.matches
+    at.run()  # Warm-up: builds the boards once
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    results.append(("overview tables, full script run", _time(at.run, args.iterations)))
+
+    print("=" * 60)
+    print(f"{'Stage':<40}{'median (ms)':>14}")
+    for name, ms in results:
+        print(f"{name:<40}{ms:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
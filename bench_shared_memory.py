@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Measure per-host memory of the match data as the number of app workers grows.
+
+Publishes a synthetic match set once with write_mapped_dataset, then starts
+1, 2, 4, ... worker processes that all hold the data at the same time, in two
+modes:
+
+- copy: every worker builds its own SharedDataset from the data (what each
+  `streamlit run` process did before the mapped dataset)
+- mapped: every worker attaches to the published file with SharedDataset.from_mapped
+
+Each worker reads every column, like computing a leaderboard does, then
+reports its proportional set size (PSS: private pages plus its share of pages
+mapped by several processes) from /proc. The sum over workers is the memory
+the host spends on the data. Linux only.
+
+Usage:
+    python bench_shared_memory.py
+    python bench_shared_memory.py --models 600 --matches 2000000 --workers 1 2 4 8
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+
+
+def _memory_kb():
+    """This process's PSS and anonymous (private, unshared) memory in kB."""
+    fields = {}
+    with open('/proc/self/smaps_rollup', 'r') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':'):
+                fields[parts[0][:-1]] = int(parts[1])
+    return fields['Pss'], fields['Anonymous']
+
+
+def _worker(path, mode, results, loaded, release):
+    from mapped_dataset import attach_mapped_dataset
+    from shared_dataset import SharedDataset
+
+    before = _memory_kb()
+    mapped = attach_mapped_dataset(path)
+    dataset = SharedDataset.from_mapped(mapped) if mode == 'mapped' else SharedDataset(mapped.frame())
+    del mapped
+
+    frame = dataset.frame()
+    for column in frame.columns:
+        frame[column].nunique()
+    # Measure once every worker holds the data, so shared pages are split between all of them
+    loaded.wait()
+    after = _memory_kb()
+
+    results.put((after[0] - before[0], after[1] - before[1]))
+    release.wait()
+
+
+def measure(path, mode, n_workers):
+    """Total PSS and anonymous memory (MB) the workers added by holding the data."""
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    loaded = context.Barrier(n_workers)
+    release = context.Event()
+    workers = [
+        context.Process(target=_worker, args=(path, mode, results, loaded, release)) for _ in range(n_workers)
+    ]
+    for worker in workers:
+        worker.start()
+    reported = [results.get() for _ in workers]
+    release.set()
+    for worker in workers:
+        worker.join()
+    return sum(pss for pss, _ in reported) / 1024, sum(anon for _, anon in reported) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-host memory of the match data by worker count")
+    parser.add_argument('--models', type=int, default=600, help="Number of models")
+    parser.add_argument('--matches', type=int, default=2000000, help="Number of synthetic matches")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help="Worker counts to measure")
+    args = parser.parse_args()
+
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        raise SystemExit("❌ This benchmark reads /proc/self/smaps_rollup and needs Linux")
+
+    from bench_render import synthetic_matches
+    from mapped_dataset import write_mapped_dataset
+
+    directory = tempfile.mkdtemp(prefix="bench-shared-")
+    path = os.path.join(directory, "dataset.arrow")
+    write_mapped_dataset(synthetic_matches(args.models, args.matches), path)
+    print(f"🧪 {args.matches} matches, {os.path.getsize(path) / 2**20:.0f} MB mapped file")
+
+    print("=" * 60)
+    print(f"{'Workers':<10}{'copy PSS (MB)':>16}{'mapped PSS (MB)':>18}{'mapped private':>16}")
+    try:
+        for n_workers in args.workers:
+            copy_pss, _ = measure(path, 'copy', n_workers)
+            mapped_pss, mapped_anon = measure(path, 'mapped', n_workers)
+            print(f"{n_workers:<10}{copy_pss:>16.0f}{mapped_pss:>18.0f}{mapped_anon:>16.0f}")
+    finally:
+        os.remove(path)
+        os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
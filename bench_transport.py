@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Compare MLflow run fetch times through the MLflow client and the header plugin's transport.
+
+Starts the local MLflow stand-in with a synthetic fixture under a few network
+profiles, then runs fetch_mlflow_runs repeatedly with each client:
+
+- mlflow: the MLflow client with its default HTTP settings (what fetch_mlflow_runs
+  used before the transport)
+- transport: mlflow_header_plugin.transport (pooled session, gzip, bounded
+  retries, column-wise decoding)
+
+Both build the same DataFrame. For each it reports the median and slowest
+fetch, requests, new connections and bytes the server sent, plus the
+transport's own per-endpoint counters.
+
+Usage:
+    python bench_transport.py
+    python bench_transport.py --runs 20000 --repeats 10 --profiles remote flaky
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Run from a source checkout without installing the plugin
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mlflow_header_plugin'))
+
+PROFILES = {
+    # Loopback: pure client overhead
+    'local': {},
+    # A tracking server behind a TLS proxy in another region
+    'remote': {'latency_ms': 30, 'connect_latency_ms': 60, 'bandwidth_mbps': 50, 'compress': True},
+    # ...that also fails some requests with transient 503s
+    'flaky': {'latency_ms': 30, 'connect_latency_ms': 60, 'bandwidth_mbps': 50, 'compress': True,
+              'failure_rate': 0.2},
+}
+
+
+def fetch_times(tracking_uri, state, use_transport, repeats):
+    """Time repeated fetches with one client, with the server's request, connection and byte counts."""
+    from data_utils import fetch_mlflow_runs
+
+    requests_before = sum(state.request_counts.values())
+    connections_before, bytes_before = state.connections, state.bytes_sent
+    times, rows = [], None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        runs = fetch_mlflow_runs(tracking_uri=tracking_uri, use_transport=use_transport)
+        times.append(time.perf_counter() - start)
+        rows = len(runs)
+    return {
+        'median': statistics.median(times), 'max': max(times), 'rows': rows,
+        'requests': sum(state.request_counts.values()) - requests_before,
+        'connections': state.connections - connections_before,
+        'kb_sent': (state.bytes_sent - bytes_before) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MLflow fetch time: MLflow client vs. the plugin transport")
+    parser.add_argument('--runs', type=int, default=5000, help="Runs in the synthetic fixture")
+    parser.add_argument('--page-size', type=int, default=1000, help="Largest page the stand-in returns")
+    parser.add_argument('--repeats', type=int, default=5, help="Fetches per client and profile")
+    parser.add_argument('--profiles', nargs='+', default=list(PROFILES), choices=list(PROFILES))
+    args = parser.parse_args()
+
+    from data_utils import get_mlflow_transport
+    from mlflow_standin import start_standin, synthetic_fixture
+
+    fixture = synthetic_fixture(n_runs=args.runs)
+    print(f"🧪 {args.runs} runs, pages of {args.page_size}, {args.repeats} fetches per client")
+    print("=" * 86)
+    print(f"{'Profile':<9}{'Client':<11}{'median (s)':>11}{'max (s)':>9}{'requests':>10}"
+          f"{'connections':>13}{'KB sent':>10}{'speed-up':>10}")
+
+    for profile in args.profiles:
+        server, tracking_uri = start_standin(fixture, page_size=args.page_size, **PROFILES[profile])
+        try:
+            transport = get_mlflow_transport(tracking_uri)
+            results = {}
+            for client, use_transport in (('mlflow', False), ('transport', True)):
+                # Exclude one-off imports and the first connection from both clients
+                fetch_times(tracking_uri, server.state, use_transport, 1)
+                transport.stats.reset()
+                results[client] = fetch_times(tracking_uri, server.state, use_transport, args.repeats)
+            for client, result in results.items():
+                speed_up = results['mlflow']['median'] / result['median']
+                print(f"{profile:<9}{client:<11}{result['median']:>11.3f}{result['max']:>9.3f}{result['requests']:>10}"
+                      f"{result['connections']:>13}{result['kb_sent']:>10.0f}{speed_up:>9.1f}x")
+            for endpoint in transport.stats.as_dicts():
+                print(f"   📡 {endpoint['endpoint']}: {endpoint['requests']} requests, {endpoint['retries']} retries, "
+                      f"mean {endpoint['mean_seconds'] * 1000:.0f} ms, "
+                      f"{endpoint['wire_bytes'] / 1024:.0f} KB on the wire for {endpoint['body_bytes'] / 1024:.0f} KB")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Script to render the leaderboards as a static HTML/JSON site for read-only viewers.
+Writes the overview, one page per task category (leaderboard and recent
+matches) and the JSON behind them (see static_site.py). Rerunning it updates
+the previous build in place, re-rendering only the pages whose category data
+changed, so it can run after every snapshot publish.
+
+Usage:
+    python build_site.py --out site
+    python build_site.py --snapshot --out /var/www/leaderboard
+    python build_site.py --force   # re-render every page
+"""
+
+import argparse
+import time
+
+from static_site import build_site
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the leaderboards as a static site")
+    parser.add_argument('--out', default='site', help="Site directory, updated in place")
+    parser.add_argument('--snapshot', action='store_true',
+                        help="Render the current snapshot (with its precomputed artifacts) instead of the saved data file")
+    parser.add_argument('--snapshot-dir', help="Snapshot store directory (default: $LEADERBOARD_SNAPSHOT_DIR or snapshots)")
+    parser.add_argument('--mlflow', action='store_true', help="Read live MLflow data instead of the saved data file")
+    parser.add_argument('--force', action='store_true', help="Re-render every page, even if its data is unchanged")
+    args = parser.parse_args()
+
+    if args.snapshot:
+        from snapshot_store import SNAPSHOT_DIR, attach_snapshot_dataset, load_snapshot, load_snapshot_artifacts
+
+        store_dir = args.snapshot_dir or SNAPSHOT_DIR
+        mapped = attach_snapshot_dataset(store_dir)
+        df = mapped.frame() if mapped is not None else load_snapshot(store_dir)
+        artifacts = load_snapshot_artifacts(store_dir)
+    else:
+        from artifacts import load_artifacts
+        from data_utils import load_data
+
+        df = load_data(use_mlflow=args.mlflow, hedged=False)
+        artifacts = None if args.mlflow else load_artifacts()
+
+    print(f"🌐 Building static site in {args.out} from {len(df)} matches...")
+    print("=" * 50)
+    start = time.perf_counter()
+    result = build_site(df, args.out, artifacts=artifacts, force=args.force)
+    print(f"📄 Category pages: {len(result['rendered'])} rendered, {len(result['unchanged'])} unchanged, "
+          f"{len(result['removed'])} removed")
+    print(f"📄 Overview: {'rendered' if result['overview'] else 'unchanged'}")
+    print(f"✅ Done in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,232 @@
+"""
+Active comparison scheduling: which model pairs to send to the judge next.
+
+Every eval run costs judge calls, so they should go where they most reduce
+uncertainty about the rankings. A model's rank is 1 plus the number of
+models ranked above it, so its rank variance is roughly the sum, over every
+other model, of q * (1 - q), where q is the probability that the pair is
+currently in the wrong order. Close pairs whose strengths are poorly known
+contribute most. Pairs whose order is already certain gain almost nothing.
+
+Strengths come from a Bradley-Terry fit. Their uncertainty comes from each
+model's Fisher information, which counts matches against every opponent,
+so pairs that never met still get an estimate. A batch of matches between
+i and j adds to i's and j's information. The expected q * (1 - q) after the
+batch, and the expected misorder probability used for sizing, average over
+the batch's possible outcomes with Gauss-Hermite quadrature. Everything is vectorized over the pair matrix.
+"""
+
+import numpy as np
+import pandas as pd
+
+from data_utils import get_all_models
+from significance import _erfc, head_to_head_counts
+
+DEFAULT_BATCH = 50          # Matches per pair that candidates are compared at
+DEFAULT_TARGET = 0.05       # Misorder probability at which a pair counts as settled
+DEFAULT_MAX_SAMPLES = 500   # Cap on the suggested sample count for one pair
+_QUADRATURE_NODES = 24
+
+SCHEDULE_COLUMNS = ['category', 'model_a', 'model_b', 'suggested_samples', 'expected_reduction',
+                    'misorder_probability', 'win_probability', 'matches']
+
+
+def bradley_terry_strengths(wins, iterations=200):
+    """
+    Bradley-Terry strengths from a head-to-head win matrix (minorization-maximization).
+
+    Each model also gets one virtual win and one virtual loss against a model of
+    strength 1, so strengths stay finite for unbeaten or winless models.
+
+    Returns:
+        np.ndarray: Strengths with geometric mean 1; P(i beats j) = s[i] / (s[i] + s[j])
+    """
+    wins = np.asarray(wins, dtype=float)
+    matches = wins + wins.T
+    total_wins = wins.sum(axis=1) + 1.0
+    strengths = np.ones(len(wins))
+    for _ in range(iterations):
+        denominator = (matches / (strengths[:, None] + strengths[None, :])).sum(axis=1) + 2.0 / (strengths + 1.0)
+        strengths = total_wins / denominator
+        strengths /= np.exp(np.log(strengths).mean())
+    return strengths
+
+
+def strength_information(wins, strengths):
+    """
+    Fisher information of each model's log-strength (the inverse of its variance).
+
+    Every match against an opponent contributes p * (1 - p), where p is the
+    predicted win probability, and the two virtual matches of the fit add their share.
+    """
+    matches = np.asarray(wins, dtype=float) + np.asarray(wins, dtype=float).T
+    p = strengths[:, None] / (strengths[:, None] + strengths[None, :])
+    return (matches * p * (1.0 - p)).sum(axis=1) + 2.0 * strengths / (strengths + 1.0) ** 2
+
+
+def misorder_probability(gap, sd):
+    """P(a pair is in the wrong order) when its log-strength gap is ~ Normal(gap, sd)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.where(sd > 0, np.abs(gap) / (sd * np.sqrt(2.0)), np.inf)
+    return 0.5 * _erfc(z)
+
+
+def _preposterior_mean(gap, info_a, info_b, pair_information, batch, statistic):
+    """
+    Expectation of statistic(misorder probability) after `batch` more matches each.
+
+    The updated gap is distributed Normal(gap, var_now - var_after) before the
+    batch is played (the preposterior), and the expectation over it is taken
+    with Gauss-Hermite quadrature.
+    """
+    var_now = 1.0 / info_a + 1.0 / info_b
+    var_after = 1.0 / (info_a + batch * pair_information) + 1.0 / (info_b + batch * pair_information)
+    nodes, weights = np.polynomial.hermite.hermgauss(_QUADRATURE_NODES)
+
+    shift = np.sqrt(2.0 * np.maximum(var_now - var_after, 0.0))
+    updated = np.asarray(gap)[..., None] + shift[..., None] * nodes
+    after = misorder_probability(updated, np.sqrt(var_after)[..., None])
+    return (statistic(after) * weights).sum(axis=-1) / np.sqrt(np.pi)
+
+
+def expected_misorder(gap, info_a, info_b, pair_information, batch):
+    """
+    Expected misorder probability of pairs after `batch` more matches each.
+
+    Args:
+        gap: Log-strength differences of the pairs
+        info_a, info_b: Current information of each pair's two models
+        pair_information: Information one match between the two adds to each, p * (1 - p)
+        batch: Matches added per pair (a scalar or an array broadcasting with the rest)
+    """
+    return _preposterior_mean(gap, info_a, info_b, pair_information, batch, lambda q: q)
+
+
+def expected_order_variance(gap, info_a, info_b, pair_information, batch):
+    """
+    Expected variance q * (1 - q) of each pair's order after `batch` more matches, q its misorder probability.
+
+    Takes the same arguments as expected_misorder. The expectation is of
+    q * (1 - q) itself, not q * (1 - q) at the expected q, which would
+    overstate the variance left.
+    """
+    return _preposterior_mean(gap, info_a, info_b, pair_information, batch, lambda q: q * (1.0 - q))
+
+
+def schedule_category(df, batch=DEFAULT_BATCH):
+    """
+    Score every model pair of one category by how much a batch of matches would settle the ranking.
+
+    Args:
+        df: The category's matches
+        batch: Matches per pair the candidates are compared at
+
+    Returns:
+        pd.DataFrame: One row per pair (model_a the stronger model) with head-to-head
+            matches, the fitted win_probability, misorder_probability and
+            expected_reduction (of the summed rank variance), best pair first.
+            gap, info_a, info_b and pair_information are kept for sizing.
+    """
+    models = get_all_models(df)
+    if len(models) < 2:
+        return pd.DataFrame(columns=['model_a', 'model_b', 'matches', 'win_probability', 'misorder_probability',
+                                     'expected_reduction', 'gap', 'info_a', 'info_b', 'pair_information'])
+
+    model_index = {model: i for i, model in enumerate(models)}
+    wins = head_to_head_counts(
+        df['model_a'].map(model_index).to_numpy(),
+        df['model_b'].map(model_index).to_numpy(),
+        df['winner'].map(model_index).fillna(-1).to_numpy().astype(int),
+        len(models)
+    )
+    strengths = bradley_terry_strengths(wins)
+    information = strength_information(wins, strengths)
+
+    # Orient every pair so the first model is the stronger one
+    i, j = np.triu_indices(len(models), k=1)
+    stronger = strengths[i] >= strengths[j]
+    a, b = np.where(stronger, i, j), np.where(stronger, j, i)
+    gap = np.log(strengths[a]) - np.log(strengths[b])
+    p = strengths[a] / (strengths[a] + strengths[b])
+    pair_information = p * (1.0 - p)
+
+    now = misorder_probability(gap, np.sqrt(1.0 / information[a] + 1.0 / information[b]))
+    after = expected_order_variance(gap, information[a], information[b], pair_information, batch)
+    # Each pair appears in both models' rank variance, hence the factor 2
+    reduction = 2.0 * (now * (1.0 - now) - after)
+
+    names = np.asarray(models, dtype=object)
+    pairs = pd.DataFrame({
+        'model_a': names[a],
+        'model_b': names[b],
+        'matches': (wins + wins.T)[a, b],
+        'win_probability': p,
+        'misorder_probability': now,
+        'expected_reduction': np.maximum(reduction, 0.0),
+        'gap': gap,
+        'info_a': information[a],
+        'info_b': information[b],
+        'pair_information': pair_information,
+    })
+    return pairs.sort_values('expected_reduction', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def suggested_samples(pairs, batch=DEFAULT_BATCH, target=DEFAULT_TARGET, max_samples=DEFAULT_MAX_SAMPLES):
+    """
+    Matches each pair needs before its expected misorder probability falls to target.
+
+    Counts are multiples of batch (0 for pairs already settled), capped at
+    max_samples for pairs that are too close to settle (e.g. two near-identical models).
+
+    Args:
+        pairs: Rows from schedule_category
+    """
+    grid = np.arange(0, max(max_samples, batch) + 1, batch)
+    column = lambda name: pairs[name].to_numpy(dtype=float)[:, None]
+    expected = expected_misorder(
+        column('gap'), column('info_a'), column('info_b'), column('pair_information'), grid[None, :]
+    )
+    settled = expected <= target
+    first = np.where(settled.any(axis=1), settled.argmax(axis=1), len(grid) - 1)
+    return grid[first]
+
+
+def schedule_comparisons(df, top_n=20, category=None, batch=DEFAULT_BATCH, target=DEFAULT_TARGET,
+                         max_samples=DEFAULT_MAX_SAMPLES):
+    """
+    Rank the model pairs worth evaluating next across all categories.
+
+    Args:
+        df: Match data
+        top_n: Number of pairs to return (None for all)
+        category: Only schedule one task category
+        batch: Matches per pair that candidates are compared at, and the step of suggested counts
+        target: Misorder probability at which a pair counts as settled
+        max_samples: Largest suggested sample count for one pair
+
+    Returns:
+        pd.DataFrame: SCHEDULE_COLUMNS, largest expected reduction in rank uncertainty
+            first. Pairs whose order is already settled are left out.
+    """
+    if category:
+        categories = [category]
+    else:
+        categories = sorted(df['task_category'].unique().tolist()) if not df.empty else []
+
+    frames = []
+    for name in categories:
+        pairs = schedule_category(df[df['task_category'] == name], batch=batch)
+        if not pairs.empty:
+            frames.append(pairs.assign(category=name))
+    if not frames:
+        return pd.DataFrame(columns=SCHEDULE_COLUMNS)
+
+    schedule = pd.concat(frames, ignore_index=True)
+    schedule = schedule.sort_values('expected_reduction', ascending=False, kind='stable')
+    schedule = schedule.assign(suggested_samples=suggested_samples(schedule, batch, target, max_samples))
+    # Pairs already settled need no more judge calls; drop them before the cut so top_n counts unsettled pairs only
+    schedule = schedule[schedule['suggested_samples'] > 0]
+    if top_n:
+        schedule = schedule.head(top_n)
+    schedule = schedule.round({'win_probability': 3, 'misorder_probability': 3, 'expected_reduction': 4})
+    return schedule[SCHEDULE_COLUMNS].reset_index(drop=True)
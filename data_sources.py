@@ -0,0 +1,181 @@
+"""
+Latency-budgeted loading from a live source with a hedged local fallback.
+
+A HedgedSource starts the live fetch and waits for it only up to a latency
+budget. If the budget runs out, it serves the fallback (the saved data file)
+straight away and leaves the live fetch running. When the live data arrives
+it is kept as a pending upgrade: `generation` goes up, and the next load()
+returns the live data at once. Loads made while that fetch is still running
+serve the fallback without waiting on it again.
+
+Every load is timed per source. A live source that fails, or runs over the
+budget, several times in a row is put on a cool-down: for a while load()
+goes straight to the fallback without contacting it. The first load after
+the cool-down probes it again.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import Future, wait
+
+DEFAULT_LATENCY_BUDGET = float(os.getenv("LEADERBOARD_LATENCY_BUDGET", "3"))
+DEFAULT_COOLDOWN = float(os.getenv("LEADERBOARD_SOURCE_COOLDOWN", "300"))
+DEFAULT_STRIKES = 3
+
+
+class SourceStats:
+    """Latency and failure counts of one data source."""
+
+    def __init__(self, name):
+        self.name = name
+        self.loads = 0
+        self.failures = 0
+        self.over_budget = 0
+        self.strikes = 0  # Consecutive failed or over-budget loads
+        self.last_latency = None
+        self.mean_latency = None  # Exponentially weighted, so it follows recent loads
+        self.cooldown_until = 0.0
+
+    def record(self, latency, ok, budget=None):
+        """
+        Record one load.
+
+        Returns:
+            bool: Whether the load counts as a strike (failed or over budget)
+        """
+        self.loads += 1
+        self.last_latency = latency
+        self.mean_latency = latency if self.mean_latency is None else 0.8 * self.mean_latency + 0.2 * latency
+        slow = budget is not None and latency > budget
+        self.failures += not ok
+        self.over_budget += slow
+        self.strikes = self.strikes + 1 if (slow or not ok) else 0
+        return slow or not ok
+
+    def cooling_down(self, now=None):
+        return (now or time.time()) < self.cooldown_until
+
+    def as_dict(self):
+        return {
+            'name': self.name, 'loads': self.loads, 'failures': self.failures, 'over_budget': self.over_budget,
+            'last_latency': self.last_latency, 'mean_latency': self.mean_latency,
+            'cooldown_remaining': max(0.0, self.cooldown_until - time.time()),
+        }
+
+
+class HedgedSource:
+    """
+    Load from a live source within a latency budget, falling back to a local one.
+
+    Args:
+        live: (name, load) of the primary source. load() returns a DataFrame;
+            an empty one or an exception counts as a failure.
+        fallback: (name, load) of the source served when live is slow, failing or cooling down
+        budget: Seconds to wait for the live source before serving the fallback
+        cooldown: Seconds to skip the live source after `strikes` bad loads in a row
+        strikes: Consecutive failed or over-budget loads that trigger the cool-down
+    """
+
+    def __init__(self, live, fallback, budget=DEFAULT_LATENCY_BUDGET, cooldown=DEFAULT_COOLDOWN,
+                 strikes=DEFAULT_STRIKES):
+        self.live_name, self._load_live = live
+        self.fallback_name, self._load_fallback = fallback
+        self.budget = budget
+        self.cooldown = cooldown
+        self.strikes = strikes
+        self.stats = {self.live_name: SourceStats(self.live_name), self.fallback_name: SourceStats(self.fallback_name)}
+        self.generation = 0  # Goes up whenever live data arrives after the fallback was served
+        self.last_source = None
+        self._lock = threading.Lock()
+        self._inflight = None
+        self._hedged = False  # The in-flight fetch missed its budget; keep its result as an upgrade
+        self._upgrade = None
+
+    def awaiting_live(self):
+        """Whether the fallback was served while a live fetch is still running or its data is waiting."""
+        return self._hedged or self._upgrade is not None
+
+    def has_upgrade(self):
+        """Whether live data arrived after the fallback was served and the next load() will return it."""
+        return self._upgrade is not None
+
+    def load(self):
+        """
+        Load the data, waiting at most the latency budget for the live source.
+
+        Returns:
+            tuple: (DataFrame, name of the source it came from)
+        """
+        with self._lock:
+            if self._upgrade is not None:
+                df, self._upgrade = self._upgrade, None
+                return self._served(df, self.live_name)
+            if self.stats[self.live_name].cooling_down():
+                print(f"⏸️ {self.live_name} is cooling down, serving {self.fallback_name}")
+                future = None
+            elif self._hedged:
+                # The running fetch already missed its budget; waiting for it again would only add latency
+                future = None
+            else:
+                # Concurrent loads share one in-flight fetch instead of each starting their own
+                if self._inflight is None:
+                    self._inflight = self._start_live()
+                future = self._inflight
+
+        if future is not None:
+            wait([future], timeout=self.budget)
+            with self._lock:
+                if not future.done():
+                    print(f"⏱️ {self.live_name} exceeded the {self.budget:g}s budget, serving {self.fallback_name}")
+                    self._hedged = True
+                elif future.result() is not None:
+                    return self._served(future.result(), self.live_name)
+
+        return self._served(self._timed_fallback(), self.fallback_name)
+
+    def _served(self, df, source):
+        self.last_source = source
+        return df, source
+
+    def _start_live(self):
+        # A daemon thread rather than an executor, so a hung server never blocks interpreter exit
+        future = Future()
+        future.set_running_or_notify_cancel()
+        threading.Thread(target=self._run_live, args=(future,), name=f"hedged-{self.live_name}", daemon=True).start()
+        return future
+
+    def _run_live(self, future):
+        start = time.perf_counter()
+        try:
+            df = self._load_live()
+            ok = df is not None and not df.empty
+        except Exception as e:
+            print(f"❌ {self.live_name} load failed: {e}")
+            df, ok = None, False
+        latency = time.perf_counter() - start
+
+        with self._lock:
+            stats = self.stats[self.live_name]
+            if stats.record(latency, ok, self.budget) and stats.strikes >= self.strikes:
+                stats.cooldown_until = time.time() + self.cooldown
+                stats.strikes = 0
+                print(f"🧊 {self.live_name} skipped for {self.cooldown:g}s after {self.strikes} slow or failed loads")
+            if ok and self._hedged:
+                print(f"⬆️ {self.live_name} data arrived after {latency:.1f}s, upgrading from {self.fallback_name}")
+                self._upgrade = df
+                self.generation += 1
+            self._hedged = False
+            self._inflight = None
+            # Resolved under the lock, so load() sees either the upgrade or the result, never neither
+            future.set_result(df if ok else None)
+
+    def _timed_fallback(self):
+        start = time.perf_counter()
+        df = None
+        try:
+            df = self._load_fallback()
+            return df
+        finally:
+            with self._lock:
+                self.stats[self.fallback_name].record(time.perf_counter() - start, df is not None and not df.empty)
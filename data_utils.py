@@ -5,7 +5,30 @@ import math
 import json
 import os
 
+from data_sources import HedgedSource
+from glicko2 import glicko2_from_matches
+from judgments import iter_run_judgments
+from significance import assign_tiers, head_to_head_counts, pairwise_significance
+
 # MLflow integration will be defined directly in this file
+DEFAULT_MLFLOW_TRACKING_URI = "https://mlflow-tracking-api.vlex.io"
+
+# Match record schema. run_id and judgment_index identify where each match came
+# from (older saved data predates them and has only the first five columns).
+# Matches ingested from per-sample judgment artifacts also carry a document_id.
+MATCH_COLUMNS = ['timestamp', 'task_category', 'model_a', 'model_b', 'winner', 'run_id', 'judgment_index']
+MATCH_KEY = ['run_id', 'judgment_index']
+
+# Leaderboards are tables (one row per model, best first) with these columns.
+# Integer columns are nullable because a ranking view may lack them: the
+# time-decayed view has no Glicko-2 ratings.
+WIN_RATE_COLUMNS = ['model', 'wins', 'total_matches', 'win_rate', 'ci_lower', 'ci_upper',
+                    'plus_margin', 'minus_margin', 'ci_range']
+LEADERBOARD_COLUMNS = ['rank', 'tier', 'model', 'elo_rating', 'glicko_rating', 'glicko_rd', 'glicko_volatility',
+                       'win_rate', 'ci_lower', 'ci_upper', 'plus_margin', 'minus_margin', 'ci_range',
+                       'wins', 'total_matches']
+LEADERBOARD_DTYPES = {'rank': 'int64', 'tier': 'Int64', 'elo_rating': 'Int64', 'glicko_rating': 'Int64',
+                      'glicko_rd': 'Int64', 'glicko_volatility': 'float64'}
 
 def save_data_to_json(df, filename='leaderboard_data.json'):
     """Save DataFrame to JSON file for deployment fallback."""
@@ -17,8 +40,11 @@ def save_data_to_json(df, filename='leaderboard_data.json'):
             'total_records': len(df)
         }
         
-        with open(filename, 'w') as f:
+        # Written to a temporary name and renamed, so a concurrent reader never sees a partial file
+        temporary = f"{filename}.tmp"
+        with open(temporary, 'w') as f:
             json.dump(data_dict, f, indent=2, default=str)
+        os.replace(temporary, filename)
         
         print(f"Successfully saved {len(df)} records to {filename}")
         return True
@@ -62,7 +88,7 @@ def load_data_from_json(filename='leaderboard_data.json'):
         
         if not found_file:
             print(f"❌ No saved data file found at any location")
-            return pd.DataFrame(columns=['timestamp', 'task_category', 'model_a', 'model_b', 'winner'])
+            return pd.DataFrame(columns=MATCH_COLUMNS)
         
         filename = found_file  # Use the found path
         
@@ -88,13 +114,13 @@ def load_data_from_json(filename='leaderboard_data.json'):
         print(f"❌ Exception type: {type(e).__name__}")
         import traceback
         print(f"❌ Full traceback: {traceback.format_exc()}")
-        return pd.DataFrame(columns=['timestamp', 'task_category', 'model_a', 'model_b', 'winner'])
+        return pd.DataFrame(columns=MATCH_COLUMNS)
 
-def update_saved_data():
+def update_saved_data(tracking_uri=None, with_judgments=False):
     """Update the saved data file with fresh MLflow data. Use this locally to refresh deployment data."""
     try:
         print("Fetching fresh data from MLflow...")
-        df = load_data_from_mlflow()
+        df = load_data_from_mlflow(tracking_uri=tracking_uri, with_judgments=with_judgments)
         
         if df.empty:
             print("No MLflow data available to save.")
@@ -102,6 +128,10 @@ def update_saved_data():
         
         success = save_data_to_json(df)
         if success:
+            # Precompute every leaderboard so app containers can skip the live computation
+            from artifacts import materialize_artifacts
+            materialize_artifacts(df)
+            
             print("✅ Saved data file updated successfully!")
             print("💡 Commit and push the updated leaderboard_data.json to deploy fresh data.")
             return True
@@ -113,143 +143,350 @@ def update_saved_data():
         print(f"Error updating saved data: {e}")
         return False
 
-def load_data_from_mlflow():
-    """Load comparison data from MLflow experiments."""
+# MLflow Configuration
+MLFLOW_USER = "ryan.donahue@vlex.com"
+TASK_CATEGORY_MAPPING = {
+    "extract_dramatis": "Extract Dramatis",
+    "extract_claims": "Extract Claims",
+    "summarize_relief": "Summarize Relief"
+}
+
+def clean_model_name(model_name):
+    if not model_name:
+        return "Unknown"
+    name_mappings = {
+        "gpt-4.1-mini-2025-04-14": "GPT-4.1-Mini",
+        "us.anthropic.claude-3-7-sonnet-20250219-v1:0": "Claude-3.7-Sonnet",
+        "gpt-4.1-2025-04-14": "GPT-4.1",
+        "anthropic.claude-3-5-sonnet-20240620-v1:0": "Claude-3.5-Sonnet",
+        "gpt-5-2025-08-07": "GPT-5",
+    }
+    return name_mappings.get(model_name, model_name.replace("us.anthropic.", "").replace("-v1:0", ""))
+
+def fetch_mlflow_runs(tracking_uri=None, since_ms=None, use_transport=True):
+    """
+    Search MLflow for finished eval runs.
+    
+    Unlike load_data_from_mlflow this raises on connection errors, so callers
+    such as the watch daemon can tell "no new runs" apart from "server down".
+    
+    When the header plugin is installed, the searches go through its pooled,
+    compressed transport (mlflow_header_plugin.transport), which returns the
+    same DataFrame faster and with bounded retries. Otherwise they go through
+    the MLflow client.
+    
+    Args:
+        tracking_uri: Tracking server to read from. Defaults to the MLFLOW_TRACKING_URI
+            environment variable, then the production server. Point this at a local
+            stand-in (see mlflow_standin.py) to run the ingest path offline.
+        since_ms: Only return runs that started after this epoch time in milliseconds
+        use_transport: Use the plugin's transport when it is installed (False always uses the MLflow client)
+    
+    Returns:
+        pd.DataFrame: One row per run, as returned by mlflow.search_runs
+    """
+    import mlflow
+    
+    # Setup MLflow connection
+    tracking_uri = tracking_uri or os.getenv("MLFLOW_TRACKING_URI", DEFAULT_MLFLOW_TRACKING_URI)
+    mlflow.set_tracking_uri(tracking_uri)
+    transport = get_mlflow_transport(tracking_uri) if use_transport else None
+    
+    # Set up authentication - try multiple methods
+    #mlflow.login(MLFLOW_USER)
+    
+    # Search for experiments
+    experiment_names = ["LLM Judge Complaint Analysis Evals"]
+    experiment_ids = []
+    if transport is not None:
+        all_experiments = [(exp['name'], exp['experiment_id']) for exp in transport.search_experiments()]
+    else:
+        all_experiments = [(exp.name, exp.experiment_id) for exp in mlflow.search_experiments()]
+    for name, experiment_id in all_experiments:
+        if name in experiment_names or name.startswith("llm_judge_evals"):
+            experiment_ids.append(experiment_id)
+            print(f"Found experiment: {name} (ID: {experiment_id})")
+    
+    if not experiment_ids:
+        experiment_ids = ["17"]
+    
+    filter_string = "status = 'FINISHED'"
+    if since_ms is not None:
+        filter_string += f" AND attributes.start_time > {int(since_ms)}"
+    
+    # Search for runs
+    if transport is not None:
+        return transport.search_runs(experiment_ids, filter_string, order_by=["start_time DESC"])
+    return mlflow.search_runs(
+        experiment_ids=experiment_ids,
+        filter_string=filter_string,
+        order_by=["start_time DESC"]
+    )
+
+
+def get_mlflow_transport(tracking_uri):
+    """
+    The header plugin's pooled HTTP transport for a tracking server.
+    
+    Returns:
+        MlflowTransport or None: None when the plugin is not installed or the
+            tracking URI is not an HTTP server (e.g. a local file store)
+    """
+    if not tracking_uri.startswith(('http://', 'https://')):
+        return None
     try:
-        import mlflow
-        
-        # MLflow Configuration
-        MLFLOW_TRACKING_URI = "https://mlflow-tracking-api.vlex.io"
-        MLFLOW_USER = "ryan.donahue@vlex.com"
-        TASK_CATEGORY_MAPPING = {
-            "extract_dramatis": "Extract Dramatis",
-            "extract_claims": "Extract Claims",
-            "summarize_relief": "Summarize Relief"
-        }
-        
-        def clean_model_name(model_name):
-            if not model_name:
-                return "Unknown"
-            name_mappings = {
-                "gpt-4.1-mini-2025-04-14": "GPT-4.1-Mini",
-                "us.anthropic.claude-3-7-sonnet-20250219-v1:0": "Claude-3.7-Sonnet",
-                "gpt-4.1-2025-04-14": "GPT-4.1",
-                "anthropic.claude-3-5-sonnet-20240620-v1:0": "Claude-3.5-Sonnet",
-                "gpt-5-2025-08-07": "GPT-5",
-            }
-            return name_mappings.get(model_name, model_name.replace("us.anthropic.", "").replace("-v1:0", ""))
-        
-        # Setup MLflow connection
-        mlflow.set_tracking_uri(MLFLOW_TRACKING_URI)
-        
-        # Set up authentication - try multiple methods
-        #mlflow.login(MLFLOW_USER)
-        
-        # Search for experiments
-        experiment_names = ["LLM Judge Complaint Analysis Evals"]
-        experiment_ids = []
-        all_experiments = mlflow.search_experiments()
-        for exp in all_experiments:
-            if exp.name in experiment_names or exp.name.startswith("llm_judge_evals"):
-                experiment_ids.append(exp.experiment_id)
-                print(f"Found experiment: {exp.name} (ID: {exp.experiment_id})")
-        
-        if not experiment_ids:
-            experiment_ids = ["17"]
-        
-        # Search for runs
-        runs = mlflow.search_runs(
-            experiment_ids=experiment_ids,
-            filter_string="status = 'FINISHED'",
-            order_by=["start_time DESC"]
-        )
-        
-        if runs.empty:
-            return pd.DataFrame(columns=['timestamp', 'task_category', 'model_a', 'model_b', 'winner'])
-        
-        # Transform to comparison format
-        comparison_data = []
-        for _, run in runs.iterrows():
-            try:
-                task_plan = run.get('params.task_plan_name', '')
-                if task_plan not in TASK_CATEGORY_MAPPING:
-                    continue
-                
-                model_a = clean_model_name(run.get('params.model_a', ''))
-                model_b = clean_model_name(run.get('params.model_b', ''))
-                if not model_a or not model_b:
-                    continue
-                
-                timestamp = pd.to_datetime(run.get('start_time', datetime.now()))
-                task_category = TASK_CATEGORY_MAPPING[task_plan]
-                
-                # Create individual match records from win counts
-                model_a_wins = int(run.get('metrics.model_a_wins', 0))
-                model_b_wins = int(run.get('metrics.model_b_wins', 0))
-                
-                # Create a realistic sequence of winners instead of grouping all A wins first
-                winners = [model_a] * model_a_wins + [model_b] * model_b_wins
-                
-                # Shuffle to create realistic chronological order (use run ID for consistent seed)
-                import random
-                random.Random(run.get('run_id', 'default')).shuffle(winners)
-                
-                # Create individual match records with interleaved winners
-                for i, winner in enumerate(winners):
-                    comparison_data.append({
-                        'timestamp': timestamp + pd.Timedelta(minutes=i),
-                        'task_category': task_category,
-                        'model_a': model_a,
-                        'model_b': model_b,
-                        'winner': winner
-                    })
-                
-            except Exception as e:
-                print(f"Error processing run: {e}")
+        from mlflow_header_plugin.transport import get_transport
+    except ImportError:
+        return None
+    return get_transport(tracking_uri)
+
+def _judgment_winner(judgment, raw_model_a, raw_model_b, model_a, model_b):
+    """Map an artifact's winner field ('model_a', 'model_b', 'tie' or a model name) to a match winner."""
+    winner = str(judgment.get('winner', '')).strip()
+    if winner.lower() in ('model_a', 'a') or winner in (raw_model_a, model_a):
+        return model_a
+    if winner.lower() in ('model_b', 'b') or winner in (raw_model_b, model_b):
+        return model_b
+    return 'Tie'
+
+def _judgment_matches(judgments, run_timestamp, task_category, raw_model_a, raw_model_b, model_a, model_b, run_id):
+    """Match records for a run's real per-sample judgments, in their true order."""
+    stamps = [judgment.get('timestamp') for judgment in judgments]
+    if any(stamp is None for stamp in stamps):
+        # Spaced a minute apart like matches expanded from win counts
+        timestamps = run_timestamp + pd.to_timedelta(range(len(judgments)), unit='min')
+    elif all(isinstance(stamp, (int, float)) for stamp in stamps):
+        timestamps = pd.to_datetime(stamps, unit='ms', utc=True)
+    else:
+        timestamps = pd.to_datetime(stamps, utc=True)
+    
+    records = []
+    for i, (judgment, timestamp) in enumerate(zip(judgments, timestamps)):
+        records.append({
+            'timestamp': timestamp,
+            'task_category': task_category,
+            'model_a': model_a,
+            'model_b': model_b,
+            'winner': _judgment_winner(judgment, raw_model_a, raw_model_b, model_a, model_b),
+            'run_id': run_id,
+            'judgment_index': i,
+            'document_id': judgment.get('document_id'),
+        })
+    return records
+
+def runs_to_matches(runs, judgments=None):
+    """
+    Expand MLflow runs into individual match records.
+    
+    Args:
+        runs: DataFrame from fetch_mlflow_runs
+        judgments: Optional iterable of (run_id, judgments or None) in the same order
+            as runs, e.g. iter_run_judgments(runs). Runs with judgments become one
+            match per real judgment; the others are expanded from their win counts.
+    """
+    if runs.empty:
+        return pd.DataFrame(columns=MATCH_COLUMNS)
+    
+    judgments = iter(judgments) if judgments is not None else None
+    
+    # Transform to comparison format
+    comparison_data = []
+    for _, run in runs.iterrows():
+        # Consumed in step with the runs, so downloads of later runs overlap this loop
+        run_judgments = next(judgments)[1] if judgments is not None else None
+        try:
+            task_plan = run.get('params.task_plan_name', '')
+            if task_plan not in TASK_CATEGORY_MAPPING:
                 continue
-        
-        if not comparison_data:
-            return pd.DataFrame(columns=['timestamp', 'task_category', 'model_a', 'model_b', 'winner'])
-        
-        df = pd.DataFrame(comparison_data)
-        print(f"Successfully created {len(df)} individual match records")
-        return df
+            
+            model_a = clean_model_name(run.get('params.model_a', ''))
+            model_b = clean_model_name(run.get('params.model_b', ''))
+            if not model_a or not model_b:
+                continue
+            
+            timestamp = pd.to_datetime(run.get('start_time', datetime.now()))
+            task_category = TASK_CATEGORY_MAPPING[task_plan]
+            
+            if run_judgments:
+                comparison_data.extend(_judgment_matches(
+                    run_judgments, timestamp, task_category, run.get('params.model_a', ''),
+                    run.get('params.model_b', ''), model_a, model_b, run.get('run_id')
+                ))
+                continue
+            
+            # Create individual match records from win counts
+            model_a_wins = int(run.get('metrics.model_a_wins', 0))
+            model_b_wins = int(run.get('metrics.model_b_wins', 0))
+            
+            # Create a realistic sequence of winners instead of grouping all A wins first
+            winners = [model_a] * model_a_wins + [model_b] * model_b_wins
+            
+            # Shuffle to create realistic chronological order (use run ID for consistent seed)
+            import random
+            random.Random(run.get('run_id', 'default')).shuffle(winners)
+            
+            # Create individual match records with interleaved winners
+            for i, winner in enumerate(winners):
+                comparison_data.append({
+                    'timestamp': timestamp + pd.Timedelta(minutes=i),
+                    'task_category': task_category,
+                    'model_a': model_a,
+                    'model_b': model_b,
+                    'winner': winner,
+                    'run_id': run.get('run_id'),
+                    'judgment_index': i
+                })
+            
+        except Exception as e:
+            print(f"Error processing run: {e}")
+            continue
+    
+    if not comparison_data:
+        return pd.DataFrame(columns=MATCH_COLUMNS)
+    
+    df = dedupe_matches(pd.DataFrame(comparison_data))
+    print(f"Successfully created {len(df)} individual match records")
+    return df
+
+def dedupe_matches(df):
+    """
+    Collapse match rows that share a (run_id, judgment_index) key to one.
+    
+    A run can be listed twice, e.g. across overlapping pages of a fetch. Rows
+    arrive newest run first, so the first copy of a key is the one kept; this
+    is the single dedupe policy for ingested matches (runs_to_matches and
+    merge_match_delta both use it).
+    """
+    return df.drop_duplicates(MATCH_KEY, keep='first', ignore_index=True)
+
+def _same_matches(a, b):
+    """Whether two sets of match rows are identical, ignoring row order."""
+    if len(a) != len(b):
+        return False
+    columns = ['timestamp', 'task_category', 'model_a', 'model_b', 'winner']
+    a = a.sort_values(MATCH_KEY, kind='mergesort')[columns].reset_index(drop=True)
+    b = b.sort_values(MATCH_KEY, kind='mergesort')[columns].reset_index(drop=True)
+    a['timestamp'] = pd.to_datetime(a['timestamp'], utc=True)
+    b['timestamp'] = pd.to_datetime(b['timestamp'], utc=True)
+    return a.equals(b)
+
+def merge_matches(existing, new):
+    """
+    Upsert freshly ingested match rows into an existing dataset, keyed on run_id.
+    
+    Every run present in new replaces all of that run's existing rows (a re-logged
+    run may have a different number of judgments), and duplicate
+    (run_id, judgment_index) rows within new collapse to one (see
+    dedupe_matches). Merging the same
+    data twice is therefore a no-op. The work beyond one vectorized isin() over
+    the existing run ids is proportional to the new rows. Rows without a run_id
+    (saved before provenance was tracked) are kept as they are.
+    
+    Args:
+        existing: Current match rows
+        new: Match rows from runs_to_matches, newest runs first
+    
+    Returns:
+        tuple: (merged DataFrame, whether anything changed). When nothing changed
+            the merged frame is existing itself.
+    """
+    merged, changed, _, _ = merge_match_delta(existing, new)
+    return merged, changed
+
+def merge_match_delta(existing, new):
+    """
+    merge_matches, also returning the rows the merge added and removed.
+    
+    Aggregates kept alongside the data (e.g. the match cube) can apply the
+    delta instead of being rebuilt from the merged rows.
+    
+    Returns:
+        tuple: (merged DataFrame, whether anything changed, added rows, removed rows)
+    """
+    new = dedupe_matches(new)
+    unchanged = (existing, False, new.iloc[:0], existing.iloc[:0])
+    if new.empty:
+        return unchanged
+    if existing.empty:
+        return new, True, new, existing.iloc[:0]
+    
+    if 'run_id' in existing.columns:
+        replaced = existing['run_id'].isin(new['run_id'].unique())
+    else:
+        replaced = np.zeros(len(existing), dtype=bool)
+    
+    if replaced.any() and _same_matches(existing[replaced], new):
+        return unchanged
+    
+    # New runs first, matching the newest-first order of a full fetch
+    merged = pd.concat([new, existing[~replaced]], ignore_index=True)
+    return merged, True, new, existing[replaced]
+
+def load_data_from_mlflow(tracking_uri=None, since_ms=None, with_judgments=False):
+    """
+    Load comparison data from MLflow experiments.
+    
+    Args:
+        tracking_uri: Tracking server to read from (see fetch_mlflow_runs)
+        since_ms: Only load runs that started after this epoch time in milliseconds
+        with_judgments: Ingest each run's per-sample judgment artifact (see judgments.py)
+            instead of expanding its aggregate win counts
+    """
+    try:
+        runs = fetch_mlflow_runs(tracking_uri=tracking_uri, since_ms=since_ms)
+        judgments = iter_run_judgments(runs, tracking_uri=tracking_uri) if with_judgments else None
+        return runs_to_matches(runs, judgments)
         
     except Exception as e:
         print(f"Error loading data from MLflow: {e}")
-        return pd.DataFrame(columns=['timestamp', 'task_category', 'model_a', 'model_b', 'winner'])
+        return pd.DataFrame(columns=MATCH_COLUMNS)
+
+def load_live_data():
+    """Load the match data from MLflow and save it as the deployment fallback. Empty on failure."""
+    print("🔴 Loading data from MLflow...")
+    df = load_data_from_mlflow()
+    if df.empty:
+        print("⚠️ No MLflow data found")
+        return df
+
+    print(f"✅ Successfully loaded {len(df)} records from MLflow")
+    # Ensure timestamp is datetime type
+    if 'timestamp' in df.columns:
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+
+    # Auto-save the fresh MLflow data for deployment fallback
+    save_data_to_json(df)
+    return df
+
+# MLflow within a latency budget, else the saved data file (see data_sources.py)
+LIVE_DATA = HedgedSource(("MLflow", load_live_data), ("saved data file", load_data_from_json))
 
-def load_data(use_mlflow=True):
-    """Load and preprocess the match data from MLflow with JSON fallback."""
+def load_data(use_mlflow=True, hedged=True):
+    """
+    Load and preprocess the match data from MLflow with JSON fallback.
+
+    Args:
+        use_mlflow: Try MLflow before the saved data file
+        hedged: Give MLflow only LIVE_DATA.budget seconds. If it is slower, the
+            saved data file is served immediately and the MLflow data replaces it
+            on a later call once it arrives (LIVE_DATA.generation goes up when it
+            does). Scripts that need the live data pass False to wait for it.
+    """
     print(f"🔄 load_data called with use_mlflow={use_mlflow}")
     
     if not use_mlflow:
         print("📁 Loading from saved data file (use_mlflow=False)...")
         return load_data_from_json()
-        
-    try:
-        print("🔴 Loading data from MLflow...")
-        df = load_data_from_mlflow()
-        
-        if df.empty:
-            print("⚠️ No MLflow data found, trying saved data file...")
-            return load_data_from_json()
-        else:
-            print(f"✅ Successfully loaded {len(df)} records from MLflow")
-            # Ensure timestamp is datetime type
-            if 'timestamp' in df.columns:
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-            
-            # Auto-save the fresh MLflow data for deployment fallback
-            save_data_to_json(df)
-            
-            return df
-            
-    except Exception as e:
-        print(f"❌ MLflow loading failed: {e}")
-        print(f"❌ Exception type: {type(e).__name__}")
+
+    if hedged:
+        df, _ = LIVE_DATA.load()
+        return df
+
+    df = load_live_data()
+    if df.empty:
         print("📁 Falling back to saved data file...")
         return load_data_from_json()
+    return df
 
 
 def calculate_wilson_confidence_interval(wins, total_matches, confidence_level=0.95):
@@ -297,53 +534,117 @@ def get_all_models(df):
     all_models = models_a.union(models_b)
     return sorted(list(all_models))
 
+# '%.1f' strings for 0.0 to 100.0 in tenths, so percentage columns are formatted by lookup
+_TENTHS = np.array([f"{k / 10:.1f}" for k in range(1001)], dtype=object)
+
+def _round1(values):
+    """Round a column to one decimal exactly like round(x, 1)."""
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, 1)
+    # np.round scales by 10 first, which can tip values within an ulp of a half the wrong way
+    scaled = values * 10
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_half.any():
+        rounded[near_half] = [round(value, 1) for value in values[near_half].tolist()]
+    return rounded
+
+def _format1(values):
+    """Format a column like f"{x:.1f}" without a per-value format call."""
+    values = np.asarray(values, dtype=float)
+    tenths = np.abs(np.rint(_round1(values) * 10)).astype(np.int64)
+    if len(tenths) and tenths.max() >= len(_TENTHS):
+        return np.char.mod('%.1f', values).astype(object)
+    strings = _TENTHS[tenths]
+    negative = np.signbit(values)
+    if negative.any():
+        strings[negative] = '-' + strings[negative]
+    return strings
+
+def wilson_intervals(wins, total_matches, z=1.96):
+    """
+    Vectorized calculate_wilson_confidence_interval (95% by default) for many models at once.
+    
+    Returns:
+        tuple of arrays: (lower_bound, upper_bound) as percentages, (0, 100) where there are no matches
+    """
+    wins = np.asarray(wins, dtype=float)
+    n = np.asarray(total_matches, dtype=float)
+    safe_n = np.where(n > 0, n, 1.0)
+    
+    p = wins / safe_n
+    denominator = 1 + z**2 / safe_n
+    center = (p + z**2 / (2 * safe_n)) / denominator
+    margin = z * np.sqrt((p * (1 - p) + z**2 / (4 * safe_n)) / safe_n) / denominator
+    
+    lower = np.where(n > 0, np.maximum(0, center - margin), 0.0)
+    upper = np.where(n > 0, np.minimum(1, center + margin), 1.0)
+    return _round1(lower * 100), _round1(upper * 100)
+
+def format_ci_ranges(plus_margin, minus_margin):
+    """CI display strings for whole columns of margins: '± 4.2%' when nearly symmetric, else '+5.1%/-3.9%'."""
+    plus_margin = np.asarray(plus_margin, dtype=float)
+    minus_margin = np.asarray(minus_margin, dtype=float)
+    symmetric = np.abs(plus_margin - minus_margin) < 0.1
+    
+    ranges = np.empty(len(plus_margin), dtype=object)
+    ranges[symmetric] = '± ' + _format1((plus_margin[symmetric] + minus_margin[symmetric]) / 2) + '%'
+    asymmetric = ~symmetric
+    ranges[asymmetric] = '+' + _format1(plus_margin[asymmetric]) + '%/-' + _format1(minus_margin[asymmetric]) + '%'
+    return ranges
+
+def win_rate_table(models, wins, total_matches):
+    """
+    Win rates, Wilson CIs and display margins for many models, computed column-wise.
+    
+    Args:
+        models: Model names
+        wins: Wins per model (may be fractional, e.g. decayed counts)
+        total_matches: Matches per model
+    
+    Returns:
+        pd.DataFrame: WIN_RATE_COLUMNS, sorted by win rate descending. Models with
+            equal win rates keep their input order.
+    """
+    models = np.asarray(models, dtype=object)
+    wins = np.asarray(wins)
+    total_matches = np.asarray(total_matches)
+    
+    win_rate = np.where(total_matches > 0, wins / np.where(total_matches > 0, total_matches, 1) * 100, 0.0)
+    ci_lower, ci_upper = wilson_intervals(wins, total_matches)
+    
+    # Asymmetric margins for the +/- display, from the unrounded win rate
+    plus_margin = ci_upper - win_rate
+    minus_margin = win_rate - ci_lower
+    
+    rounded = _round1(win_rate)
+    order = np.argsort(-rounded, kind='stable')
+    return pd.DataFrame({
+        'model': models[order],
+        'wins': wins[order],
+        'total_matches': total_matches[order],
+        'win_rate': rounded[order],
+        'ci_lower': ci_lower[order],
+        'ci_upper': ci_upper[order],
+        'plus_margin': _round1(plus_margin)[order],
+        'minus_margin': _round1(minus_margin)[order],
+        'ci_range': format_ci_ranges(plus_margin, minus_margin)[order],
+    })
+
 def calculate_win_rates(df, category=None):
-    """Calculate win rates for all models, optionally filtered by category."""
+    """Calculate win rates for all models, optionally filtered by category (see win_rate_table)."""
     if category:
         df = df[df['task_category'] == category]
     
     models = get_all_models(df)
-    stats = []
-    
-    for model in models:
-        # Count wins
-        wins = len(df[df['winner'] == model])
-        
-        # Count total matches (as model_a or model_b)
-        total_matches = len(df[(df['model_a'] == model) | (df['model_b'] == model)])
-        
-        # Calculate win rate
-        win_rate = (wins / total_matches * 100) if total_matches > 0 else 0
-        
-        # Calculate confidence interval for win rate
-        ci_lower, ci_upper = calculate_wilson_confidence_interval(wins, total_matches)
-        
-        # Calculate asymmetric margins for proper +/- format
-        plus_margin = ci_upper - win_rate
-        minus_margin = win_rate - ci_lower
-        
-        # Create asymmetric CI display
-        if abs(plus_margin - minus_margin) < 0.1:  # Nearly symmetric
-            avg_margin = (plus_margin + minus_margin) / 2
-            ci_display = f"± {avg_margin:.1f}%"
-        else:  # Asymmetric - show both
-            ci_display = f"+{plus_margin:.1f}%/-{minus_margin:.1f}%"
-        
-        stats.append({
-            'model': model,
-            'wins': wins,
-            'total_matches': total_matches,
-            'win_rate': round(win_rate, 1),
-            'ci_lower': ci_lower,
-            'ci_upper': ci_upper,
-            'plus_margin': round(plus_margin, 1),
-            'minus_margin': round(minus_margin, 1),
-            'ci_range': ci_display
-        })
+    model_index = {model: i for i, model in enumerate(models)}
+    model_a = df['model_a'].map(model_index).to_numpy().astype(int)
+    model_b = df['model_b'].map(model_index).to_numpy().astype(int)
+    winner = df['winner'].map(model_index).dropna().to_numpy().astype(int)
     
-    # Sort by win rate descending
-    stats = sorted(stats, key=lambda x: x['win_rate'], reverse=True)
-    return stats
+    wins = np.bincount(winner, minlength=len(models))
+    # A self-match only counts once for its model
+    total_matches = np.bincount(model_a, minlength=len(models)) + np.bincount(model_b[model_a != model_b], minlength=len(models))
+    return win_rate_table(models, wins, total_matches)
 
 def calculate_elo_ratings(df, category=None, k_factor=32, initial_rating=1200):
     """Calculate ELO ratings for all models."""
@@ -390,61 +691,416 @@ def calculate_elo_ratings(df, category=None, k_factor=32, initial_rating=1200):
     
     return elo_ratings
 
+def _glicko_inputs(df, model_index, period):
+    """Integer-coded matches for the Glicko-2 engine."""
+    model_a = df['model_a'].map(model_index).to_numpy()
+    model_b = df['model_b'].map(model_index).to_numpy()
+    winner = df['winner'].map(model_index).fillna(-1).to_numpy().astype(int)
+    score_a = np.where(winner == model_a, 1.0, np.where(winner == model_b, 0.0, 0.5))
+    
+    # Every run counts as one Glicko-2 game (see glicko2.aggregate_results); rows saved
+    # before run ids were tracked fall back to one run per day and model pair
+    days = pd.to_datetime(df['timestamp'], utc=True).dt.strftime('%Y-%m-%d')
+    run_ids = df['run_id'].fillna(days) if 'run_id' in df.columns else days
+    return model_a, model_b, score_a, run_ids
+
+def _glicko_table(rating, rd, volatility, models, present):
+    """Glicko-2 results for the present models, indexed by model name."""
+    return pd.DataFrame({
+        'rating': np.rint(rating[present]).astype(np.int64),
+        'rd': np.rint(rd[present]).astype(np.int64),
+        'volatility': np.round(volatility[present], 4),
+    }, index=pd.Index(np.asarray(models, dtype=object)[present], name='model'))
+
+def calculate_glicko_ratings(df, category=None, period="day"):
+    """
+    Calculate Glicko-2 ratings with rating deviations for all models.
+    
+    Unlike ELO, every model carries an uncertainty (RD): a new model with few
+    matches has a wide RD and its rating moves in large, quickly settling steps.
+    
+    Args:
+        df: Match data
+        category: Optional task category filter
+        period: Rating period, "day" (default), "run" or a pandas frequency (see glicko2.py)
+    
+    Returns:
+        dict: {model: {'rating', 'rd', 'volatility'}}
+    """
+    if category:
+        df = df[df['task_category'] == category]
+    
+    models = get_all_models(df)
+    if not models:
+        return {}
+    
+    model_index = {model: i for i, model in enumerate(models)}
+    model_a, model_b, score_a, run_ids = _glicko_inputs(df, model_index, period)
+    rating, rd, volatility, _ = glicko2_from_matches(
+        df['timestamp'], model_a, model_b, score_a, len(models), run_ids=run_ids, period=period
+    )
+    return _glicko_table(rating, rd, volatility, models, np.arange(len(models))).to_dict('index')
+
+def calculate_elo_history(df, category=None, k_factor=32, initial_rating=1200):
+    """
+    Calculate each model's ELO rating at the end of every day with matches.
+    
+    Returns:
+        pd.DataFrame: Columns date (YYYY-MM-DD), model and elo_rating, covering
+        every model seen up to that day
+    """
+    if category:
+        df = df[df['task_category'] == category]
+    
+    if df.empty:
+        return pd.DataFrame(columns=['date', 'model', 'elo_rating'])
+    
+    df_sorted = df.sort_values('timestamp', kind='mergesort')
+    dates = pd.to_datetime(df_sorted['timestamp']).dt.strftime('%Y-%m-%d')
+    
+    elo_ratings = {}
+    history = []
+    current_date = None
+    for date, model_a, model_b, winner in zip(dates, df_sorted['model_a'], df_sorted['model_b'], df_sorted['winner']):
+        if date != current_date:
+            if current_date is not None:
+                history.extend((current_date, model, round(rating)) for model, rating in elo_ratings.items())
+            current_date = date
+        
+        rating_a = elo_ratings.setdefault(model_a, initial_rating)
+        rating_b = elo_ratings.setdefault(model_b, initial_rating)
+        
+        expected_a = 1 / (1 + 10**((rating_b - rating_a) / 400))
+        expected_b = 1 / (1 + 10**((rating_a - rating_b) / 400))
+        
+        if winner == model_a:
+            score_a, score_b = 1, 0
+        elif winner == model_b:
+            score_a, score_b = 0, 1
+        else:
+            score_a, score_b = 0.5, 0.5
+        
+        elo_ratings[model_a] = rating_a + k_factor * (score_a - expected_a)
+        elo_ratings[model_b] = rating_b + k_factor * (score_b - expected_b)
+    
+    history.extend((current_date, model, round(rating)) for model, rating in elo_ratings.items())
+    return pd.DataFrame(history, columns=['date', 'model', 'elo_rating'])
+
+def sweep_elo_ratings(df, k_factors, initial_ratings=(1200,), decays=(0.0,), category=None):
+    """
+    Run the ELO recursion for a grid of hyperparameters in a single match loop.
+    
+    Every parameter combination is a row of one ratings matrix, so each match is
+    applied to all of them with a handful of vector operations instead of one
+    Python update per setting.
+    
+    Args:
+        df: Match data
+        k_factors: K-factors to try
+        initial_ratings: Starting ratings to try
+        decays: Fraction of a model's distance from its initial rating that is
+            forgotten before each of its matches (0.0 is standard ELO)
+        category: Optional task category filter
+    
+    Returns:
+        dict: 'params' (DataFrame of k_factor, initial_rating, decay per row),
+        'models' (column order) and 'ratings' (array of shape params x models)
+    """
+    if category:
+        df = df[df['task_category'] == category]
+    
+    grid = [(k, r, d) for k in k_factors for r in initial_ratings for d in decays]
+    params = pd.DataFrame(grid, columns=['k_factor', 'initial_rating', 'decay'])
+    models = get_all_models(df)
+    
+    if not models or params.empty:
+        return {'params': params, 'models': models, 'ratings': np.zeros((len(params), len(models)))}
+    
+    k = params['k_factor'].to_numpy(dtype=float)
+    start = params['initial_rating'].to_numpy(dtype=float)
+    keep = 1.0 - params['decay'].to_numpy(dtype=float)
+    apply_decay = bool((keep != 1.0).any())
+    
+    # Stored models x params so each model's ratings are one contiguous row
+    ratings = np.tile(start, (len(models), 1))
+    
+    df_sorted = df.sort_values('timestamp', kind='mergesort')
+    model_index = {model: i for i, model in enumerate(models)}
+    model_a = df_sorted['model_a'].map(model_index).to_numpy()
+    model_b = df_sorted['model_b'].map(model_index).to_numpy()
+    winner = df_sorted['winner'].map(model_index).fillna(-1).to_numpy().astype(int)
+    
+    for a, b, w in zip(model_a.tolist(), model_b.tolist(), winner.tolist()):
+        if w == a:
+            score_a, score_b = 1, 0
+        elif w == b:
+            score_a, score_b = 0, 1
+        else:
+            score_a, score_b = 0.5, 0.5
+        
+        rating_a = ratings[a]
+        rating_b = ratings[b]
+        if apply_decay:
+            rating_a = start + (rating_a - start) * keep
+            rating_b = start + (rating_b - start) * keep
+        
+        expected_a = 1 / (1 + 10**((rating_b - rating_a) / 400))
+        expected_b = 1 / (1 + 10**((rating_a - rating_b) / 400))
+        
+        ratings[a] = rating_a + k * (score_a - expected_a)
+        ratings[b] = rating_b + k * (score_b - expected_b)
+    
+    return {'params': params, 'models': models, 'ratings': ratings.T.copy()}
+
+def summarize_elo_sweep(sweep, baseline_k_factor=32, baseline_initial_rating=1200, baseline_decay=0.0):
+    """
+    Report how the ELO rank order moves across a hyperparameter sweep.
+    
+    Args:
+        sweep: Result of sweep_elo_ratings
+        baseline_*: Parameters of the reference run (the nearest grid row is used)
+    
+    Returns:
+        dict: 'runs' (params with kendall_tau vs. the baseline order, whether the
+        order is identical and the top model), 'models' (per-model best, worst and
+        mean rank plus the baseline rank) and 'baseline' (the reference params)
+    """
+    params = sweep['params']
+    models = sweep['models']
+    ratings = sweep['ratings']
+    
+    if params.empty or not models:
+        return {'runs': params.copy(), 'models': pd.DataFrame(columns=['model']), 'baseline': None}
+    
+    # Pick the grid row closest to the baseline settings
+    distance = (
+        (params['k_factor'] - baseline_k_factor).abs() / max(abs(baseline_k_factor), 1)
+        + (params['initial_rating'] - baseline_initial_rating).abs() / max(abs(baseline_initial_rating), 1)
+        + (params['decay'] - baseline_decay).abs()
+    )
+    baseline = int(distance.to_numpy().argmin())
+    
+    # Rank 1 is the highest rating; stable sort keeps alphabetical order on ties
+    order = np.argsort(-ratings, axis=1, kind='stable')
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(1, len(models) + 1)[None, :], axis=1)
+    
+    # Kendall tau of every run against the baseline, over all model pairs at once
+    n_pairs = len(models) * (len(models) - 1) / 2
+    if n_pairs:
+        pair_sign = np.sign(ranks[:, :, None] - ranks[:, None, :])
+        upper = np.triu(np.ones((len(models), len(models)), dtype=bool), k=1)
+        agreement = (pair_sign * pair_sign[baseline])[:, upper].sum(axis=1)
+        kendall_tau = agreement / n_pairs
+    else:
+        kendall_tau = np.ones(len(params))
+    
+    runs = params.copy()
+    runs['kendall_tau'] = np.round(kendall_tau, 4)
+    runs['same_order'] = (ranks == ranks[baseline]).all(axis=1)
+    runs['top_model'] = [models[i] for i in order[:, 0]]
+    
+    model_summary = pd.DataFrame({
+        'model': models,
+        'baseline_rank': ranks[baseline],
+        'best_rank': ranks.min(axis=0),
+        'worst_rank': ranks.max(axis=0),
+        'mean_rank': np.round(ranks.mean(axis=0), 2),
+        'baseline_rating': np.round(ratings[baseline]).astype(int),
+    }).sort_values('baseline_rank').reset_index(drop=True)
+    
+    return {'runs': runs, 'models': model_summary, 'baseline': params.iloc[baseline].to_dict()}
+
+def calculate_tiers(df, win_stats, category=None, alpha=0.05):
+    """
+    Group ranked models into statistically tied tiers.
+    
+    Runs a head-to-head binomial test for every model pair (Holm-corrected) and
+    starts a new tier only where the tier's leading model is significantly
+    better than the next model in the ranking.
+    
+    Returns:
+        dict: {model: tier}, with tier 1 for the top group
+    """
+    if category:
+        df = df[df['task_category'] == category]
+    
+    models = get_all_models(df)
+    if not models:
+        return {}
+    
+    model_index = {model: i for i, model in enumerate(models)}
+    wins = head_to_head_counts(
+        df['model_a'].map(model_index).to_numpy(),
+        df['model_b'].map(model_index).to_numpy(),
+        df['winner'].map(model_index).fillna(-1).to_numpy().astype(int),
+        len(models)
+    )
+    significance = pairwise_significance(wins, alpha=alpha)
+    
+    ranked = win_stats['model'].map(model_index).tolist()
+    tiers = assign_tiers(ranked, wins, significance['significant'])
+    return dict(zip(win_stats['model'], tiers))
+
+def combine_leaderboard(win_stats, elo_ratings, tiers=None, glicko=None):
+    """
+    Merge a sorted win-rate table with ELO ratings (and optional tiers and Glicko-2 ratings) into a ranked leaderboard.
+    
+    Everything is joined column-wise on the model name, so no per-model rows are built.
+    
+    Args:
+        win_stats: Table from win_rate_table, best model first
+        elo_ratings: {model: rating} (a dict or a Series indexed by model)
+        tiers: Optional {model: tier}
+        glicko: Optional DataFrame indexed by model with rating, rd and volatility columns
+    
+    Returns:
+        pd.DataFrame: LEADERBOARD_COLUMNS, one row per model in win_stats order
+    """
+    models = win_stats['model']
+    table = pd.DataFrame({
+        'rank': np.arange(1, len(win_stats) + 1),
+        'tier': models.map(tiers or {}),
+        'model': models,
+        'elo_rating': models.map(elo_ratings),
+        'glicko_rating': models.map(glicko['rating']) if glicko is not None else None,
+        'glicko_rd': models.map(glicko['rd']) if glicko is not None else None,
+        'glicko_volatility': models.map(glicko['volatility']) if glicko is not None else np.nan,
+        **{column: win_stats[column] for column in WIN_RATE_COLUMNS[1:]},
+    }, index=win_stats.index)
+    return table[LEADERBOARD_COLUMNS].astype(LEADERBOARD_DTYPES)
+
+def empty_leaderboard():
+    """A leaderboard table with no models."""
+    return combine_leaderboard(win_rate_table([], [], []), {})
+
 def create_leaderboard(df, category=None):
-    """Create a comprehensive leaderboard combining win rates and ELO."""
-    win_stats = calculate_win_rates(df, category)
-    elo_ratings = calculate_elo_ratings(df, category)
-    
-    # Combine data
-    leaderboard = []
-    for i, stats in enumerate(win_stats):
-        model = stats['model']
-        leaderboard.append({
-            'rank': i + 1,
-            'model': model,
-            'elo_rating': elo_ratings[model],
-            'win_rate': stats['win_rate'],
-            'ci_lower': stats['ci_lower'],
-            'ci_upper': stats['ci_upper'],
-            'plus_margin': stats['plus_margin'],
-            'minus_margin': stats['minus_margin'],
-            'ci_range': stats['ci_range'],
-            'wins': stats['wins'],
-            'total_matches': stats['total_matches']
-        })
+    """Create a comprehensive leaderboard combining win rates, tiers, ELO and Glicko-2."""
+    if category:
+        df = df[df['task_category'] == category]
+    # With a single category, the overall board is that category's board
+    return create_all_leaderboards(df)[None]
+
+def create_all_leaderboards(df, k_factor=32, initial_rating=1200, rating_period="day"):
+    """
+    Create every category leaderboard plus the overall leaderboard in one pass.
+    
+    Win counters are accumulated with vectorized bincounts and the ELO tracks for
+    every category and the overall board are advanced together in a single
+    chronological walk over the matches, so the cost is O(matches) rather than one
+    filter-and-recompute per category.
+    
+    Args:
+        df: Match data
+        k_factor: ELO K-factor
+        initial_rating: Starting ELO rating for every model
+        rating_period: Glicko-2 rating period (see calculate_glicko_ratings)
+    
+    Returns:
+        dict: {category: leaderboard table} for each category, with the overall
+        leaderboard under the None key (see combine_leaderboard)
+    """
+    if df.empty:
+        return {None: empty_leaderboard()}
     
-    return leaderboard
+    # Stable sort so matches sharing a timestamp keep their ingest order
+    df_sorted = df.sort_values('timestamp', kind='mergesort')
+    category_codes, categories = pd.factorize(df_sorted['task_category'])
+    models = get_all_models(df_sorted)
+    model_index = {model: i for i, model in enumerate(models)}
+    
+    model_a = df_sorted['model_a'].map(model_index).to_numpy()
+    model_b = df_sorted['model_b'].map(model_index).to_numpy()
+    winner = df_sorted['winner'].map(model_index).fillna(-1).to_numpy().astype(int)
+    
+    # Track 0..n_categories-1 are the categories, the last track is the overall board
+    n_tracks = len(categories) + 1
+    n_models = len(models)
+    overall = n_tracks - 1
+    
+    # Win and match counters for every track at once
+    wins = np.zeros((n_tracks, n_models), dtype=int)
+    played = np.zeros((n_tracks, n_models), dtype=int)
+    has_winner = winner >= 0
+    np.add.at(wins, (category_codes[has_winner], winner[has_winner]), 1)
+    np.add.at(played, (category_codes, model_a), 1)
+    # A self-match only counts once, matching the (model_a | model_b) filter
+    distinct = model_a != model_b
+    np.add.at(played, (category_codes[distinct], model_b[distinct]), 1)
+    wins[overall] = wins[:overall].sum(axis=0)
+    played[overall] = played[:overall].sum(axis=0)
+    
+    # Head-to-head win matrices for the significance tiers
+    head_to_head = np.stack([
+        head_to_head_counts(model_a[category_codes == track], model_b[category_codes == track],
+                            winner[category_codes == track], n_models)
+        for track in range(overall)
+    ] + [np.zeros((n_models, n_models), dtype=np.int64)])
+    head_to_head[overall] = head_to_head[:overall].sum(axis=0)
+    
+    # Advance the category ELO track and the overall track for every match
+    ratings = [[float(initial_rating)] * n_models for _ in range(n_tracks)]
+    for track, a, b, w in zip(category_codes.tolist(), model_a.tolist(), model_b.tolist(), winner.tolist()):
+        if w == a:
+            score_a, score_b = 1, 0
+        elif w == b:
+            score_a, score_b = 0, 1
+        else:
+            score_a, score_b = 0.5, 0.5
+        
+        for elo in (ratings[track], ratings[overall]):
+            rating_a = elo[a]
+            rating_b = elo[b]
+            expected_a = 1 / (1 + 10**((rating_b - rating_a) / 400))
+            expected_b = 1 / (1 + 10**((rating_a - rating_b) / 400))
+            elo[a] = rating_a + k_factor * (score_a - expected_a)
+            elo[b] = rating_b + k_factor * (score_b - expected_b)
+    
+    # Glicko-2 per track; each run is vectorized over rating periods
+    _, _, score_a, run_ids = _glicko_inputs(df_sorted, model_index, rating_period)
+    glicko_tracks = []
+    for track in range(n_tracks):
+        in_track = slice(None) if track == overall else category_codes == track
+        glicko_tracks.append(glicko2_from_matches(
+            df_sorted['timestamp'].to_numpy()[in_track], model_a[in_track], model_b[in_track], score_a[in_track],
+            n_models, run_ids=run_ids.to_numpy()[in_track], period=rating_period
+        ))
+    
+    leaderboards = {}
+    model_names = np.asarray(models, dtype=object)
+    track_keys = list(categories) + [None]
+    for track, key in enumerate(track_keys):
+        present = np.flatnonzero(played[track])
+        win_stats = win_rate_table(model_names[present], wins[track, present], played[track, present])
+        elo_ratings = pd.Series(np.rint(np.asarray(ratings[track])[present]).astype(np.int64), index=model_names[present])
+        
+        significance = pairwise_significance(head_to_head[track])
+        ranked = win_stats['model'].map(model_index).tolist()
+        tiers = dict(zip(win_stats['model'], assign_tiers(ranked, head_to_head[track], significance['significant'])))
+        rating, rd, volatility, _ = glicko_tracks[track]
+        glicko = _glicko_table(rating, rd, volatility, models, present)
+        leaderboards[key] = combine_leaderboard(win_stats, elo_ratings, tiers, glicko)
+    
+    return leaderboards
 
 def create_mini_leaderboard(df, category=None):
-    """Create a comprehensive leaderboard combining win rates and ELO."""
+    """Create a compact leaderboard of ranks, win rates and CI margins."""
     win_stats = calculate_win_rates(df, category)
-    
-    # Combine data
-    leaderboard = []
-    for i, stats in enumerate(win_stats):
-        model = stats['model']
-        leaderboard.append({
-            'rank': i + 1,
-            'model': model,
-            'win_rate': stats['win_rate'],
-            'plus_margin': stats['plus_margin'],
-            'minus_margin': stats['minus_margin'],
-            'ci_range': stats['ci_range']
-        })
-    
-    return leaderboard
+    mini = win_stats[['model', 'win_rate', 'plus_margin', 'minus_margin', 'ci_range']]
+    return mini.assign(rank=np.arange(1, len(mini) + 1))[['rank', 'model', 'win_rate', 'plus_margin', 'minus_margin', 'ci_range']]
 
 def get_top_models_by_category(df, top_n=3):
     """Get top N models for each task category."""
     if df.empty:
         return {}
     
-    categories = df['task_category'].unique()
+    leaderboards = create_all_leaderboards(df)
     top_models = {}
     
-    for category in categories:
-        leaderboard = create_leaderboard(df, category)
-        top_models[category] = leaderboard[:top_n]
+    # Categories in order of first appearance, whatever order the leaderboards were built in
+    for category in df['task_category'].unique():
+        if category in leaderboards:
+            top_models[category] = leaderboards[category].head(top_n)
     
     return top_models
 
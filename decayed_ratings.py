@@ -0,0 +1,303 @@
+"""
+Time-decayed, recency-weighted win rates and ELO ratings.
+
+Every match is weighted by 2^(-age / half_life), so older runs count less.
+Decayed totals are kept as running sums scaled to a fixed anchor time:
+adding a match is one multiply-add per counter, and reading the totals at
+any time only rescales them. Appended matches are fed as they arrive; the
+history is only replayed when rows appear at or before the newest match
+already fed (a backfill), since ELO depends on the order of the matches.
+"""
+
+import math
+import threading
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from data_utils import combine_leaderboard, win_rate_table
+from significance import assign_tiers, pairwise_significance
+
+SECONDS_PER_DAY = 86400.0
+
+# Rebase the anchor before exp() gets anywhere near float overflow
+_MAX_EXPONENT = 300.0
+
+
+def _to_utc(timestamp):
+    """Convert a timestamp-like value to a UTC pandas Timestamp."""
+    timestamp = pd.Timestamp(timestamp)
+    return timestamp.tz_localize('UTC') if timestamp.tzinfo is None else timestamp.tz_convert('UTC')
+
+
+def _timestamp_ns(timestamps):
+    """Timestamps as UTC nanoseconds since the epoch (int64)."""
+    return pd.to_datetime(timestamps, utc=True).dt.as_unit('ns').astype('int64').to_numpy()
+
+
+def _checksum(times_ns):
+    """Order-independent checksum of timestamps (wrapping uint64 sum), to recognise rows already fed."""
+    return int(times_ns.astype(np.uint64).sum(dtype=np.uint64))
+
+
+def _add_sums(target, weights, *columns):
+    """
+    Add weights into target, summed per key, for the category boards and the overall (None) board.
+
+    columns[0] holds each row's category; the rest complete the key.
+    """
+    if not len(weights):
+        return
+    weights = pd.Series(weights)
+    for key, value in weights.groupby(list(columns), sort=False).sum().items():
+        target[key] += value
+    overall = weights.groupby(list(columns[1:]), sort=False).sum()
+    for key, value in overall.items():
+        target[(None,) + (key if isinstance(key, tuple) else (key,))] += value
+
+
+class DecayedRatings:
+    """
+    Exponentially time-decayed win rates and ELO, updated in O(1) per match.
+
+    Win and match counters are stored as sums of exp(rate * (t - anchor)), so a new
+    match adds one term and the decayed total at time T is the sum scaled by
+    exp(-rate * (T - anchor)). ELO ratings regress toward the initial rating with
+    the same half-life. Each model's rating is decayed lazily when it next plays
+    or is read.
+
+    Every update feeds both its category and the overall (None) board. A tracker
+    describes one source of data: keep one per source rather than feeding it
+    another source's rows.
+    """
+
+    def __init__(self, half_life_days=30.0, k_factor=32, initial_rating=1200):
+        self.half_life_days = half_life_days
+        self.k_factor = k_factor
+        self.initial_rating = initial_rating
+        self.rate = math.log(2) / (half_life_days * SECONDS_PER_DAY)
+        # Reentrant, so update_from_frame can hold it across selecting and feeding rows
+        self._lock = threading.RLock()
+        self.n_rebuilds = 0
+        self._reset()
+
+    def _reset(self):
+        """Forget every match fed so far."""
+        self.anchor = None
+        self.last_time = None
+        self.last_timestamp = None
+        self.n_updates = 0
+        self._last_ns = None
+        self._fed_checksum = 0
+
+        # (category, model) -> anchor-scaled decayed counts
+        self._wins = defaultdict(float)
+        self._matches = defaultdict(float)
+        # (category, winner, loser) -> anchor-scaled decayed head-to-head wins
+        self._head_to_head = defaultdict(float)
+        # (category, model) -> (rating, time the rating was last decayed to)
+        self._elo = {}
+        self._categories = set()
+
+    @classmethod
+    def from_frame(cls, df, half_life_days=30.0, k_factor=32, initial_rating=1200):
+        """A tracker fed every match of df."""
+        tracker = cls(half_life_days=half_life_days, k_factor=k_factor, initial_rating=initial_rating)
+        tracker.update_from_frame(df)
+        return tracker
+
+    def _rebase(self, new_anchor):
+        """Move the anchor forward, rescaling every stored sum (amortized O(1))."""
+        scale = math.exp(-self.rate * (new_anchor - self.anchor))
+        for key in self._wins:
+            self._wins[key] *= scale
+        for key in self._matches:
+            self._matches[key] *= scale
+        for key in self._head_to_head:
+            self._head_to_head[key] *= scale
+        self.anchor = new_anchor
+
+    def _decayed_rating(self, key, t):
+        """Return the rating for key decayed toward the initial rating up to time t."""
+        rating, rated_at = self._elo.get(key, (self.initial_rating, t))
+        if t > rated_at:
+            rating = self.initial_rating + (rating - self.initial_rating) * math.exp(-self.rate * (t - rated_at))
+        return rating
+
+    def _feed(self, times_ns, categories, model_a, model_b, winner):
+        """
+        Add matches given as arrays, in chronological order (the caller holds the lock).
+
+        The counters are summed per key in one vectorized pass; only the ELO
+        recursion, which depends on the order of the matches, steps through them.
+        """
+        if not len(times_ns):
+            return
+        t = times_ns / 1e9
+        if self.anchor is None:
+            self.anchor = float(t[0])
+        if self.rate * (t[-1] - self.anchor) > _MAX_EXPONENT:
+            self._rebase(float(t[-1]))
+
+        categories = np.asarray(categories, dtype=object)
+        model_a = np.asarray(model_a, dtype=object)
+        model_b = np.asarray(model_b, dtype=object)
+        winner = np.asarray(winner, dtype=object)
+        weight = np.exp(self.rate * (t - self.anchor))
+        a_won, b_won = winner == model_a, winner == model_b
+        decided = a_won | b_won
+        distinct = model_a != model_b
+
+        _add_sums(self._matches, weight, categories, model_a)
+        _add_sums(self._matches, weight[distinct], categories[distinct], model_b[distinct])
+        _add_sums(self._wins, weight[decided], categories[decided], winner[decided])
+        pair = decided & distinct
+        loser = np.where(a_won, model_b, model_a)
+        _add_sums(self._head_to_head, weight[pair], categories[pair], winner[pair], loser[pair])
+        self._categories.update(pd.unique(categories))
+
+        # Scores exactly as in update(): a self-match writes model_b's result last
+        score_a = np.where(a_won, 1.0, np.where(b_won, 0.0, 0.5)).tolist()
+        score_b = np.where(a_won, 0.0, np.where(b_won, 1.0, 0.5)).tolist()
+        elo, initial, k_factor, rate = self._elo, self.initial_rating, self.k_factor, self.rate
+        for ti, category, a, b, sa, sb in zip(t.tolist(), categories.tolist(), model_a.tolist(),
+                                              model_b.tolist(), score_a, score_b):
+            for board in (category, None):
+                key_a, key_b = (board, a), (board, b)
+                rating_a, rated_a = elo.get(key_a, (initial, ti))
+                if ti > rated_a:
+                    rating_a = initial + (rating_a - initial) * math.exp(-rate * (ti - rated_a))
+                rating_b, rated_b = elo.get(key_b, (initial, ti))
+                if ti > rated_b:
+                    rating_b = initial + (rating_b - initial) * math.exp(-rate * (ti - rated_b))
+                expected_a = 1 / (1 + 10**((rating_b - rating_a) / 400))
+                expected_b = 1 / (1 + 10**((rating_a - rating_b) / 400))
+                elo[key_a] = (rating_a + k_factor * (sa - expected_a), ti)
+                elo[key_b] = (rating_b + k_factor * (sb - expected_b), ti)
+
+        newest = int(times_ns.max())
+        if self._last_ns is None or newest > self._last_ns:
+            self._last_ns = newest
+            self.last_timestamp = pd.Timestamp(newest, tz='UTC')
+            self.last_time = newest / 1e9
+        self._fed_checksum = (self._fed_checksum + _checksum(times_ns)) % 2**64
+        self.n_updates += len(times_ns)
+
+    def update(self, timestamp, category, model_a, model_b, winner):
+        """Add one match. Runs in constant time regardless of history length."""
+        with self._lock:
+            self._feed(np.array([_to_utc(timestamp).value], dtype=np.int64), [category], [model_a], [model_b], [winner])
+
+    def update_from_frame(self, df):
+        """
+        Feed the matches of df that have not been fed yet, in chronological order.
+
+        df is expected to be the same data as before plus appended rows (e.g. a
+        refreshed snapshot), so only rows newer than the newest match seen are
+        processed. If the rows at or before it are not exactly the ones already
+        fed (their count or timestamp checksum differs: a backfill or a removal),
+        the tracker is rebuilt from all of df. The lock is held from selecting
+        the rows to feeding the last one, so concurrent feeds of the same frame
+        add it once.
+
+        Returns:
+            int: Number of matches added (all of df after a rebuild)
+        """
+        if df.empty:
+            return 0
+
+        with self._lock:
+            times_ns = _timestamp_ns(df['timestamp'])
+            new = np.ones(len(df), dtype=bool)
+            if self._last_ns is not None:
+                seen = times_ns <= self._last_ns
+                if seen.sum() != self.n_updates or _checksum(times_ns[seen]) != self._fed_checksum:
+                    print(f"🔁 Decayed ratings: history changed, rebuilding from {len(df)} matches")
+                    self._reset()
+                    self.n_rebuilds += 1
+                else:
+                    new = ~seen
+            if not new.any():
+                return 0
+
+            order = np.argsort(times_ns[new], kind='stable')
+            rows = np.flatnonzero(new)[order]
+            self._feed(
+                times_ns[rows], df['task_category'].to_numpy()[rows], df['model_a'].to_numpy()[rows],
+                df['model_b'].to_numpy()[rows], df['winner'].to_numpy()[rows]
+            )
+            return len(rows)
+
+    def _as_of(self, as_of):
+        # Without as_of, totals are read at the newest match, so the same data always gives the same
+        # board; the app passes the current time, so models that stopped playing keep decaying
+        if as_of is None:
+            return self.last_time
+        return _to_utc(as_of).timestamp()
+
+    def win_rates(self, category=None, as_of=None):
+        """
+        Decayed win rates, in the same format as calculate_win_rates.
+
+        'wins' and 'total_matches' are effective (decayed) counts at as_of, which
+        defaults to the newest match seen; the Wilson CI uses them as the sample size.
+        """
+        if self.anchor is None:
+            return win_rate_table([], [], [])
+
+        with self._lock:
+            scale = math.exp(-self.rate * (self._as_of(as_of) - self.anchor))
+            models = sorted(model for board, model in self._matches if board == category)
+            wins = np.array([self._wins.get((category, model), 0.0) for model in models]) * scale
+            total_matches = np.array([self._matches[(category, model)] for model in models]) * scale
+
+        stats = win_rate_table(models, wins, total_matches)
+        return stats.assign(wins=stats['wins'].round(1), total_matches=stats['total_matches'].round(1))
+
+    def elo_ratings(self, category=None, as_of=None):
+        """Decayed ELO ratings at as_of (defaults to the newest match seen)."""
+        if self.anchor is None:
+            return {}
+
+        with self._lock:
+            t = self._as_of(as_of)
+            return {
+                model: round(self._decayed_rating((board, model), t))
+                for board, model in self._elo if board == category
+            }
+
+    def tiers(self, win_stats, category=None, as_of=None):
+        """Statistically tied tiers from decayed head-to-head counts (rounded to whole matches)."""
+        if win_stats.empty:
+            return {}
+
+        with self._lock:
+            scale = math.exp(-self.rate * (self._as_of(as_of) - self.anchor))
+            model_index = {model: i for i, model in enumerate(win_stats['model'])}
+            wins = np.zeros((len(model_index), len(model_index)))
+            for (board, winner, loser), weight in self._head_to_head.items():
+                if board == category:
+                    wins[model_index[winner], model_index[loser]] = weight * scale
+
+        wins = np.rint(wins).astype(np.int64)
+        significance = pairwise_significance(wins)
+        tiers = assign_tiers(range(len(win_stats)), wins, significance['significant'])
+        return dict(zip(win_stats['model'], tiers))
+
+    def leaderboard(self, category=None, as_of=None):
+        """Decayed leaderboard, in the same format as create_leaderboard."""
+        win_stats = self.win_rates(category, as_of)
+        return combine_leaderboard(win_stats, self.elo_ratings(category, as_of), self.tiers(win_stats, category, as_of))
+
+    def leaderboards(self, as_of=None):
+        """
+        Every category leaderboard plus the overall one, like create_all_leaderboards.
+
+        as_of defaults to the newest match seen. Pass the current time to decay
+        everything up to now, including models that have not played lately.
+        """
+        with self._lock:
+            boards = {category: self.leaderboard(category, as_of) for category in sorted(self._categories)}
+            boards[None] = self.leaderboard(None, as_of)
+        return boards
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Script to export match data or leaderboards as CSV, NDJSON or Parquet.
+Rows are read, filtered and written a chunk at a time (see exports.py), so
+exporting from a snapshot's memory-mapped dataset uses the same memory no
+matter how long the match history is.
+
+The data file goes to --output, or to stdout so it can be piped; progress
+messages always go to stderr.
+
+Usage:
+    python export_data.py matches --format csv --output matches.csv
+    python export_data.py matches --category "Extract Claims" --start 2025-06-01 --end 2025-06-30 --format parquet -o june.parquet
+    python export_data.py leaderboards --format ndjson --snapshot | jq .
+"""
+
+import argparse
+import contextlib
+import sys
+import time
+
+import pandas as pd
+
+from exports import (
+    DEFAULT_CHUNK_ROWS, EXPORT_FORMATS, export_leaderboards, export_matches, write_export,
+)
+
+
+def load_source(args):
+    """
+    The rows to export and any precomputed leaderboards.
+
+    Returns:
+        tuple: (DataFrame or MappedDataset, leaderboards dict or None)
+    """
+    if args.snapshot:
+        from snapshot_store import SNAPSHOT_DIR, attach_snapshot_dataset, load_snapshot_artifacts
+
+        store_dir = args.snapshot_dir or SNAPSHOT_DIR
+        mapped = attach_snapshot_dataset(store_dir)
+        if mapped is None:
+            print(f"❌ No snapshot with a dataset file in {store_dir}")
+            raise SystemExit(1)
+        print(f"📦 Snapshot {mapped.version}: {mapped.rows} matches (memory-mapped)")
+        artifacts = load_snapshot_artifacts(store_dir)
+        return mapped, artifacts['leaderboards'] if artifacts else None
+
+    from data_utils import load_data
+
+    return load_data(use_mlflow=args.mlflow, hedged=False), None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export match data or leaderboards in chunks")
+    parser.add_argument('what', choices=['matches', 'leaderboards'], help="What to export")
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv', help="Output format")
+    parser.add_argument('--category', help="Only export one task category")
+    parser.add_argument('--start', help="First day to include (YYYY-MM-DD, UTC)")
+    parser.add_argument('--end', help="Last day to include (YYYY-MM-DD, UTC)")
+    parser.add_argument('--models', nargs='+', help="Only matches between two of these models")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help="Match rows read and written per chunk")
+    parser.add_argument('-o', '--output', help="Output file (default: stdout)")
+    parser.add_argument('--snapshot', action='store_true',
+                        help="Read the current snapshot's memory-mapped dataset instead of the saved data file")
+    parser.add_argument('--snapshot-dir', help="Snapshot store directory (default: $LEADERBOARD_SNAPSHOT_DIR or snapshots)")
+    parser.add_argument('--mlflow', action='store_true', help="Read live MLflow data instead of the saved data file")
+    args = parser.parse_args()
+
+    stdout = sys.stdout.buffer
+    # Loaders print progress; keep it out of an export piped through stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        source, leaderboards = load_source(args)
+
+        if args.what == 'matches':
+            pieces = export_matches(source, args.format, category=args.category, start=args.start, end=args.end,
+                                    models=args.models, chunk_rows=args.chunk_rows)
+        else:
+            frame = source if isinstance(source, pd.DataFrame) else source.frame()
+            pieces = export_leaderboards(frame, args.format, category=args.category, start=args.start, end=args.end,
+                                         models=args.models, leaderboards=leaderboards)
+
+        print(f"🔄 Exporting {args.what} as {args.format}...")
+        start = time.perf_counter()
+        if args.output:
+            with open(args.output, 'wb') as f:
+                written = write_export(pieces, f)
+        else:
+            written = write_export(pieces, stdout)
+            stdout.flush()
+        print(f"💾 Wrote {written / 1024:.0f} KB to {args.output or 'stdout'} in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,278 @@
+"""
+Chunked exports of match data and leaderboards as CSV, NDJSON or Parquet.
+
+Exports are generators: match rows are read, filtered and serialized a fixed
+number of rows at a time, and each chunk's bytes are yielded before the next
+chunk is read. Memory use is bounded by the chunk size, not by the length of
+the match history, as long as the rows come from a source that is not
+already held in memory (a memory-mapped dataset file, see mapped_dataset.py).
+CSV and NDJSON chunks are independent pieces of text; Parquet chunks are the
+bytes of one row group each, with the footer in the last chunk.
+
+Filters match the date and model filters of the app (see match_cube.py):
+dates are UTC days and the end day is included, and a model filter keeps
+only matches between two of the selected models.
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+
+from data_utils import LEADERBOARD_COLUMNS, MATCH_COLUMNS, create_all_leaderboards
+from match_cube import MatchCube, _day_number, _match_days
+
+EXPORT_FORMATS = ('csv', 'ndjson', 'parquet')
+EXPORT_MIME_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+DEFAULT_CHUNK_ROWS = 50_000
+OVERALL_LABEL = "Overall"
+
+EXPORT_LEADERBOARD_COLUMNS = ['category'] + LEADERBOARD_COLUMNS
+
+
+def export_filename(what, fmt, category=None):
+    """Download file name for an export, e.g. 'matches-extract-claims.csv'."""
+    parts = [what] + ([category.lower().replace(' ', '-')] if category else [])
+    return f"{'-'.join(parts)}.{fmt}"
+
+
+def _row_mask(chunk, category=None, start=None, end=None, models=None):
+    """Rows of a chunk that pass the filters, or None when every row does."""
+    mask = None
+    if category is not None:
+        mask = (chunk['task_category'] == category).to_numpy()
+    if start is not None or end is not None:
+        days = _match_days(chunk['timestamp'])
+        in_range = np.ones(len(chunk), dtype=bool)
+        if start is not None:
+            in_range &= days >= _day_number(start)
+        if end is not None:
+            in_range &= days <= _day_number(end)
+        mask = in_range if mask is None else mask & in_range
+    if models is not None:
+        models = list(models)
+        in_models = (chunk['model_a'].isin(models) & chunk['model_b'].isin(models)).to_numpy()
+        mask = in_models if mask is None else mask & in_models
+    return mask
+
+
+def match_chunks(source, category=None, start=None, end=None, models=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Yield filtered match rows in chunks of at most chunk_rows rows.
+
+    Args:
+        source: Match data, as a DataFrame or a MappedDataset
+        category: Only this task category's matches
+        start, end: First and last UTC day to include (dates or date strings); None leaves that end open
+        models: Only matches between two of these models (None for all)
+        chunk_rows: Rows read per chunk
+
+    Yields:
+        pd.DataFrame: The MATCH_COLUMNS the source has, timestamps as naive UTC.
+            Chunks with no matching rows are skipped.
+    """
+    if isinstance(source, pd.DataFrame):
+        chunks = (source.iloc[offset:offset + chunk_rows] for offset in range(0, len(source), chunk_rows))
+    else:
+        # A category's own batch is read when the file has one, so other categories' pages are never touched
+        chunks = source.chunks(category, chunk_rows)
+        category = None
+
+    for chunk in chunks:
+        mask = _row_mask(chunk, category, start, end, models)
+        if mask is not None:
+            chunk = chunk[mask]
+        if chunk.empty:
+            continue
+        chunk = chunk[[column for column in MATCH_COLUMNS if column in chunk]].reset_index(drop=True)
+        yield chunk.assign(timestamp=pd.to_datetime(chunk['timestamp'], utc=True).dt.tz_localize(None))
+
+
+def select_leaderboards(df, category=None, start=None, end=None, models=None, leaderboards=None):
+    """
+    The leaderboards an export covers, as {category: table} with the overall board under None.
+
+    Without filters these are the full leaderboards (ELO, Glicko-2 and all);
+    pass precomputed ones (e.g. from the artifacts) as leaderboards to skip
+    recomputing them. With a date range or model filter they come from a
+    match cube over the filtered matches, which like the app's filtered
+    views has no ELO or Glicko-2 ratings.
+
+    Args:
+        df: Match data
+        category: Only this category's leaderboard
+    """
+    if start is not None or end is not None or models is not None:
+        cube = MatchCube.from_frame(df)
+        if category is not None:
+            return {category: cube.slice(start, end, categories=[category], models=models).leaderboard()}
+        return cube.leaderboards(start, end, models)
+
+    if leaderboards is None:
+        leaderboards = create_all_leaderboards(df if category is None else df[df['task_category'] == category])
+        if category is not None:
+            # With a single category, the overall board is that category's board
+            return {category: leaderboards[None]}
+    if category is not None:
+        return {category: leaderboards[category]} if category in leaderboards else {}
+    return leaderboards
+
+
+def leaderboard_chunks(leaderboards):
+    """
+    Yield one chunk per leaderboard, the overall board first, with a category column.
+
+    Yields:
+        pd.DataFrame: EXPORT_LEADERBOARD_COLUMNS; the overall board's category is OVERALL_LABEL
+    """
+    keys = sorted(leaderboards, key=lambda key: (key is not None, key or ''))
+    for key in keys:
+        board = leaderboards[key]
+        if board.empty:
+            continue
+        yield board.assign(category=OVERALL_LABEL if key is None else key)[EXPORT_LEADERBOARD_COLUMNS]
+
+
+class _ChunkSink:
+    """Write-only file object that hands back whatever was written since the last take()."""
+
+    def __init__(self):
+        self._pending = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self._pending.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data = b''.join(self._pending)
+        self._pending = []
+        return data
+
+
+def _csv_stream(chunks, columns):
+    header = True
+    for chunk in chunks:
+        yield chunk.to_csv(index=False, header=header).encode('utf-8')
+        header = False
+    if header:
+        yield pd.DataFrame(columns=columns).to_csv(index=False).encode('utf-8')
+
+
+def _ndjson_stream(chunks):
+    for chunk in chunks:
+        text = chunk.to_json(orient='records', lines=True, date_format='iso')
+        # Older pandas leave the last line unterminated, which would join it to the next chunk's first
+        yield (text if text.endswith('\n') else text + '\n').encode('utf-8')
+
+
+def _arrow_table(chunk, schema=None):
+    """A chunk as an Arrow table, cast to the export's schema once the first chunk has fixed it."""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(chunk, preserve_index=False).replace_schema_metadata(None)
+    if schema is None:
+        # A column that is all null in the first chunk is exported as strings
+        schema = pa.schema([
+            pa.field(field.name, pa.string() if pa.types.is_null(field.type) else field.type)
+            for field in table.schema
+        ])
+    return table.cast(schema)
+
+
+def _parquet_stream(chunks, columns):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet exports need pyarrow: pip install pyarrow")
+
+    sink = _ChunkSink()
+    writer = None
+    try:
+        for chunk in chunks:
+            table = _arrow_table(chunk, None if writer is None else writer.schema)
+            if writer is None:
+                writer = pq.ParquetWriter(pa.PythonFile(sink, mode='w'), table.schema)
+            # One row group per chunk, handed on as soon as it is written
+            writer.write_table(table, row_group_size=len(chunk))
+            yield sink.take()
+        if writer is None:
+            empty = _arrow_table(pd.DataFrame({column: pd.Series(dtype=object) for column in columns}))
+            writer = pq.ParquetWriter(pa.PythonFile(sink, mode='w'), empty.schema)
+    finally:
+        if writer is not None:
+            writer.close()
+    yield sink.take()
+
+
+def stream_export(chunks, fmt, columns):
+    """
+    Serialize chunks of rows one at a time.
+
+    Args:
+        chunks: Iterable of DataFrames with the same columns (from match_chunks or leaderboard_chunks)
+        fmt: One of EXPORT_FORMATS
+        columns: Column names, for the header of an export with no rows
+
+    Yields:
+        bytes: The export, piece by piece; concatenated they form the whole file
+    """
+    if fmt == 'csv':
+        return _csv_stream(chunks, columns)
+    if fmt == 'ndjson':
+        return _ndjson_stream(chunks)
+    if fmt == 'parquet':
+        return _parquet_stream(chunks, columns)
+    raise ValueError(f"Unknown export format {fmt!r}, expected one of {', '.join(EXPORT_FORMATS)}")
+
+
+def export_matches(source, fmt='csv', category=None, start=None, end=None, models=None,
+                   chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Stream filtered match rows in an export format (see match_chunks and stream_export)."""
+    chunks = match_chunks(source, category, start, end, models, chunk_rows)
+    return stream_export(chunks, fmt, MATCH_COLUMNS)
+
+
+def export_leaderboards(df, fmt='csv', category=None, start=None, end=None, models=None, leaderboards=None):
+    """Stream leaderboards in an export format (see select_leaderboards and stream_export)."""
+    boards = select_leaderboards(df, category, start, end, models, leaderboards)
+    return stream_export(leaderboard_chunks(boards), fmt, EXPORT_LEADERBOARD_COLUMNS)
+
+
+def write_export(pieces, fileobj):
+    """
+    Write an export's pieces to a binary file object as they are produced.
+
+    Returns:
+        int: Bytes written
+    """
+    written = 0
+    for piece in pieces:
+        if piece:
+            fileobj.write(piece)
+            written += len(piece)
+    return written
+
+
+def export_bytes(pieces):
+    """The whole export in memory, for callers that need one payload (e.g. a download button)."""
+    buffer = io.BytesIO()
+    write_export(pieces, buffer)
+    return buffer.getvalue()
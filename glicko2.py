@@ -0,0 +1,300 @@
+"""
+Batched Glicko-2 ratings with per-model rating deviations.
+
+Matches are grouped into rating periods (days by default, or MLflow runs)
+and every model that played in a period is updated at once from its
+results against opponents' pre-period ratings, as Glicko-2 prescribes.
+Each run's judgments are first collapsed into one game, and all games
+into one row per (period, model, opponent), with vectorized sorts, and periods that share no model
+are updated together, so the Python loop runs once per batch of periods
+over small arrays rather than once per judgment. Millions of judgments
+take a few seconds.
+
+Reference: Mark E. Glickman, "Example of the Glicko-2 system" (2012).
+"""
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_RATING = 1500.0
+DEFAULT_RD = 350.0
+DEFAULT_VOLATILITY = 0.06
+DEFAULT_TAU = 0.5
+
+# Judgments of one run are not independent games: they share the run's
+# prompts, settings and judge, so they agree far more than independent games
+# would. Counted one by one, dozens of them per period look like a huge
+# surprise whenever the run disagrees with the ratings, and volatility climbs
+# until it saturates any cap. aggregate_results therefore collapses each run
+# into a single game against its opponent, scored by the share of judgments
+# won, and volatility needs no cap.
+DEFAULT_MAX_VOLATILITY = None
+
+# Conversion factor between the Glicko and Glicko-2 scales
+GLICKO2_SCALE = 173.7178
+
+_CONVERGENCE_TOLERANCE = 1e-6
+_MAX_ITERATIONS = 100
+
+
+def assign_rating_periods(timestamps, run_ids=None, period="day"):
+    """
+    Map every match to a chronological rating period index.
+
+    Args:
+        timestamps: Match timestamps
+        run_ids: Run id per match, required for period="run"
+        period: "run" (one period per MLflow run, ordered by the run's first
+            match) or a pandas frequency such as "day", "W" or "MS"
+
+    Returns:
+        np.ndarray: Period index per match, 0 for the earliest period
+    """
+    timestamps = pd.to_datetime(pd.Series(timestamps).reset_index(drop=True), utc=True)
+
+    if period == "run":
+        if run_ids is None:
+            raise ValueError("period='run' needs run ids")
+        run_codes, run_names = pd.factorize(pd.Series(run_ids).reset_index(drop=True).astype(str))
+        first_seen = np.full(len(run_names), np.iinfo(np.int64).max)
+        np.minimum.at(first_seen, run_codes, timestamps.astype('int64').to_numpy())
+        # Order runs by their first match; runs starting at the same instant still get separate periods
+        order = np.lexsort((np.asarray(run_names), first_seen))
+        rank = np.empty(len(run_names), dtype=np.int64)
+        rank[order] = np.arange(len(run_names))
+        return rank[run_codes]
+
+    freq = "D" if period == "day" else period
+    keys = timestamps.dt.tz_localize(None).dt.to_period(freq).astype('int64')
+    codes, _ = pd.factorize(keys, sort=True)
+    return codes
+
+
+def aggregate_results(periods, model_a, model_b, score_a, n_models, runs=None):
+    """
+    Collapse matches into per-(period, player, opponent) game counts and scores.
+
+    Each match is seen from both sides; self-matches carry no rating information
+    and are dropped. With runs, the matches of one run between one pair first
+    become a single game scored by the mean of their scores, so a run counts as
+    one result however many judgments it has.
+
+    Args:
+        runs: Optional run code per match (any integers identifying the run)
+
+    Returns:
+        tuple of arrays: (period, player, opponent, games, score), sorted by period
+    """
+    periods = np.asarray(periods, dtype=np.int64)
+    model_a = np.asarray(model_a, dtype=np.int64)
+    model_b = np.asarray(model_b, dtype=np.int64)
+    score_a = np.asarray(score_a, dtype=float)
+
+    distinct = model_a != model_b
+    periods, model_a, model_b, score_a = periods[distinct], model_a[distinct], model_b[distinct], score_a[distinct]
+
+    if runs is not None and len(periods):
+        runs = np.asarray(runs, dtype=np.int64)[distinct]
+        pair = model_a * n_models + model_b
+        order = np.lexsort((pair, runs, periods))
+        periods, runs, pair, model_a, model_b, score_a = (
+            values[order] for values in (periods, runs, pair, model_a, model_b, score_a)
+        )
+        new_game = (np.diff(periods) != 0) | (np.diff(runs) != 0) | (np.diff(pair) != 0)
+        starts = np.flatnonzero(np.concatenate([[True], new_game]))
+        score_a = np.add.reduceat(score_a, starts) / np.diff(np.append(starts, len(order)))
+        periods, model_a, model_b = periods[starts], model_a[starts], model_b[starts]
+
+    period = np.concatenate([periods, periods])
+    player = np.concatenate([model_a, model_b])
+    opponent = np.concatenate([model_b, model_a])
+    score = np.concatenate([score_a, 1.0 - score_a])
+
+    key = (period * n_models + player) * n_models + opponent
+    unique_keys, inverse = np.unique(key, return_inverse=True)
+    games = np.bincount(inverse)
+    score_sums = np.bincount(inverse, weights=score)
+
+    opponent = unique_keys % n_models
+    player = (unique_keys // n_models) % n_models
+    period = unique_keys // (n_models * n_models)
+    return period, player, opponent, games, score_sums
+
+
+def _g(phi):
+    return 1.0 / np.sqrt(1.0 + 3.0 * phi**2 / np.pi**2)
+
+
+def _new_volatility(phi, sigma, delta, v, tau):
+    """Solve Glickman's step 5 for many players at once (vectorized Illinois method)."""
+    a = np.log(sigma**2)
+    phi2 = phi**2
+    delta2 = delta**2
+
+    def f(x, a, phi2, delta2, v):
+        ex = np.exp(x)
+        return ex * (delta2 - phi2 - v - ex) / (2.0 * (phi2 + v + ex) ** 2) - (x - a) / tau**2
+
+    A = a.copy()
+    big_step = delta2 > phi2 + v
+    B = np.where(big_step, np.log(np.maximum(delta2 - phi2 - v, 1e-300)), a - tau)
+
+    # Where delta is small, walk B down in steps of tau until f(B) >= 0
+    pending = ~big_step & (f(B, a, phi2, delta2, v) < 0)
+    for _ in range(_MAX_ITERATIONS):
+        if not pending.any():
+            break
+        B = np.where(pending, B - tau, B)
+        pending &= f(B, a, phi2, delta2, v) < 0
+
+    f_A, f_B = f(A, a, phi2, delta2, v), f(B, a, phi2, delta2, v)
+    result = np.empty_like(A)
+    index = np.arange(len(A))
+    for _ in range(_MAX_ITERATIONS):
+        # Retire converged entries so later iterations only touch the rest
+        done = np.abs(B - A) <= _CONVERGENCE_TOLERANCE
+        if done.any():
+            result[index[done]] = A[done]
+            keep = ~done
+            if not keep.any():
+                return np.exp(result / 2.0)
+            index, A, B, f_A, f_B, a, phi2, delta2, v = (
+                values[keep] for values in (index, A, B, f_A, f_B, a, phi2, delta2, v)
+            )
+        C = A + (A - B) * f_A / np.where(f_B != f_A, f_B - f_A, 1.0)
+        f_C = f(C, a, phi2, delta2, v)
+        swap = f_C * f_B <= 0
+        A = np.where(swap, B, A)
+        f_A = np.where(swap, f_B, f_A / 2.0)
+        B, f_B = C, f_C
+
+    result[index] = A
+    return np.exp(result / 2.0)
+
+
+def _schedule(period, player):
+    """
+    Group period-sorted rows into batches that can be updated at once.
+
+    A period's update reads and writes only the models playing in it, so it
+    depends only on each of those models' previous period. Placing every period
+    one level after the latest of those gives batches in which no model appears
+    twice, and processing batches in level order is exactly equivalent to
+    processing periods one by one. With one period per run, where each run pits
+    two models, tens of thousands of periods collapse into a few thousand batches.
+
+    Returns:
+        tuple: (row order, list of (start, end) batch slices into the reordered rows)
+    """
+    if not len(period):
+        return np.arange(0), []
+    boundaries = (np.flatnonzero(np.diff(period)) + 1).tolist()
+    starts = [0] + boundaries
+    ends = boundaries + [len(period)]
+
+    model_level = {}
+    period_level = []
+    for start, end in zip(starts, ends):
+        players = set(player[start:end].tolist())
+        level = max((model_level.get(model, -1) for model in players), default=-1) + 1
+        for model in players:
+            model_level[model] = level
+        period_level.append(level)
+
+    row_level = np.repeat(period_level, np.diff(starts + [len(period)]))
+    order = np.argsort(row_level, kind='stable')
+    level_bounds = np.flatnonzero(np.diff(row_level[order])) + 1
+    batch_starts = np.concatenate([[0], level_bounds]).tolist()
+    batch_ends = np.concatenate([level_bounds, [len(period)]]).tolist()
+    return order, list(zip(batch_starts, batch_ends))
+
+
+def glicko2_ratings(period, player, opponent, games, score, n_models, initial_rating=DEFAULT_RATING,
+                    initial_rd=DEFAULT_RD, initial_volatility=DEFAULT_VOLATILITY, tau=DEFAULT_TAU,
+                    max_volatility=DEFAULT_MAX_VOLATILITY):
+    """
+    Run Glicko-2 over aggregated results from aggregate_results.
+
+    A model is unrated until its first game. After that, every period it sits
+    out inflates its deviation by its volatility, capped at the initial RD. The
+    inflation is applied lazily (k idle periods add k * volatility^2 to RD^2),
+    which is what lets independent periods be batched (see _schedule).
+
+    Args:
+        tau: System constant limiting how fast volatility can change (0.3-1.2 is typical)
+        max_volatility: Upper bound on volatility (None for none)
+
+    Returns:
+        tuple of arrays over models: (rating, rd, volatility, played), on the usual
+        Glicko scale; played marks models with at least one game
+    """
+    mu = np.zeros(n_models)
+    phi = np.full(n_models, initial_rd / GLICKO2_SCALE)
+    sigma = np.full(n_models, float(initial_volatility))
+    last_period = np.full(n_models, -1, dtype=np.int64)
+    max_phi = initial_rd / GLICKO2_SCALE
+
+    def inflated_phi(models, at_period):
+        idle = np.where(last_period[models] >= 0, at_period - last_period[models] - 1, 0)
+        return np.minimum(np.sqrt(phi[models] ** 2 + idle * sigma[models] ** 2), max_phi)
+
+    period = np.asarray(period, dtype=np.int64)
+    last = period[-1] if len(period) else -1
+    order, batches = _schedule(period, player)
+    period, player, opponent, games, score = (
+        np.asarray(values)[order] for values in (period, player, opponent, games, score)
+    )
+    for start, end in batches:
+        p = period[start:end]
+        i = player[start:end]
+        j = opponent[start:end]
+        n = games[start:end]
+        s = score[start:end]
+
+        g = _g(inflated_phi(j, p))
+        expected = 1.0 / (1.0 + np.exp(-g * (mu[i] - mu[j])))
+
+        active, first_row, inverse = np.unique(i, return_index=True, return_inverse=True)
+        v = 1.0 / np.bincount(inverse, weights=n * g**2 * expected * (1.0 - expected), minlength=len(active))
+        improvement = np.bincount(inverse, weights=g * (s - n * expected), minlength=len(active))
+        delta = v * improvement
+
+        active_period = p[first_row]
+        pre_phi = inflated_phi(active, active_period)
+        new_sigma = _new_volatility(pre_phi, sigma[active], delta, v, tau)
+        if max_volatility is not None:
+            new_sigma = np.minimum(new_sigma, max_volatility)
+        phi_star = np.sqrt(pre_phi**2 + new_sigma**2)
+        new_phi = 1.0 / np.sqrt(1.0 / phi_star**2 + 1.0 / v)
+
+        mu[active] = mu[active] + new_phi**2 * improvement
+        phi[active] = new_phi
+        sigma[active] = new_sigma
+        last_period[active] = active_period
+
+    played = last_period >= 0
+    if last >= 0:
+        # Inflate through the final period for models that sat out the end
+        phi[played] = inflated_phi(np.flatnonzero(played), last + 1)
+
+    return initial_rating + GLICKO2_SCALE * mu, GLICKO2_SCALE * phi, sigma, played
+
+
+def glicko2_from_matches(timestamps, model_a, model_b, score_a, n_models, run_ids=None, period="day", **kwargs):
+    """
+    Glicko-2 ratings straight from integer-coded matches.
+
+    Args:
+        model_a, model_b: Integer model codes per match
+        score_a: 1 if model_a won, 0 if model_b won, 0.5 for no winner
+        run_ids: Run id per match. Each run then counts as one game (see
+            aggregate_results); without them every match is its own game
+        period: Rating period, see assign_rating_periods
+        **kwargs: Passed to glicko2_ratings
+
+    Returns:
+        tuple of arrays over models: (rating, rd, volatility, played)
+    """
+    periods = assign_rating_periods(timestamps, run_ids, period)
+    runs = None if run_ids is None else pd.factorize(pd.Series(run_ids).reset_index(drop=True).astype(str))[0]
+    return glicko2_ratings(*aggregate_results(periods, model_a, model_b, score_a, n_models, runs), n_models, **kwargs)
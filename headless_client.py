@@ -0,0 +1,270 @@
+"""
+Headless Streamlit client for benchmarking the app against a real local server.
+
+Speaks the same websocket protocol as the browser (BackMsg/ForwardMsg protobufs
+on /_stcore/stream), so reruns go through the real session, caching and
+fragment machinery. Also provides helpers to launch app.py under
+`streamlit run` with the login gate satisfied by a fixed test user, an
+offline data source and its own working directory.
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Entry point run by the benchmark server: replaces st.user with a logged-in
+# test user, then executes app.py exactly like `streamlit run app.py` would.
+_ENTRY_TEMPLATE = '''import runpy
+import sys
+
+import streamlit as st
+
+sys.path.insert(0, {repo_dir!r})
+
+
+class _BenchUser(dict):
+    is_logged_in = True
+    email = "bench@vlex.com"
+
+
+st.user = _BenchUser(email=_BenchUser.email)
+runpy.run_path({app_path!r}, run_name="__main__")
+'''
+
+
+class _WebsocketConnection:
+    """Thin adapter over the websockets package, falling back to tornado."""
+
+    def __init__(self, connection, backend):
+        self._connection = connection
+        self._backend = backend
+
+    @classmethod
+    async def open(cls, url):
+        try:
+            import websockets
+            connection = await websockets.connect(url, subprotocols=["streamlit"], max_size=None)
+            return cls(connection, 'websockets')
+        except ImportError:
+            from tornado.websocket import websocket_connect
+            connection = await websocket_connect(url, subprotocols=["streamlit"], max_message_size=None)
+            return cls(connection, 'tornado')
+
+    async def send(self, data):
+        if self._backend == 'websockets':
+            await self._connection.send(data)
+        else:
+            await self._connection.write_message(data, binary=True)
+
+    async def recv(self):
+        if self._backend == 'websockets':
+            return await self._connection.recv()
+        message = await self._connection.read_message()
+        if message is None:
+            raise ConnectionError("Websocket closed by server")
+        return message
+
+    async def close(self):
+        if self._backend == 'websockets':
+            await self._connection.close()
+        else:
+            self._connection.close()
+
+
+class RerunResult:
+    """Outcome of one script or fragment run as seen by the client."""
+
+    def __init__(self, elapsed, status, n_deltas, fragment_id):
+        self.elapsed = elapsed
+        self.status = status
+        self.n_deltas = n_deltas
+        self.fragment_id = fragment_id
+
+    def __repr__(self):
+        return f"RerunResult(elapsed={self.elapsed:.3f}s, status={self.status}, deltas={self.n_deltas})"
+
+
+class HeadlessSession:
+    """
+    One browser-equivalent session.
+
+    Tracks the buttons the app rendered (label, widget id, owning fragment and
+    whether it is in the sidebar) so interactions can be scripted by label.
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.page_script_hash = ""
+        self.buttons = {}
+        self.titles = []
+        self._connection = None
+
+    async def connect(self):
+        """Open the websocket and perform the initial full run."""
+        ws_url = self.base_url.replace('http://', 'ws://').replace('https://', 'wss://') + '/_stcore/stream'
+        self._connection = await _WebsocketConnection.open(ws_url)
+        return await self.rerun()
+
+    async def close(self):
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    async def rerun(self, widget_states=(), fragment_id=""):
+        """Request a rerun and wait for the script (or fragment) to finish."""
+        message = BackMsg()
+        client_state = message.rerun_script
+        client_state.query_string = ""
+        client_state.page_script_hash = self.page_script_hash
+        client_state.fragment_id = fragment_id
+        client_state.widget_states.widgets.extend(widget_states)
+
+        if not fragment_id:
+            self.buttons = {}
+            self.titles = []
+        else:
+            self.buttons = {label: button for label, button in self.buttons.items()
+                            if button['fragment_id'] != fragment_id}
+
+        start = time.perf_counter()
+        await self._connection.send(message.SerializeToString())
+
+        n_deltas = 0
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await self._connection.recv())
+            kind = forward.WhichOneof('type')
+
+            if kind == 'new_session':
+                self.page_script_hash = forward.new_session.page_script_hash or forward.new_session.main_script_hash
+            elif kind == 'delta':
+                n_deltas += 1
+                self._record_delta(forward)
+            elif kind == 'script_finished':
+                status = ForwardMsg.ScriptFinishedStatus.Name(forward.script_finished)
+                if status == 'FINISHED_EARLY_FOR_RERUN':
+                    # The app called st.rerun(); keep waiting for the follow-up run
+                    continue
+                return RerunResult(time.perf_counter() - start, status, n_deltas, fragment_id)
+
+    def _record_delta(self, forward):
+        delta = forward.delta
+        if delta.WhichOneof('type') != 'new_element':
+            return
+        element = delta.new_element
+        element_type = element.WhichOneof('type')
+        if element_type == 'button':
+            self.buttons[element.button.label] = {
+                'id': element.button.id,
+                'fragment_id': delta.fragment_id,
+                'sidebar': bool(forward.metadata.delta_path) and forward.metadata.delta_path[0] == 1,
+            }
+        elif element_type == 'heading':
+            self.titles.append(element.heading.body)
+
+    def find_button(self, label):
+        """Return the tracked button whose label matches (or starts with) the given text."""
+        if label in self.buttons:
+            return self.buttons[label]
+        for button_label, button in self.buttons.items():
+            if button_label.startswith(label):
+                return button
+        raise KeyError(f"No button labelled {label!r}; have {sorted(self.buttons)}")
+
+    async def click(self, label):
+        """Click a button, scoping the rerun to its fragment like the browser does."""
+        button = self.find_button(label)
+        state = WidgetState(id=button['id'], trigger_value=True)
+        return await self.rerun([state], fragment_id=button['fragment_id'])
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def launch_app_server(tracking_uri, data_file=None, port=None, env=None, startup_timeout=60):
+    """
+    Start app.py under `streamlit run` for benchmarking.
+
+    The server runs in a scratch working directory (so auto-saved data never
+    touches the repo copy), publishes its shared dataset there too, reads
+    MLflow data from tracking_uri (normally a local stand-in) and optionally
+    starts from a copy of data_file.
+
+    Returns:
+        tuple: (process, base_url, workdir)
+    """
+    port = port or free_port()
+    workdir = tempfile.mkdtemp(prefix="leaderboard-bench-")
+    entry_path = os.path.join(workdir, "bench_entry.py")
+    with open(entry_path, 'w') as f:
+        f.write(_ENTRY_TEMPLATE.format(repo_dir=REPO_DIR, app_path=os.path.join(REPO_DIR, 'app.py')))
+
+    if data_file:
+        with open(data_file, 'rb') as src, open(os.path.join(workdir, 'leaderboard_data.json'), 'wb') as dst:
+            dst.write(src.read())
+
+    # The shared dataset lives in the workdir, so servers never attach to each other's (or a real deployment's) data
+    process_env = dict(os.environ)
+    process_env.update(MLFLOW_TRACKING_URI=tracking_uri,
+                       LEADERBOARD_SHARED_DATASET=os.path.join(workdir, 'leaderboard_dataset.arrow'))
+    process_env.update(env or {})
+    process = subprocess.Popen(
+        [
+            sys.executable, '-m', 'streamlit', 'run', entry_path,
+            '--server.headless', 'true',
+            '--server.port', str(port),
+            '--server.fileWatcherType', 'none',
+            '--browser.gatherUsageStats', 'false',
+        ],
+        cwd=workdir,
+        env=process_env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + startup_timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"streamlit exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"{base_url}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return process, base_url, workdir
+        except OSError:
+            time.sleep(0.2)
+
+    process.terminate()
+    raise RuntimeError(f"streamlit did not become healthy within {startup_timeout}s")
+
+
+def stop_app_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+async def _smoke(base_url):
+    session = HeadlessSession(base_url)
+    print(await session.connect(), session.titles)
+    await session.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_smoke(sys.argv[1] if len(sys.argv) > 1 else "http://127.0.0.1:8501"))
@@ -0,0 +1,180 @@
+"""
+Per-sample judge artifacts: the individual judgments behind each run's win counts.
+
+Each eval run logs its judgments as a JSON lines artifact (JUDGMENTS_ARTIFACT),
+one line per judged document:
+
+    {"index": 0, "document_id": "...", "winner": "model_a", "rationale": "...", "timestamp": 1735689600000}
+
+Artifacts are downloaded with bounded concurrency and cached on disk by run
+id, so each run's artifact is fetched once no matter how often the run is
+re-read (the watch daemon re-reads an overlap window on every poll). An
+entry records the run's end_time and is fetched again when that changes
+(the run was re-logged or finished after it was cached). A run found
+without an artifact is only trusted for MISSING_RECHECK_SECONDS, since the
+artifact may still be logged after the run appears.
+iter_run_judgments yields runs in their input order as soon as each one is
+available, while later downloads are still in flight, so runs_to_matches
+can turn them into match rows as they stream in.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+JUDGMENTS_ARTIFACT = "judgments.jsonl"
+JUDGMENT_CACHE_DIR = os.getenv("LEADERBOARD_JUDGMENT_CACHE", "judgment_cache")
+DEFAULT_MAX_WORKERS = 8
+MISSING_RECHECK_SECONDS = 3600  # How long a run without an artifact is cached before being checked again
+
+
+def parse_judgments(text):
+    """
+    Parse a judgments artifact into a list of judgments in their true order.
+
+    Lines are sorted by 'index' (falling back to 'timestamp', then file order),
+    since nothing guarantees the logger wrote them in order. Blank lines are skipped.
+    """
+    judgments = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return sorted(
+        judgments,
+        key=lambda judgment: (judgment.get('index', float('inf')), judgment.get('timestamp') or 0),
+    )
+
+
+def _cache_path(run_id, cache_dir):
+    return os.path.join(cache_dir, f"{run_id}.json")
+
+
+def _run_stamp(end_time):
+    """A run's end_time as a cache stamp (None while the run is still running)."""
+    if end_time is None or end_time != end_time:  # None, NaN or NaT
+        return None
+    return str(end_time)
+
+
+def load_cached_judgments(run_id, cache_dir=JUDGMENT_CACHE_DIR, end_time=None):
+    """
+    A run's cached judgments.
+
+    Args:
+        end_time: The run's current end_time; an entry cached at a different
+            end_time is stale
+
+    Returns:
+        tuple: (cached, judgments). judgments is None for a run known to have no
+            artifact; cached is False when the run has not been fetched yet, its
+            entry is stale, or it had no artifact more than MISSING_RECHECK_SECONDS ago.
+    """
+    try:
+        with open(_cache_path(run_id, cache_dir), 'r') as f:
+            entry = json.load(f)
+        judgments = entry['judgments']
+    except (OSError, ValueError, KeyError):
+        return False, None
+
+    if entry.get('end_time') != _run_stamp(end_time):
+        return False, None
+    if judgments is None and time.time() - entry.get('checked_at', 0) > MISSING_RECHECK_SECONDS:
+        return False, None
+    return True, judgments
+
+
+def _write_cache(run_id, judgments, cache_dir, end_time=None):
+    # Written to a temporary name and renamed, so a crash never leaves a truncated entry
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _cache_path(run_id, cache_dir)
+    temporary = f"{path}.{uuid.uuid4().hex}.tmp"
+    entry = {
+        'run_id': run_id, 'artifact': JUDGMENTS_ARTIFACT, 'end_time': _run_stamp(end_time),
+        'checked_at': time.time(), 'judgments': judgments,
+    }
+    with open(temporary, 'w') as f:
+        json.dump(entry, f)
+    os.replace(temporary, path)
+
+
+def download_judgments(artifact_uri, tracking_uri=None):
+    """
+    Download and parse one run's judgments artifact.
+
+    Args:
+        artifact_uri: The run's artifact root (the artifact_uri column of mlflow.search_runs)
+        tracking_uri: Tracking server that mlflow-artifacts:/ URIs resolve against
+
+    Returns:
+        list or None: The run's judgments, or None if the run logged no artifact.
+            Connection errors are raised rather than mistaken for a missing artifact.
+    """
+    import mlflow
+
+    listed = mlflow.artifacts.list_artifacts(artifact_uri=artifact_uri, tracking_uri=tracking_uri)
+    if not any(entry.path.rsplit('/', 1)[-1] == JUDGMENTS_ARTIFACT and not entry.is_dir for entry in listed):
+        return None
+
+    directory = tempfile.mkdtemp(prefix="judgments-")
+    try:
+        path = mlflow.artifacts.download_artifacts(
+            artifact_uri=f"{artifact_uri.rstrip('/')}/{JUDGMENTS_ARTIFACT}",
+            dst_path=directory,
+            tracking_uri=tracking_uri,
+        )
+        with open(path, 'r', encoding='utf-8') as f:
+            return parse_judgments(f.read())
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def fetch_run_judgments(run_id, artifact_uri, tracking_uri=None, cache_dir=JUDGMENT_CACHE_DIR, end_time=None):
+    """A run's judgments from the on-disk cache, downloading and caching them on a miss or a stale entry."""
+    cached, judgments = load_cached_judgments(run_id, cache_dir, end_time)
+    if cached:
+        return judgments
+
+    judgments = download_judgments(artifact_uri, tracking_uri)
+    # Runs without an artifact are cached too, so they are not asked for again until the recheck interval
+    _write_cache(run_id, judgments, cache_dir, end_time)
+    return judgments
+
+
+def iter_run_judgments(runs, tracking_uri=None, cache_dir=JUDGMENT_CACHE_DIR, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Fetch every run's judgments in parallel, yielding them in the runs' order.
+
+    At most max_workers downloads run at once and at most 2 * max_workers results
+    are held waiting for an earlier run, so memory stays bounded however many
+    runs there are.
+
+    Args:
+        runs: DataFrame from fetch_mlflow_runs (needs run_id and artifact_uri; end_time keys the cache)
+        tracking_uri: Tracking server the artifacts are served from
+        cache_dir: On-disk cache directory, one file per run id
+        max_workers: Maximum concurrent downloads
+
+    Yields:
+        tuple: (run_id, judgments or None) for every run, in order
+    """
+    if runs.empty or 'artifact_uri' not in runs.columns:
+        for run_id in runs.get('run_id', []):
+            yield run_id, None
+        return
+
+    window = 2 * max_workers
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="judgments") as pool:
+        pending = deque()
+        end_times = runs['end_time'] if 'end_time' in runs.columns else [None] * len(runs)
+        for run_id, artifact_uri, end_time in zip(runs['run_id'], runs['artifact_uri'], end_times):
+            pending.append((run_id, pool.submit(
+                fetch_run_judgments, run_id, artifact_uri, tracking_uri, cache_dir, end_time
+            )))
+            if len(pending) >= window:
+                run_id, future = pending.popleft()
+                yield run_id, future.result()
+        while pending:
+            run_id, future = pending.popleft()
+            yield run_id, future.result()
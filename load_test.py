@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Concurrent-session load test for one replica of the Streamlit app.
+
+For each synthetic dataset size, starts the MLflow stand-in and one
+`streamlit run` replica, then drives many concurrent headless websocket
+sessions through overview → task detail → back. Reports p50/p95/p99 rerun
+latency, server CPU time per session and resident memory per session.
+Runs fully offline.
+
+Usage:
+    python load_test.py
+    python load_test.py --sizes 200 1000 5000 --sessions 1 10 25 --iterations 5
+    python load_test.py --data-file leaderboard_data.json --sessions 1 5 10
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from headless_client import HeadlessSession, launch_app_server, stop_app_server
+from mlflow_standin import start_standin, synthetic_fixture
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+
+
+def process_cpu_seconds(pid):
+    """User + system CPU seconds consumed so far by a process (Linux /proc)."""
+    with open(f"/proc/{pid}/stat") as f:
+        # The command name may contain spaces, so split after its closing parenthesis
+        fields = f.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+
+def process_rss_mb(pid):
+    """Resident set size of a process in MB (Linux /proc)."""
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def percentile(values, pct):
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+async def drive_session(base_url, category, iterations, latencies, errors):
+    """One user: load the app, then loop overview → task detail → back."""
+    session = HeadlessSession(base_url)
+    try:
+        result = await session.connect()
+        latencies.append(result.elapsed)
+        for _ in range(iterations):
+            for label in (f"View Full {category} Leaderboard", "← Back to Overview"):
+                result = await session.click(label)
+                latencies.append(result.elapsed)
+    except Exception as e:
+        errors.append(f"{type(e).__name__}: {e}")
+    finally:
+        await session.close()
+
+
+async def run_sessions(base_url, n_sessions, category, iterations):
+    latencies, errors = [], []
+    await asyncio.gather(*(
+        drive_session(base_url, category, iterations, latencies, errors) for _ in range(n_sessions)
+    ))
+    return latencies, errors
+
+
+def run_load_level(process, base_url, n_sessions, category, iterations):
+    """Run one concurrency level and collect latency, CPU and memory figures."""
+    cpu_before = process_cpu_seconds(process.pid)
+    rss_before = process_rss_mb(process.pid)
+    start = time.perf_counter()
+
+    latencies, errors = asyncio.run(run_sessions(base_url, n_sessions, category, iterations))
+
+    wall = time.perf_counter() - start
+    cpu = process_cpu_seconds(process.pid) - cpu_before
+    rss_after = process_rss_mb(process.pid)
+
+    return {
+        'sessions': n_sessions,
+        'reruns': len(latencies),
+        'errors': len(errors),
+        'first_error': errors[0] if errors else '',
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'throughput': len(latencies) / wall if wall else 0.0,
+        'cpu_s_per_session': cpu / n_sessions,
+        'rss_mb': rss_after,
+        'rss_mb_per_session': max(0.0, rss_after - rss_before) / n_sessions,
+    }
+
+
+def print_results(label, results):
+    print(f"\n📊 {label}")
+    print(f"{'sessions':>8}{'reruns':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'reruns/s':>10}{'CPU s/sess':>12}{'RSS MB':>9}{'ΔRSS MB/sess':>14}{'errors':>8}")
+    for r in results:
+        print(f"{r['sessions']:>8}{r['reruns']:>8}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+              f"{r['throughput']:>10.1f}{r['cpu_s_per_session']:>12.3f}{r['rss_mb']:>9.1f}"
+              f"{r['rss_mb_per_session']:>14.2f}{r['errors']:>8}")
+        if r['first_error']:
+            print(f"{'':>8}first error: {r['first_error']}")
+
+
+def load_test_dataset(label, fixture, data_file, session_levels, category, iterations):
+    standin, tracking_uri = start_standin(fixture)
+    process, base_url, _ = launch_app_server(tracking_uri, data_file=data_file)
+    try:
+        # Warm the process-wide caches with one session so every level starts from the same state
+        asyncio.run(run_sessions(base_url, 1, category, 1))
+        results = [
+            run_load_level(process, base_url, n_sessions, category, iterations)
+            for n_sessions in session_levels
+        ]
+    finally:
+        stop_app_server(process)
+        standin.shutdown()
+
+    print_results(label, results)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test one app replica with concurrent headless sessions")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[200, 1000, 5000],
+                        help="Synthetic MLflow run counts to test (ignored with --data-file)")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 5, 10, 25],
+                        help="Concurrent session counts per dataset")
+    parser.add_argument('--iterations', type=int, default=3,
+                        help="Overview → task → back loops per session")
+    parser.add_argument('--category', default="Extract Claims")
+    parser.add_argument('--data-file', help="Serve this saved data file instead of synthetic MLflow data")
+    args = parser.parse_args()
+
+    if args.data_file:
+        # An empty stand-in makes the app fall back to the saved data file
+        empty = {'experiments': [], 'runs': []}
+        load_test_dataset(f"Saved data file {args.data_file}", empty, os.path.abspath(args.data_file),
+                          args.sessions, args.category, args.iterations)
+        return
+
+    for size in args.sizes:
+        fixture = synthetic_fixture(n_runs=size)
+        n_matches = sum(
+            int(metric['value']) for run in fixture['runs'] for metric in run['data']['metrics']
+        )
+        load_test_dataset(f"{size} synthetic runs ({n_matches} matches)", fixture, None,
+                          args.sessions, args.category, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Match data published once per host and memory-mapped by every app process.
+
+Each `streamlit run app.py` process used to load and hold its own copy of the
+match data. Instead, the data is written once as an uncompressed Arrow IPC
+file: timestamps as naive UTC nanoseconds, numbers as plain arrays and
+strings as Arrow string columns. Every process memory-maps the file read-only. Pandas
+wraps the mapped buffers directly (strings use the Arrow-backed str dtype),
+so the pages live once in the page cache and adding workers adds no copies
+of the data.
+
+The file holds one record batch with the full data in its original order,
+followed by one batch per task category, so category pages get zero-copy
+views too. A header in the schema metadata records the file format and data
+versions, where the data was loaded from and which deployment published it. A new version is written next to the old one and renamed over it:
+processes that already mapped the old file keep reading it, and new attaches
+see the new one.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+MAPPED_FORMAT_VERSION = 1
+MAPPED_DATASET_FILENAME = "dataset.arrow"
+_HEADER_KEY = b'leaderboard_dataset'
+
+# Host-wide directory for live (non-snapshot) data; /dev/shm keeps it in shared memory
+_SHARED_DATASET_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+def deployment_id(tracking_uri, data_file):
+    """
+    Short hash naming one deployment of the app: its working directory, tracking server and saved data file.
+
+    Two checkouts on one host, or one checkout pointed at two tracking servers,
+    get different ids and therefore different shared dataset files.
+    """
+    identity = json.dumps([os.getcwd(), tracking_uri, os.path.abspath(data_file)])
+    return hashlib.sha256(identity.encode('utf-8')).hexdigest()[:16]
+
+
+def shared_dataset_path(deployment):
+    """A deployment's shared dataset file; LEADERBOARD_SHARED_DATASET overrides it."""
+    return os.getenv("LEADERBOARD_SHARED_DATASET") or os.path.join(
+        _SHARED_DATASET_DIR, f"leaderboard_dataset-{deployment}.arrow"
+    )
+
+
+def _string_dtype():
+    """pandas' Arrow-backed str dtype, which can wrap mapped string buffers (pandas >= 2.3), or None."""
+    try:
+        return pd.StringDtype("pyarrow", na_value=np.nan)
+    except (TypeError, ImportError):
+        return None
+
+
+def _arrow_column(series):
+    """Encode one column as an Arrow array (naive UTC timestamps, plain numbers, strings)."""
+    import pyarrow as pa
+
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        values = pd.to_datetime(series, utc=True).dt.tz_localize(None).astype('datetime64[ns]')
+        return pa.array(values.to_numpy(), type=pa.timestamp('ns'))
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biuf':
+        return pa.array(series.to_numpy())
+    values = series.to_numpy(dtype=object)
+    return pa.array([None if pd.isna(value) else str(value) for value in values], type=pa.large_string())
+
+
+def _record_batch(df, schema=None):
+    import pyarrow as pa
+
+    arrays = [_arrow_column(df[column]) for column in df.columns]
+    if schema is not None:
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+    return pa.RecordBatch.from_arrays(arrays, names=[str(column) for column in df.columns])
+
+
+def write_mapped_dataset(df, path, version=None, source=None, deployment=None):
+    """
+    Write match data as a mappable file, atomically replacing any previous version.
+
+    Args:
+        df: Match data
+        path: Destination file
+        version: Data version recorded in the header (defaults to a timestamp)
+        source: Name of where the data was loaded from, recorded in the header
+        deployment: deployment_id of the publishing app, recorded in the header
+
+    Returns:
+        str: The version written
+    """
+    import pyarrow as pa
+
+    version = version or time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())
+    df = df.reset_index(drop=True)
+    categories = df['task_category'].unique().tolist() if len(df) else []
+
+    full = _record_batch(df)
+    header = {
+        'format': MAPPED_FORMAT_VERSION, 'version': version, 'rows': len(df), 'categories': categories,
+        'source': source, 'deployment': deployment,
+    }
+    schema = full.schema.with_metadata({_HEADER_KEY: json.dumps(header)})
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temporary = os.path.join(directory, f".{os.path.basename(path)}.{uuid.uuid4().hex}.tmp")
+    try:
+        with pa.OSFile(temporary, 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+            writer.write_batch(pa.RecordBatch.from_arrays(full.columns, schema=schema))
+            for category in categories:
+                rows = df[(df['task_category'] == category).to_numpy()]
+                writer.write_batch(_record_batch(rows, schema))
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return version
+
+
+def mapped_dataset_key(path):
+    """Change key of a mapped file (inode and mtime), or None if there is none. One stat() call."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+class MappedDataset:
+    """
+    A read-only, memory-mapped view of a file written by write_mapped_dataset.
+
+    Frames returned by frame() and category() reference the mapped pages
+    directly. The mapping stays alive as long as any of them does, even after a
+    newer version has been renamed over the file.
+    """
+
+    def __init__(self, path):
+        import pyarrow as pa
+
+        self.path = path
+        self._reader = pa.ipc.open_file(pa.memory_map(path, 'r'))
+        metadata = self._reader.schema.metadata or {}
+        if _HEADER_KEY not in metadata:
+            raise ValueError(f"{path} is not a leaderboard dataset")
+        header = json.loads(metadata[_HEADER_KEY])
+        if header.get('format') != MAPPED_FORMAT_VERSION:
+            raise ValueError(f"{path} has dataset format {header.get('format')}, expected {MAPPED_FORMAT_VERSION}")
+
+        self.version = header['version']
+        self.rows = header['rows']
+        self.categories = header['categories']
+        # Processes that attach never ran the load themselves; this is how they know what they are serving
+        self.source = header.get('source')
+        self.deployment = header.get('deployment')
+
+    def _to_frame(self, index, offset=0, length=None):
+        string_dtype = _string_dtype()
+        types_mapper = None
+        if string_dtype is not None:
+            import pyarrow as pa
+            types_mapper = {pa.string(): string_dtype, pa.large_string(): string_dtype}.get
+        batch = self._reader.get_batch(index)
+        if offset or length is not None:
+            batch = batch.slice(offset, length)
+        # split_blocks keeps each column on its own buffer instead of consolidating (copying) them
+        return batch.to_pandas(split_blocks=True, types_mapper=types_mapper)
+
+    def _batch_index(self, category):
+        if category is None:
+            return 0
+        return 1 + self.categories.index(category) if category in self.categories else None
+
+    def frame(self):
+        """The full match data in its original order."""
+        return self._to_frame(0)
+
+    def category(self, category):
+        """One category's matches, or None if the category is not in the file."""
+        index = self._batch_index(category)
+        return None if index is None else self._to_frame(index)
+
+    def chunks(self, category=None, rows=50_000):
+        """
+        Yield the full data (or one category's matches) as consecutive frames of at most `rows` rows.
+
+        Only the pages of the chunk being read are touched, so a scan over the
+        whole file never needs more than one chunk's worth of memory at a time.
+        """
+        index = self._batch_index(category)
+        if index is None:
+            return
+        total = self._reader.get_batch(index).num_rows
+        for offset in range(0, total, rows):
+            yield self._to_frame(index, offset, rows)
+
+
+def attach_mapped_dataset(path):
+    """Map a dataset file read-only, or None if it is missing, unreadable or from another format version."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return MappedDataset(path)
+    except Exception as e:
+        print(f"⚠️ Could not map {path}: {e}")
+        return None
+
+
+def expire_shared_dataset(path):
+    """Remove the host's shared dataset so the next attach reloads it. Processes already attached keep their copy."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _attach_published(path, deployment):
+    """The published file if it can be mapped and belongs to `deployment`, else None."""
+    dataset = attach_mapped_dataset(path)
+    if dataset is not None and deployment is not None and dataset.deployment != deployment:
+        print(f"⚠️ {path} was published by another deployment, reloading")
+        return None
+    return dataset
+
+
+def attach_or_publish(load, path, max_age=None, replace=False, source=None, deployment=None):
+    """
+    Attach to the host's shared dataset, loading and publishing it first if needed.
+
+    Only one process on the host loads at a time (an exclusive lock on
+    <path>.lock). A process that finds another one loading does not wait out
+    the load: it attaches to the file published last, even if stale, and picks
+    up the new version on its next attach. Only when nothing has been published
+    yet does it wait for the lock and then attach to what was published.
+
+    Args:
+        load: Function returning the match data when the file is missing or stale
+        path: Shared dataset file
+        max_age: Seconds after which the published file is reloaded (None for never)
+        replace: Load and publish even if the published file is still fresh
+        source: Function called after load, returning the name of where the data
+            came from (recorded in the header as MappedDataset.source)
+        deployment: deployment_id of the caller. A file published by another
+            deployment is never attached; it is reloaded and replaced instead.
+
+    Returns:
+        MappedDataset or None: None if the data could not be mapped (e.g. pyarrow is missing)
+    """
+    try:
+        import fcntl
+    except ImportError:
+        fcntl = None
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.lock", 'a') as lock:
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                dataset = _attach_published(path, deployment)
+                if dataset is not None:
+                    return dataset
+                fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            key = mapped_dataset_key(path)
+            fresh = not replace and key is not None and (max_age is None or time.time() - key[1] / 1e9 < max_age)
+            if fresh:
+                dataset = _attach_published(path, deployment)
+                if dataset is not None:
+                    return dataset
+
+            df = load()
+            if df.empty:
+                # A failed or empty load must not wipe out data the other workers are serving
+                dataset = _attach_published(path, deployment)
+                if dataset is not None and dataset.rows:
+                    print(f"⚠️ Loaded no records, keeping the {dataset.rows} published to {path}")
+                    return dataset
+            try:
+                write_mapped_dataset(df, path, source=source() if source is not None else None, deployment=deployment)
+            except ImportError:
+                return None
+            print(f"🗺️ Published {len(df)} records to {path}")
+            return attach_mapped_dataset(path)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
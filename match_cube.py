@@ -0,0 +1,346 @@
+"""
+Pre-aggregated match counts for slicing leaderboards by date, category and models.
+
+The cube holds one cell per (day, category, model_a, model_b) that has
+matches: how many were played, how many model_a won and how many model_b
+won. Cells are stored column-wise and sorted by day, so a date range is one
+contiguous block found by binary search. Category and model filters are
+lookup-table masks over that block. Win rates, Wilson CIs, tiers and
+summary stats of any slice are sums over its cells, so a query costs time
+proportional to the cells in the date range, not to the number of matches.
+
+Rankings that depend on match order (ELO, Glicko-2) cannot be summed from
+counts and are left out of sliced leaderboards.
+
+The cube is built once per data version and updated incrementally: update()
+aggregates only the added (and removed) matches and merges them into the
+existing cells. The watch daemon stores each snapshot's cube next to its data
+(see snapshot_store.py) and builds the next version's cube from the previous
+one plus the merge delta.
+"""
+
+import json
+import os
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from data_utils import combine_leaderboard, win_rate_table
+from significance import assign_tiers, pairwise_significance
+
+CUBE_FORMAT_VERSION = 1
+CUBE_FILENAME = "cube.arrow"
+_HEADER_KEY = b'leaderboard_cube'
+
+CELL_COLUMNS = ['day', 'category', 'model_a', 'model_b', 'matches', 'a_wins', 'b_wins']
+_KEY_COLUMNS = CELL_COLUMNS[:4]
+_COUNT_COLUMNS = CELL_COLUMNS[4:]
+
+# Day of matches without a valid timestamp: sorts first and is only in slices without a start date
+_NO_DAY = np.iinfo(np.int64).min
+_EPOCH = date(1970, 1, 1)
+
+
+def _match_days(timestamps):
+    """UTC day numbers (days since 1970-01-01) of a timestamp column; naive timestamps are taken as UTC."""
+    timestamps = pd.to_datetime(timestamps, utc=True)
+    days = timestamps.dt.tz_localize(None).to_numpy(dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+    days[timestamps.isna().to_numpy()] = _NO_DAY
+    return days
+
+
+def _day_number(value):
+    """Day number of a date, datetime or date string."""
+    if isinstance(value, datetime):
+        value = value.astimezone(timezone.utc).date() if value.tzinfo else value.date()
+    elif not isinstance(value, date):
+        value = pd.Timestamp(value).date()
+    return (value - _EPOCH).days
+
+
+def _day_date(day):
+    return _EPOCH + timedelta(days=int(day))
+
+
+def _empty_cells():
+    return {column: np.zeros(0, dtype=np.int64) for column in CELL_COLUMNS}
+
+
+class CubeSlice:
+    """
+    The cells of a cube that match a date range, categories and models.
+
+    Every statistic is a sum over the slice's cells.
+    """
+
+    def __init__(self, cube, cells):
+        self.cube = cube
+        self.cells = cells  # column -> array, restricted to the slice
+
+    def __len__(self):
+        return len(self.cells['day'])
+
+    def _model_counts(self):
+        """Wins and matches per model code (a self-match counts once for its model)."""
+        n_models = len(self.cube.models)
+        a, b = self.cells['model_a'], self.cells['model_b']
+        matches = self.cells['matches']
+        distinct = a != b
+        wins = (np.bincount(a, weights=self.cells['a_wins'], minlength=n_models)
+                + np.bincount(b, weights=self.cells['b_wins'], minlength=n_models))
+        played = np.bincount(a, weights=matches, minlength=n_models) + np.bincount(
+            b[distinct], weights=matches[distinct], minlength=n_models)
+        return wins.astype(np.int64), played.astype(np.int64)
+
+    def _present(self, played):
+        """Codes of the models with matches in the slice, ordered by name (like get_all_models)."""
+        present = np.flatnonzero(played)
+        names = np.asarray(self.cube.models, dtype=object)[present]
+        return present[np.argsort(names.astype(str), kind='stable')]
+
+    def win_rates(self):
+        """Win rates and Wilson CIs of the slice, in the same format as calculate_win_rates."""
+        wins, played = self._model_counts()
+        present = self._present(played)
+        models = np.asarray(self.cube.models, dtype=object)
+        return win_rate_table(models[present], wins[present], played[present])
+
+    def head_to_head(self, present):
+        """wins[i, j]: matches between present[i] and present[j] that present[i] won (see head_to_head_counts)."""
+        position = np.full(len(self.cube.models), -1)
+        position[present] = np.arange(len(present))
+        a, b = position[self.cells['model_a']], position[self.cells['model_b']]
+        distinct = a != b
+        wins = np.zeros((len(present), len(present)), dtype=np.int64)
+        np.add.at(wins, (a[distinct], b[distinct]), self.cells['a_wins'][distinct])
+        np.add.at(wins, (b[distinct], a[distinct]), self.cells['b_wins'][distinct])
+        return wins
+
+    def leaderboard(self):
+        """
+        Leaderboard of the slice: win rates, CIs and tiers.
+
+        Returns:
+            pd.DataFrame: LEADERBOARD_COLUMNS, with ELO and Glicko-2 left empty
+                because they depend on match order (see combine_leaderboard)
+        """
+        win_stats = self.win_rates()
+        if win_stats.empty:
+            return combine_leaderboard(win_stats, {})
+        model_index = {model: i for i, model in enumerate(self.cube.models)}
+        present = np.array([model_index[model] for model in win_stats['model']], dtype=np.int64)
+        wins = self.head_to_head(present)
+        significance = pairwise_significance(wins)
+        tiers = assign_tiers(range(len(present)), wins, significance['significant'])
+        return combine_leaderboard(win_stats, {}, dict(zip(win_stats['model'], tiers)))
+
+    def summary_stats(self):
+        """Summary statistics of the slice, in the same format as get_summary_stats."""
+        if not len(self):
+            return {'total_matches': 0, 'unique_models': 0, 'categories': [], 'date_range': 'No data'}
+        _, played = self._model_counts()
+        codes = np.flatnonzero(np.bincount(self.cells['category'], minlength=len(self.cube.categories)))
+        days = self.cells['day'][self.cells['day'] != _NO_DAY]
+        if len(days):
+            date_range = f"{_day_date(days.min()):%Y-%m-%d} to {_day_date(days.max()):%Y-%m-%d}"
+        else:
+            date_range = 'No valid dates'
+        return {
+            'total_matches': int(self.cells['matches'].sum()),
+            'unique_models': int(np.count_nonzero(played)),
+            'categories': [self.cube.categories[code] for code in codes],
+            'date_range': date_range,
+        }
+
+
+class MatchCube:
+    """
+    Match counts at (day, category, model_a, model_b) granularity.
+
+    categories and models are the dictionaries the cells' integer codes point
+    into; they only grow, so codes stay valid across updates.
+    """
+
+    def __init__(self, categories=None, models=None, cells=None):
+        self.categories = list(categories or [])
+        self.models = list(models or [])
+        self.cells = cells if cells is not None else _empty_cells()
+
+    @classmethod
+    def from_frame(cls, df):
+        """Aggregate match rows into a new cube."""
+        cube = cls()
+        cube.update(df)
+        return cube
+
+    def __len__(self):
+        """Number of non-empty cells."""
+        return len(self.cells['day'])
+
+    @property
+    def total_matches(self):
+        return int(self.cells['matches'].sum())
+
+    def date_bounds(self):
+        """(first day, last day) with matches as dates, or None for an empty cube."""
+        days = self.cells['day'][self.cells['day'] != _NO_DAY]
+        if not len(days):
+            return None
+        # Cells are sorted by day
+        return _day_date(days[0]), _day_date(days[-1])
+
+    def _codes(self, values, dictionary):
+        """Integer codes of values in a dictionary list, appending values it does not have yet."""
+        values = pd.Index(np.asarray(values, dtype=object))
+        codes = pd.Index(dictionary, dtype=object).get_indexer(values)
+        missing = codes < 0
+        if missing.any():
+            dictionary.extend(pd.unique(values[missing]).tolist())
+            codes = pd.Index(dictionary, dtype=object).get_indexer(values)
+        return codes.astype(np.int64)
+
+    def _aggregate(self, df, sign):
+        """Cells of a set of match rows, with counts multiplied by sign (-1 to subtract them)."""
+        model_a = df['model_a'].to_numpy(dtype=object)
+        model_b = df['model_b'].to_numpy(dtype=object)
+        winner = df['winner']
+        a_won = (winner == df['model_a']).to_numpy(dtype=bool, na_value=False)
+        b_won = (winner == df['model_b']).to_numpy(dtype=bool, na_value=False) & (model_a != model_b)
+        rows = pd.DataFrame({
+            'day': _match_days(df['timestamp']),
+            'category': self._codes(df['task_category'].to_numpy(dtype=object), self.categories),
+            'model_a': self._codes(model_a, self.models),
+            'model_b': self._codes(model_b, self.models),
+            'matches': np.full(len(df), sign, dtype=np.int64),
+            'a_wins': a_won.astype(np.int64) * sign,
+            'b_wins': b_won.astype(np.int64) * sign,
+        })
+        return rows.groupby(_KEY_COLUMNS, sort=False, as_index=False)[_COUNT_COLUMNS].sum()
+
+    def update(self, added=None, removed=None):
+        """
+        Add new matches and subtract removed ones, touching only the changed rows.
+
+        Args:
+            added: Match rows to add
+            removed: Match rows to subtract (e.g. the old rows of re-logged runs)
+
+        Returns:
+            MatchCube: self
+        """
+        deltas = [self._aggregate(df, sign) for df, sign in ((added, 1), (removed, -1))
+                  if df is not None and len(df)]
+        if not deltas:
+            return self
+        delta = pd.concat(deltas, ignore_index=True)
+
+        # Only cells on the days the delta touches are re-aggregated; new runs usually touch the last few
+        days = self.cells['day']
+        lo = np.searchsorted(days, delta['day'].min(), side='left')
+        hi = np.searchsorted(days, delta['day'].max(), side='right')
+        touched = pd.DataFrame({column: values[lo:hi] for column, values in self.cells.items()})
+        merged = pd.concat([touched, delta], ignore_index=True)
+        merged = merged.groupby(_KEY_COLUMNS, sort=True, as_index=False)[_COUNT_COLUMNS].sum()
+        merged = merged[merged['matches'] > 0]
+        self.cells = {
+            column: np.concatenate([values[:lo], merged[column].to_numpy(dtype=np.int64), values[hi:]])
+            for column, values in self.cells.items()
+        }
+        return self
+
+    def _mask(self, values, selected, dictionary):
+        """Boolean mask of cells whose code is one of the selected dictionary values."""
+        selected = set(selected)
+        lookup = np.array([name in selected for name in dictionary], dtype=bool)
+        return lookup[values] if len(lookup) else np.zeros(len(values), dtype=bool)
+
+    def slice(self, start=None, end=None, categories=None, models=None):
+        """
+        Select the cells of a date range, categories and model subset.
+
+        Args:
+            start, end: First and last day to include (dates, datetimes or date
+                strings, in UTC); None leaves that end open
+            categories: Task categories to include (None for all)
+            models: Only matches between two of these models (None for all)
+
+        Returns:
+            CubeSlice
+        """
+        days = self.cells['day']
+        lo = 0 if start is None else np.searchsorted(days, _day_number(start), side='left')
+        hi = len(days) if end is None else np.searchsorted(days, _day_number(end), side='right')
+        cells = {column: values[lo:hi] for column, values in self.cells.items()}
+
+        mask = None
+        if categories is not None:
+            mask = self._mask(cells['category'], categories, self.categories)
+        if models is not None:
+            in_models = self._mask(cells['model_a'], models, self.models) & self._mask(cells['model_b'], models, self.models)
+            mask = in_models if mask is None else mask & in_models
+        if mask is not None:
+            cells = {column: values[mask] for column, values in cells.items()}
+        return CubeSlice(self, cells)
+
+    def leaderboards(self, start=None, end=None, models=None):
+        """
+        Every category's sliced leaderboard plus the overall one, like create_all_leaderboards.
+
+        Returns:
+            dict: {category: leaderboard} for categories with matches in the slice, overall under None
+        """
+        overall = self.slice(start, end, models=models)
+        boards = {}
+        for code in np.flatnonzero(np.bincount(overall.cells['category'], minlength=len(self.categories))):
+            in_category = overall.cells['category'] == code
+            boards[self.categories[code]] = CubeSlice(
+                self, {column: values[in_category] for column, values in overall.cells.items()}
+            ).leaderboard()
+        boards[None] = overall.leaderboard()
+        return boards
+
+    def save(self, path):
+        """Write the cube as an Arrow IPC file, atomically replacing any previous one."""
+        import pyarrow as pa
+
+        header = {'format': CUBE_FORMAT_VERSION, 'categories': self.categories, 'models': self.models}
+        table = pa.table({column: pa.array(self.cells[column], type=pa.int64()) for column in CELL_COLUMNS})
+        table = table.replace_schema_metadata({_HEADER_KEY: json.dumps(header)})
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temporary = os.path.join(directory, f".{os.path.basename(path)}.{uuid.uuid4().hex}.tmp")
+        try:
+            with pa.OSFile(temporary, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """Read a cube written by save()."""
+        import pyarrow as pa
+
+        with pa.memory_map(path, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+        header = json.loads((table.schema.metadata or {}).get(_HEADER_KEY, b'{}'))
+        if header.get('format') != CUBE_FORMAT_VERSION:
+            raise ValueError(f"{path} has cube format {header.get('format')}, expected {CUBE_FORMAT_VERSION}")
+        cells = {column: table.column(column).to_numpy().astype(np.int64) for column in CELL_COLUMNS}
+        return cls(header['categories'], header['models'], cells)
+
+
+def load_match_cube(path):
+    """Read a saved cube, or None if it is missing, unreadable or from another format version."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return MatchCube.load(path)
+    except Exception as e:
+        print(f"⚠️ Could not read {path}: {e}")
+        return None
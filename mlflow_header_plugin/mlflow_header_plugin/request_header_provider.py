@@ -1,14 +1,17 @@
-import os
 from mlflow.tracking.request_header.abstract_request_header_provider import (
     RequestHeaderProvider,
 )
 
+from mlflow_header_plugin.transport import plugin_headers, plugin_in_context
+
 
 class PluginRequestHeaderProvider(RequestHeaderProvider):
     """RequestHeaderProvider provided through plugin system"""
 
+    # MLflow asks every provider on every request, so both answers are computed once
+    # per process (see transport.refresh_headers)
     def in_context(self):
-        return os.getenv("MLFLOW_TRACKING_URI") == "https://mlflow-tracking-api.vlex.io"
+        return plugin_in_context()
 
     def request_headers(self):
-        return {"x-mlflow-user": os.getenv("MLFLOW_USER")}
+        return dict(plugin_headers()[1])
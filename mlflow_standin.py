@@ -0,0 +1,586 @@
+#!/usr/bin/env python3
+"""
+Local MLflow tracking server stand-in for offline development and benchmarking.
+
+Serves recorded or synthetic experiments and runs over the same REST endpoints
+the MLflow client uses, with configurable latency and page sizes, so the ingest
+path in data_utils can be exercised without the live tracking server. It can
+also behave more like a remote server: gzip responses for clients that accept
+them, charge a setup delay for every new connection (TCP and TLS handshakes),
+limit bandwidth, and fail a share of requests with transient 503s.
+
+Usage:
+    # Capture the real server's experiments and runs into a fixture
+    python mlflow_standin.py record --upstream https://mlflow-tracking-api.vlex.io --out fixtures/mlflow.json
+
+    # Generate a synthetic fixture
+    python mlflow_standin.py synthesize --runs 500 --out fixtures/synthetic.json
+
+    # ...with per-sample judgment artifacts for every run
+    python mlflow_standin.py synthesize --runs 500 --artifacts --out fixtures/synthetic.json
+
+    # Serve a fixture locally
+    python mlflow_standin.py serve --fixture fixtures/mlflow.json --port 5005 --latency-ms 50 --page-size 100
+
+    # ...like a remote server behind a proxy
+    python mlflow_standin.py serve --gzip --connect-latency-ms 60 --bandwidth-mbps 50 --failure-rate 0.05
+
+    # Point the loader at it
+    MLFLOW_TRACKING_URI=http://127.0.0.1:5005 python update_data.py
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import os
+import random
+import re
+import threading
+import time
+import urllib.request
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_EXPERIMENT_NAME = "LLM Judge Complaint Analysis Evals"
+DEFAULT_TASK_PLANS = ["extract_dramatis", "extract_claims", "summarize_relief"]
+DEFAULT_MODELS = [
+    "gpt-4.1-mini-2025-04-14",
+    "us.anthropic.claude-3-7-sonnet-20250219-v1:0",
+    "gpt-4.1-2025-04-14",
+    "anthropic.claude-3-5-sonnet-20240620-v1:0",
+    "gpt-5-2025-08-07",
+]
+
+# Largest page the stand-in will hand out regardless of what the client asks for
+DEFAULT_PAGE_SIZE = 1000
+
+# Where the tracking server's proxied artifact store lives (mlflow-artifacts:/ URIs resolve here)
+ARTIFACTS_ENDPOINT = '/api/2.0/mlflow-artifacts/artifacts'
+
+
+def load_fixture(path):
+    """Load a fixture file containing recorded experiments and runs."""
+    with open(path, 'r') as f:
+        fixture = json.load(f)
+    fixture.setdefault('experiments', [])
+    fixture.setdefault('runs', [])
+    fixture.setdefault('artifacts', {})
+    return fixture
+
+
+def save_fixture(fixture, path):
+    """Write a fixture file, creating its directory if needed."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(fixture, f, indent=2)
+    print(f"✅ Saved {len(fixture['experiments'])} experiments, {len(fixture['runs'])} runs "
+          f"and artifacts for {len(fixture.get('artifacts', {}))} runs to {path}")
+
+
+def _synthetic_judgments(run_id, outcomes, start_time):
+    """Per-sample judgments artifact (JSON lines) for one synthetic run."""
+    rng = random.Random(run_id)
+    lines = []
+    for index, a_won in enumerate(outcomes):
+        lines.append(json.dumps({
+            'index': index,
+            'document_id': f"doc-{rng.getrandbits(32):08x}",
+            'winner': 'model_a' if a_won else 'model_b',
+            'rationale': f"Response {'A' if a_won else 'B'} covers more of the reference answer.",
+            'timestamp': start_time + index * 1000,
+        }))
+    return '\n'.join(lines) + '\n'
+
+
+def synthetic_fixture(n_runs=200, models=None, task_plans=None, judgments_per_run=(10, 40),
+                      experiment_name=DEFAULT_EXPERIMENT_NAME, seed=0, artifacts=False):
+    """
+    Build a deterministic synthetic fixture in MLflow REST format.
+
+    Args:
+        n_runs: Number of finished runs to generate
+        models: Raw model names to pair up (defaults to the production models)
+        task_plans: task_plan_name values to draw from
+        judgments_per_run: (min, max) number of judgments per run
+        experiment_name: Name of the single experiment holding the runs
+        seed: Random seed, so the same arguments always produce the same fixture
+        artifacts: Also attach a judgments.jsonl artifact to every run, holding the
+            individual judgments the run's win counts add up to
+
+    Returns:
+        dict: Fixture with 'experiments' and 'runs' lists and an 'artifacts' map of
+            run id -> {artifact path: file contents}
+    """
+    rng = random.Random(seed)
+    models = models or DEFAULT_MODELS
+    task_plans = task_plans or DEFAULT_TASK_PLANS
+
+    # Hidden strengths so the synthetic rankings are stable rather than coin flips
+    strengths = {model: rng.uniform(0.5, 2.0) for model in models}
+
+    experiment_id = "1"
+    experiment = {
+        'experiment_id': experiment_id,
+        'name': experiment_name,
+        'artifact_location': f"mlflow-artifacts:/{experiment_id}",
+        'lifecycle_stage': 'active',
+        'creation_time': 1735689600000,
+        'last_update_time': 1735689600000,
+        'tags': [],
+    }
+
+    runs = []
+    run_artifacts = {}
+    start_time = 1735689600000  # 2025-01-01
+    for i in range(n_runs):
+        model_a, model_b = rng.sample(models, 2)
+        task_plan = rng.choice(task_plans)
+        n_judgments = rng.randint(*judgments_per_run)
+        p_a = strengths[model_a] / (strengths[model_a] + strengths[model_b])
+        outcomes = [rng.random() < p_a for _ in range(n_judgments)]
+        model_a_wins = sum(outcomes)
+        model_b_wins = n_judgments - model_a_wins
+
+        start_time += rng.randint(10 * 60 * 1000, 6 * 60 * 60 * 1000)
+        run_id = f"{rng.getrandbits(128):032x}"
+        if artifacts:
+            run_artifacts[run_id] = {'judgments.jsonl': _synthetic_judgments(run_id, outcomes, start_time)}
+        runs.append({
+            'info': {
+                'run_id': run_id,
+                'run_uuid': run_id,
+                'run_name': f"synthetic-{i}",
+                'experiment_id': experiment_id,
+                'user_id': 'standin',
+                'status': 'FINISHED',
+                'start_time': start_time,
+                'end_time': start_time + n_judgments * 1000,
+                'artifact_uri': f"mlflow-artifacts:/{experiment_id}/{run_id}/artifacts",
+                'lifecycle_stage': 'active',
+            },
+            'data': {
+                'metrics': [
+                    {'key': 'model_a_wins', 'value': float(model_a_wins), 'timestamp': start_time, 'step': 0},
+                    {'key': 'model_b_wins', 'value': float(model_b_wins), 'timestamp': start_time, 'step': 0},
+                ],
+                'params': [
+                    {'key': 'task_plan_name', 'value': task_plan},
+                    {'key': 'model_a', 'value': model_a},
+                    {'key': 'model_b', 'value': model_b},
+                ],
+                'tags': [],
+            },
+            'inputs': {},
+        })
+
+    return {
+        'experiments': [experiment],
+        'runs': runs,
+        'artifacts': run_artifacts,
+        'recorded_at': datetime.now().isoformat(),
+        'source': f'synthetic(seed={seed})',
+    }
+
+
+def _post_json(base_url, endpoint, payload, headers=None, timeout=60):
+    """POST a JSON payload to an MLflow REST endpoint and return the decoded response."""
+    request = urllib.request.Request(
+        f"{base_url.rstrip('/')}{endpoint}",
+        data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json', **(headers or {})},
+        method='POST'
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+def record_fixture(upstream, experiment_names=None, experiment_prefix="llm_judge_evals", user=None):
+    """
+    Capture real experiments and runs from an MLflow server into a fixture.
+
+    Uses the same experiment selection as load_data_from_mlflow and pages through
+    every result, so replaying the fixture reproduces the live ingest exactly.
+    """
+    experiment_names = experiment_names or [DEFAULT_EXPERIMENT_NAME]
+    user = user or os.getenv("MLFLOW_USER")
+    headers = {'x-mlflow-user': user} if user else {}
+
+    experiments = []
+    page_token = None
+    while True:
+        payload = {'max_results': 1000}
+        if page_token:
+            payload['page_token'] = page_token
+        response = _post_json(upstream, '/api/2.0/mlflow/experiments/search', payload, headers)
+        experiments.extend(response.get('experiments', []))
+        page_token = response.get('next_page_token')
+        if not page_token:
+            break
+
+    selected = [
+        exp for exp in experiments
+        if exp['name'] in experiment_names or exp['name'].startswith(experiment_prefix)
+    ]
+    print(f"Found {len(selected)} matching experiments out of {len(experiments)}")
+
+    runs = []
+    if selected:
+        page_token = None
+        while True:
+            payload = {
+                'experiment_ids': [exp['experiment_id'] for exp in selected],
+                'filter': "status = 'FINISHED'",
+                'order_by': ['start_time DESC'],
+                'max_results': 1000,
+            }
+            if page_token:
+                payload['page_token'] = page_token
+            response = _post_json(upstream, '/api/2.0/mlflow/runs/search', payload, headers)
+            runs.extend(response.get('runs', []))
+            page_token = response.get('next_page_token')
+            if not page_token:
+                break
+
+    return {
+        'experiments': selected,
+        'runs': runs,
+        'recorded_at': datetime.now().isoformat(),
+        'source': upstream,
+    }
+
+
+_CLAUSE_PATTERN = re.compile(
+    r"^\s*(?:attributes?\.)?(\w+)\s*(=|!=|>=|<=|>|<)\s*(?:'([^']*)'|\"([^\"]*)\"|(-?\d+))\s*$"
+)
+_OPERATORS = {
+    '=': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+}
+
+
+def _parse_run_filter(filter_string):
+    """Parse the attribute filters the loader uses ("status = 'FINISHED' AND start_time > 123")."""
+    clauses = []
+    if not filter_string or not filter_string.strip():
+        return clauses
+    for clause in re.split(r"\s+and\s+", filter_string.strip(), flags=re.IGNORECASE):
+        match = _CLAUSE_PATTERN.match(clause)
+        if not match:
+            raise ValueError(f"Unsupported filter clause: {clause!r}")
+        key, op, single, double, number = match.groups()
+        value = int(number) if number is not None else (single if single is not None else double)
+        clauses.append((key, _OPERATORS[op], value))
+    return clauses
+
+
+def _encode_page_token(offset):
+    return base64.b64encode(json.dumps({'offset': offset}).encode('utf-8')).decode('utf-8')
+
+
+def _decode_page_token(token):
+    if not token:
+        return 0
+    return int(json.loads(base64.b64decode(token).decode('utf-8'))['offset'])
+
+
+class StandinState:
+    """Fixture contents plus serving knobs shared by all request handlers."""
+
+    def __init__(self, fixture, latency_ms=0, page_size=DEFAULT_PAGE_SIZE, compress=False, connect_latency_ms=0,
+                 bandwidth_mbps=None, failure_rate=0.0, seed=0):
+        self.experiments = fixture.get('experiments', [])
+        self.runs = fixture.get('runs', [])
+        self.artifacts = dict(fixture.get('artifacts', {}))
+        self.latency_ms = latency_ms
+        self.page_size = page_size
+        self.compress = compress
+        self.connect_latency_ms = connect_latency_ms
+        self.bandwidth_mbps = bandwidth_mbps
+        self.failure_rate = failure_rate
+        self.lock = threading.Lock()
+        self.request_counts = {}
+        self.connections = 0
+        self.failures = 0
+        self.bytes_sent = 0
+        self._random = random.Random(seed)
+
+    def add_runs(self, runs, artifacts=None):
+        """Append runs (and their artifacts) while serving, to simulate new evaluations arriving."""
+        with self.lock:
+            self.runs = self.runs + list(runs)
+            self.artifacts.update(artifacts or {})
+
+    def count(self, endpoint):
+        with self.lock:
+            self.request_counts[endpoint] = self.request_counts.get(endpoint, 0) + 1
+
+    def connected(self):
+        with self.lock:
+            self.connections += 1
+
+    def should_fail(self):
+        """Whether to answer this request with a transient error (drawn from a seeded generator)."""
+        if not self.failure_rate:
+            return False
+        with self.lock:
+            failed = self._random.random() < self.failure_rate
+            self.failures += failed
+        return failed
+
+    def sent(self, n_bytes):
+        with self.lock:
+            self.bytes_sent += n_bytes
+
+    def search_experiments(self, body):
+        experiments = [exp for exp in self.experiments if exp.get('lifecycle_stage', 'active') == 'active']
+        return self._page(experiments, 'experiments', body)
+
+    def search_runs(self, body):
+        experiment_ids = {str(exp_id) for exp_id in body.get('experiment_ids', [])}
+        clauses = _parse_run_filter(body.get('filter', ''))
+
+        runs = []
+        for run in self.runs:
+            info = run['info']
+            if experiment_ids and str(info['experiment_id']) not in experiment_ids:
+                continue
+            if all(op(info.get(key), value) for key, op, value in clauses):
+                runs.append(run)
+
+        for order in reversed(body.get('order_by') or []):
+            parts = order.split()
+            key = parts[0].split('.')[-1]
+            descending = len(parts) > 1 and parts[1].upper() == 'DESC'
+            runs.sort(key=lambda run: run['info'].get(key) or 0, reverse=descending)
+
+        return self._page(runs, 'runs', body)
+
+    def _run_artifacts(self, path):
+        """Split an artifact store path ('<experiment>/<run_id>/artifacts/<file>') into the run's files and the file."""
+        parts = path.strip('/').split('/', 3)
+        if len(parts) < 3 or parts[2] != 'artifacts':
+            return {}, None
+        return self.artifacts.get(parts[1], {}), (parts[3] if len(parts) > 3 else '')
+
+    def list_artifacts(self, body):
+        files, prefix = self._run_artifacts(body.get('path', ''))
+        if prefix is None:
+            return {}
+        prefix = f"{prefix.rstrip('/')}/" if prefix else ''
+        listed = {}
+        for name, content in files.items():
+            if not name.startswith(prefix):
+                continue
+            head, _, rest = name[len(prefix):].partition('/')
+            listed[head] = {'path': head, 'is_dir': True} if rest else {
+                'path': head, 'is_dir': False, 'file_size': len(content.encode('utf-8'))
+            }
+        return {'files': list(listed.values())} if listed else {}
+
+    def read_artifact(self, path):
+        """Contents of one artifact file, or None if the run has no such file."""
+        files, name = self._run_artifacts(path)
+        content = files.get(name) if name else None
+        return content.encode('utf-8') if content is not None else None
+
+    def _page(self, items, key, body):
+        offset = _decode_page_token(body.get('page_token'))
+        requested = int(body.get('max_results') or self.page_size)
+        limit = max(1, min(requested, self.page_size))
+        page = items[offset:offset + limit]
+
+        response = {key: page} if page else {}
+        if offset + limit < len(items):
+            response['next_page_token'] = _encode_page_token(offset + limit)
+        return response
+
+
+class StandinRequestHandler(BaseHTTPRequestHandler):
+    """Minimal MLflow REST API handler backed by a StandinState."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, delayed ACKs add ~40 ms to each response
+    disable_nagle_algorithm = True
+
+    ROUTES = {
+        '/api/2.0/mlflow/experiments/search': 'search_experiments',
+        '/api/2.0/mlflow/runs/search': 'search_runs',
+        ARTIFACTS_ENDPOINT: 'list_artifacts',
+    }
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        state = self.server.state
+        state.connected()
+        if state.connect_latency_ms:
+            time.sleep(state.connect_latency_ms / 1000.0)
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length).decode('utf-8'))
+
+    def _accepts_gzip(self):
+        encodings = self.headers.get('Accept-Encoding') or ''
+        return any(part.split(';')[0].strip() == 'gzip' for part in encodings.split(','))
+
+    def _send_body(self, status, data, content_type):
+        state = self.server.state
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        if state.compress and self._accepts_gzip():
+            data = gzip.compress(data, compresslevel=6)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        if state.bandwidth_mbps:
+            time.sleep(len(data) * 8 / (state.bandwidth_mbps * 1e6))
+        self.wfile.write(data)
+        state.sent(len(data))
+
+    def _send_json(self, status, payload):
+        self._send_body(status, json.dumps(payload).encode('utf-8'), 'application/json')
+
+    def _send_artifact(self, path):
+        state = self.server.state
+        state.count(ARTIFACTS_ENDPOINT)
+        if state.latency_ms:
+            time.sleep(state.latency_ms / 1000.0)
+
+        data = state.read_artifact(path[len(ARTIFACTS_ENDPOINT):])
+        if data is None:
+            self._send_json(404, {'error_code': 'RESOURCE_DOES_NOT_EXIST', 'message': f"No artifact at {path}"})
+            return
+        self._send_body(200, data, 'application/octet-stream')
+
+    def _dispatch(self, body):
+        state = self.server.state
+        path = urlparse(self.path).path
+        handler_name = self.ROUTES.get(path)
+        if handler_name is None:
+            self._send_json(404, {'error_code': 'ENDPOINT_NOT_FOUND', 'message': f"No stand-in route for {path}"})
+            return
+
+        state.count(path)
+        if state.latency_ms:
+            time.sleep(state.latency_ms / 1000.0)
+        if state.should_fail():
+            self._send_json(503, {'error_code': 'TEMPORARILY_UNAVAILABLE', 'message': "Injected transient failure"})
+            return
+
+        try:
+            payload = getattr(state, handler_name)(body)
+        except ValueError as e:
+            self._send_json(400, {'error_code': 'INVALID_PARAMETER_VALUE', 'message': str(e)})
+            return
+        self._send_json(200, payload)
+
+    def do_POST(self):
+        self._dispatch(self._read_body())
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path.startswith(f"{ARTIFACTS_ENDPOINT}/"):
+            self._send_artifact(path)
+            return
+
+        # The MLflow client sends some searches as GET with query parameters
+        query = parse_qs(urlparse(self.path).query)
+        body = {key: values if key in ('experiment_ids', 'order_by') else values[0] for key, values in query.items()}
+        self._dispatch(body)
+
+
+def start_standin(fixture, host="127.0.0.1", port=0, latency_ms=0, page_size=DEFAULT_PAGE_SIZE, compress=False,
+                  connect_latency_ms=0, bandwidth_mbps=None, failure_rate=0.0, seed=0):
+    """
+    Start the stand-in on a background thread.
+
+    Args:
+        fixture: Fixture dict (see load_fixture / synthetic_fixture)
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+        latency_ms: Artificial delay added to every request
+        page_size: Maximum number of items returned per page
+        compress: Gzip responses for clients that send Accept-Encoding: gzip
+        connect_latency_ms: Delay charged once per new connection, like a TCP and TLS handshake
+        bandwidth_mbps: Limit on response bandwidth (None for unlimited)
+        failure_rate: Share of search requests answered with a transient 503
+        seed: Seed for choosing the failed requests
+
+    Returns:
+        tuple: (server, tracking_uri). Call server.shutdown() to stop it.
+    """
+    server = ThreadingHTTPServer((host, port), StandinRequestHandler)
+    server.daemon_threads = True
+    server.state = StandinState(fixture, latency_ms=latency_ms, page_size=page_size, compress=compress,
+                                connect_latency_ms=connect_latency_ms, bandwidth_mbps=bandwidth_mbps,
+                                failure_rate=failure_rate, seed=seed)
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    tracking_uri = f"http://{server.server_address[0]}:{server.server_address[1]}"
+    return server, tracking_uri
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local MLflow stand-in for offline development and benchmarking")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve = subparsers.add_parser('serve', help="Serve a fixture over the MLflow REST API")
+    serve.add_argument('--fixture', help="Fixture file to serve (defaults to a synthetic fixture)")
+    serve.add_argument('--host', default="127.0.0.1")
+    serve.add_argument('--port', type=int, default=5005)
+    serve.add_argument('--latency-ms', type=float, default=0, help="Delay added to every request")
+    serve.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help="Maximum items per page")
+    serve.add_argument('--gzip', action='store_true', help="Gzip responses for clients that accept it")
+    serve.add_argument('--connect-latency-ms', type=float, default=0, help="Delay charged per new connection")
+    serve.add_argument('--bandwidth-mbps', type=float, help="Response bandwidth limit")
+    serve.add_argument('--failure-rate', type=float, default=0.0, help="Share of searches failed with a 503")
+
+    record = subparsers.add_parser('record', help="Capture a real server's runs into a fixture")
+    record.add_argument('--upstream', default="https://mlflow-tracking-api.vlex.io")
+    record.add_argument('--out', required=True)
+
+    synthesize = subparsers.add_parser('synthesize', help="Write a synthetic fixture")
+    synthesize.add_argument('--runs', type=int, default=200)
+    synthesize.add_argument('--seed', type=int, default=0)
+    synthesize.add_argument('--artifacts', action='store_true', help="Attach per-sample judgment artifacts to every run")
+    synthesize.add_argument('--out', required=True)
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        save_fixture(record_fixture(args.upstream), args.out)
+    elif args.command == 'synthesize':
+        save_fixture(synthetic_fixture(n_runs=args.runs, seed=args.seed, artifacts=args.artifacts), args.out)
+    else:
+        fixture = load_fixture(args.fixture) if args.fixture else synthetic_fixture()
+        server, tracking_uri = start_standin(
+            fixture, host=args.host, port=args.port, latency_ms=args.latency_ms, page_size=args.page_size,
+            compress=args.gzip, connect_latency_ms=args.connect_latency_ms, bandwidth_mbps=args.bandwidth_mbps,
+            failure_rate=args.failure_rate
+        )
+        print(f"🧪 MLflow stand-in serving {len(fixture['runs'])} runs at {tracking_uri}")
+        print(f"💡 Point the loader at it with MLFLOW_TRACKING_URI={tracking_uri}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Styling shared by the Streamlit app and the static site (see static_site.py).
+
+The app injects APP_CSS once per run and draws category cards from the HTML
+fragments below. The static site puts the same CSS and fragments into plain
+HTML pages, so both look alike. Any change here changes STYLE_FINGERPRINT,
+which makes the next static build re-render every page.
+"""
+
+import hashlib
+from html import escape
+
+APP_CSS = """
+    .category-card {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 1.5rem;
+        border-radius: 16px;
+        margin: 1rem 0;
+        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
+        color: white;
+        position: relative;
+        overflow: hidden;
+    }
+    .category-card::before {
+        content: '';
+        position: absolute;
+        top: 0;
+        left: 0;
+        right: 0;
+        bottom: 0;
+        background: rgba(255, 255, 255, 0.1);
+        backdrop-filter: blur(10px);
+        z-index: 0;
+    }
+    .category-content {
+        position: relative;
+        z-index: 1;
+    }
+    .category-title {
+        font-size: 1.5rem;
+        font-weight: 700;
+        margin-bottom: 1rem;
+        display: flex;
+        align-items: center;
+        gap: 0.5rem;
+    }
+
+    .model-row {
+        background: rgba(255, 255, 255, 0.15);
+        padding: 0.75rem;
+        border-radius: 12px;
+        margin: 0.5rem 0;
+        backdrop-filter: blur(5px);
+        border: 1px solid rgba(255, 255, 255, 0.2);
+    }
+    .rank-badge {
+        background: linear-gradient(45deg, #ff6b6b, #ffa500);
+        color: white;
+        padding: 0.4rem 0.8rem;
+        border-radius: 20px;
+        font-size: 0.8rem;
+        font-weight: 700;
+        text-shadow: 0 1px 2px rgba(0, 0, 0, 0.2);
+        box-shadow: 0 2px 8px rgba(0, 0, 0, 0.15);
+        display: inline-flex;
+        align-items: center;
+        justify-content: center;
+        min-width: 2rem;
+    }
+    .rank-1 { background: linear-gradient(45deg, #ffd700, #ffed4e); color: #333; }
+    .rank-2 { background: linear-gradient(45deg, #c0c0c0, #e5e5e5); color: #333; }
+    .rank-3 { background: linear-gradient(45deg, #cd7f32, #daa520); color: white; }
+    .view-all-btn {
+        background: rgba(255, 255, 255, 0.2);
+        border: 1px solid rgba(255, 255, 255, 0.3);
+        color: white;
+        padding: 0.5rem 1rem;
+        border-radius: 25px;
+        font-weight: 600;
+        cursor: pointer;
+        transition: all 0.3s ease;
+        backdrop-filter: blur(5px);
+    }
+    .view-all-btn:hover {
+        background: rgba(255, 255, 255, 0.3);
+        transform: translateY(-1px);
+        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.15);
+    }
+    .nav-button {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        border: none;
+        padding: 0.75rem 1.5rem;
+        border-radius: 12px;
+        font-weight: 600;
+        margin: 0.25rem;
+        cursor: pointer;
+        transition: all 0.3s ease;
+        box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3);
+    }
+    .nav-button:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 6px 20px rgba(102, 126, 234, 0.4);
+    }
+         .nav-button.active {
+         background: linear-gradient(135deg, #ff6b6b 0%, #ffa500 100%);
+         box-shadow: 0 4px 15px rgba(255, 107, 107, 0.3);
+     }
+     .button-container .stButton > button {
+         background: rgba(255, 255, 255, 0.2) !important;
+         border: 1px solid rgba(255, 255, 255, 0.4) !important;
+         color: white !important;
+         border-radius: 20px !important;
+         font-weight: 600 !important;
+         font-size: 0.9rem !important;
+         padding: 8px 16px !important;
+         transition: all 0.2s ease !important;
+         box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1) !important;
+         backdrop-filter: blur(5px) !important;
+     }
+     .button-container .stButton > button:hover {
+         background: rgba(255, 255, 255, 0.3) !important;
+         transform: translateY(-1px) !important;
+         box-shadow: 0 4px 12px rgba(0, 0, 0, 0.15) !important;
+     }
+"""
+
+# Leaderboard columns shown in the full tables, with their display names
+LEADERBOARD_DISPLAY_COLUMNS = {
+    'rank': 'Rank', 'tier': 'Tier', 'model': 'Model', 'win_rate': 'Win Rate (%)', 'ci_range': '95% CI (±)',
+    'elo_rating': 'ELO Rating', 'glicko_rating': 'Glicko-2', 'glicko_rd': 'RD (±)', 'wins': 'Wins',
+    'total_matches': 'Total Matches'
+}
+
+# Category-specific emojis and card backgrounds
+CATEGORY_ICONS = {
+    'Extract Dramatis': {'emoji': '🎭', 'icon': '👥'},
+    'Extract Claims': {'emoji': '📋', 'icon': '⚖️'},
+    'Summarize Relief': {'emoji': '📝', 'icon': '⚡'}
+}
+DEFAULT_ICONS = {'emoji': '📊', 'icon': '🔍'}
+CATEGORY_BACKGROUNDS = {
+    'Extract Dramatis': 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)',
+    'Extract Claims': 'linear-gradient(135deg, #f093fb 0%, #f5576c 100%)',
+    'Summarize Relief': 'linear-gradient(135deg, #4facfe 0%, #00f2fe 100%)',
+}
+DEFAULT_BACKGROUND = 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)'
+COMING_SOON_STYLE = 'background: linear-gradient(135deg, #9ca3af 0%, #6b7280 100%); opacity: 0.7; filter: grayscale(0.3);'
+
+COMING_SOON_HTML = '''
+            <div style="text-align: center; padding: 2rem 0;">
+                <div style="font-size: 3rem; opacity: 0.6; margin-bottom: 1rem;">🚧</div>
+                <div style="font-size: 1.2rem; font-weight: 600; margin-bottom: 0.5rem;">Coming Soon</div>
+                <div style="font-size: 0.9rem; opacity: 0.8;">Vision task evaluations are being prepared</div>
+            </div>
+        '''
+
+CARD_CLOSE_HTML = '</div></div>'
+
+
+def category_card_style(category, coming_soon=False):
+    """Inline style of a category card: its gradient, or greyed out while coming soon."""
+    if coming_soon:
+        return COMING_SOON_STYLE
+    return f"background: {CATEGORY_BACKGROUNDS.get(category, DEFAULT_BACKGROUND)};"
+
+
+def category_card_open_html(category, coming_soon=False):
+    """A category card up to and including its title; CARD_CLOSE_HTML closes it."""
+    icons = CATEGORY_ICONS.get(category, DEFAULT_ICONS)
+    badge = '<span style="font-size: 0.9rem; opacity: 0.7; margin-left: 0.5rem;">• Coming Soon</span>' if coming_soon else ''
+    return f'''
+        <div class="category-card" style="{category_card_style(category, coming_soon)}">
+            <div class="category-content">
+                <div class="category-title">
+                    <span style="font-size: 2rem;">{icons['emoji']}</span>
+                    <span>{escape(str(category))}</span>
+                    <span style="font-size: 1.2rem; opacity: 0.8;">{icons['icon']}</span>
+                    {badge}
+                </div>
+    '''
+
+
+def model_row_html(rank, model, win_rate, matches, elo):
+    """One of a card's top models: rank badge (with a medal for the top 3), name, win rate, matches and ELO."""
+    rank_class = f"rank-{rank}" if rank <= 3 else "rank-badge"
+    medal = "🥇" if rank == 1 else "🥈" if rank == 2 else "🥉" if rank == 3 else ""
+    return f'''
+                <div class="model-row">
+                    <div style="display: flex; justify-content: space-between; align-items: center;">
+                        <div style="display: flex; align-items: center; gap: 0.75rem;">
+                            <span class="rank-badge {rank_class}">{medal}#{rank}</span>
+                            <span style="font-weight: 600; font-size: 1rem;">{escape(str(model))}</span>
+                        </div>
+                        <div style="text-align: right; opacity: 0.9;">
+                            <div style="font-weight: 700; font-size: 1.1rem;">{win_rate}%</div>
+                            <div style="font-size: 0.8rem; opacity: 0.8;">{matches} matches • ELO {elo}</div>
+                        </div>
+                    </div>
+                </div>
+            '''
+
+
+def top_model_rows_html(leaderboard, n=3):
+    """Model rows for a leaderboard's first n models."""
+    return [
+        model_row_html(row['rank'], row['model'], row['win_rate'], row['total_matches'], row['elo_rating'])
+        for row in leaderboard.head(n).to_dict('records')
+    ]
+
+
+STYLE_FINGERPRINT = hashlib.sha256(
+    (APP_CSS + category_card_open_html('') + model_row_html(1, '', 0, 0, 0) + COMING_SOON_HTML).encode('utf-8')
+).hexdigest()[:16]
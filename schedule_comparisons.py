@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Script to recommend which model pairs to evaluate next.
+Ranks every model pair in each category by how much a batch of new judge
+calls would reduce the uncertainty of the rankings (see comparison_scheduler.py),
+and suggests how many matches each recommended pair needs.
+
+Usage:
+    python schedule_comparisons.py
+    python schedule_comparisons.py --top 10 --category "Extract Claims"
+    python schedule_comparisons.py --batch 25 --target 0.1 --max-samples 300 --csv next_runs.csv
+"""
+
+import argparse
+
+import pandas as pd
+
+from comparison_scheduler import DEFAULT_BATCH, DEFAULT_MAX_SAMPLES, DEFAULT_TARGET, schedule_comparisons
+from data_utils import load_data
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recommend the next model pairs to evaluate")
+    parser.add_argument('--top', type=int, default=20, help="Number of pairs to recommend")
+    parser.add_argument('--category', help="Only schedule one task category")
+    parser.add_argument('--batch', type=int, default=DEFAULT_BATCH,
+                        help="Matches per pair candidates are compared at (and the step of suggested counts)")
+    parser.add_argument('--target', type=float, default=DEFAULT_TARGET,
+                        help="Misorder probability at which a pair counts as settled")
+    parser.add_argument('--max-samples', type=int, default=DEFAULT_MAX_SAMPLES,
+                        help="Largest suggested sample count for one pair")
+    parser.add_argument('--csv', help="Also write the recommendations to this CSV file")
+    parser.add_argument('--mlflow', action='store_true', help="Read live MLflow data instead of the saved data file")
+    args = parser.parse_args()
+
+    df = load_data(use_mlflow=args.mlflow, hedged=False)
+
+    print("🔄 Scoring model pairs...")
+    print("=" * 50)
+    schedule = schedule_comparisons(df, top_n=args.top, category=args.category, batch=args.batch,
+                                    target=args.target, max_samples=args.max_samples)
+    if schedule.empty:
+        print("❌ Not enough models to compare.")
+        raise SystemExit(1)
+
+    print(f"🎯 {len(schedule)} pairs, {int(schedule['suggested_samples'].sum())} judge calls suggested in total")
+    print("=" * 50)
+    with pd.option_context('display.width', 160, 'display.max_columns', None):
+        print(schedule.to_string(index=False))
+
+    if args.csv:
+        schedule.to_csv(args.csv, index=False)
+        print(f"💾 Saved recommendations to {args.csv}")
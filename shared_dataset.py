@@ -0,0 +1,125 @@
+"""
+Read-only match data shared by reference across sessions and reruns.
+
+`st.cache_data` pickles a returned DataFrame on every call, so each rerun
+used to deserialize its own copy of the whole dataset several times. A
+SharedDataset is built once per data version, held with
+`st.cache_resource`, and never copied: every column sits on a read-only
+NumPy array, and callers get shallow views that share that memory.
+
+A dataset can also wrap a memory-mapped file (see mapped_dataset.py), in
+which case the columns are the mapped pages themselves and are shared with
+every other process on the host, not just within one process.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+def _read_only_column(series):
+    """Copy a column into a NumPy array that cannot be written to."""
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        # Timestamps are stored as naive UTC so they can live on a plain datetime64 array
+        values = pd.to_datetime(series, utc=True).dt.tz_localize(None).astype('datetime64[ns]').to_numpy(copy=True)
+    elif isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biuf':
+        values = series.to_numpy(copy=True)
+    else:
+        values = series.to_numpy(dtype=object, copy=True)
+    values.flags.writeable = False
+    return values
+
+
+def _as_series(values, n_rows):
+    # An explicit dtype stops pandas from converting object strings into a new (writable) string array
+    return pd.Series(values, index=pd.RangeIndex(n_rows), dtype=values.dtype, copy=False)
+
+
+def freeze_frame(df):
+    """
+    Build a DataFrame whose columns all sit on read-only NumPy arrays.
+
+    In-place writes to its values (df.loc[...] = ..., df.iloc[...] = ...) raise
+    ValueError instead of silently changing data other sessions are reading.
+    Timestamp columns become naive datetime64[ns] in UTC.
+    """
+    columns = {
+        column: _as_series(_read_only_column(df[column]), len(df))
+        for column in df.columns
+    }
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(df)), copy=False)
+
+
+class SharedDataset:
+    """
+    One immutable, process-wide snapshot of the match data.
+
+    frame() and category() hand out shallow views: they share the read-only
+    column arrays, so no data is copied, yet adding, dropping or reordering
+    columns on a view never reaches the shared object. Anything derived from
+    the data can be memoized with derived(), since the data can never change.
+    """
+
+    def __init__(self, df, frozen=False, mapped=None, source=None):
+        """
+        Args:
+            df: Match data, copied once into read-only arrays
+            frozen: df's columns are already read-only (e.g. memory-mapped) and are used without copying
+            mapped: MappedDataset df came from, whose per-category batches back category()
+            source: Name of where the data was loaded from (e.g. "MLflow"), if known
+        """
+        self._frame = df.copy(deep=False) if frozen else freeze_frame(df)
+        self._mapped = mapped
+        self.source = source
+        self.categories = self._frame['task_category'].unique().tolist() if len(self._frame) else []
+        self._by_category = {}
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_mapped(cls, mapped, category=None):
+        """A dataset over a MappedDataset's pages: the full data, or one category's batch."""
+        if category is None:
+            return cls(mapped.frame(), frozen=True, mapped=mapped, source=mapped.source)
+        return cls(mapped.category(category), frozen=True, source=mapped.source)
+
+    def __len__(self):
+        return len(self._frame)
+
+    @property
+    def empty(self):
+        return self._frame.empty
+
+    def frame(self):
+        """A zero-copy view of the full dataset."""
+        return self._frame.copy(deep=False)
+
+    def category(self, category):
+        """A zero-copy view of one category's rows (filtered once, then shared)."""
+        if self.categories == [category]:
+            # A single-category partition is already the category's data
+            return self.frame()
+        with self._lock:
+            if category not in self._by_category and self._mapped is not None and category in self._mapped.categories:
+                self._by_category[category] = self._mapped.category(category)
+            if category not in self._by_category:
+                rows = self._frame[(self._frame['task_category'] == category).to_numpy()]
+                self._by_category[category] = freeze_frame(rows.reset_index(drop=True))
+            return self._by_category[category].copy(deep=False)
+
+    def derived(self, key, compute):
+        """
+        Compute something from the data once and share the result.
+
+        Args:
+            key: Hashable name of the result, e.g. ("leaderboards",)
+            compute: Function taking a frame view and returning the result. The
+                result is shared between sessions and must be treated as read-only.
+        """
+        with self._lock:
+            if key in self._derived:
+                return self._derived[key]
+        result = compute(self.frame())
+        with self._lock:
+            return self._derived.setdefault(key, result)
@@ -0,0 +1,201 @@
+"""
+All-pairs significance testing for leaderboard rankings.
+
+For every pair of models in a category this computes the head-to-head win
+probability and a two-sided binomial test of "both models are equally
+good", then applies a multiple-comparison correction. Everything is
+vectorized over the models x models pair matrix, so 100+ models (about 5k
+pairs) take milliseconds.
+"""
+
+import numpy as np
+
+# Pairs with at most this many head-to-head matches get an exact binomial test;
+# larger samples use the normal approximation with continuity correction.
+EXACT_MAX_MATCHES = 200
+
+
+def _erfc(x):
+    """
+    Vectorized complementary error function (Numerical Recipes erfcc).
+
+    Fractional error is below 1.2e-7 everywhere, which is far more precision than
+    a significance flag needs, and it avoids depending on scipy.
+    """
+    x = np.asarray(x, dtype=float)
+    z = np.abs(x)
+    t = 1.0 / (1.0 + 0.5 * z)
+    poly = -z * z - 1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (0.09678418 + t * (
+        -0.18628806 + t * (0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (
+            -0.82215223 + t * 0.17087277))))))))
+    result = t * np.exp(poly)
+    return np.where(x >= 0, result, 2.0 - result)
+
+
+def head_to_head_counts(model_a, model_b, winner, n_models):
+    """
+    Count head-to-head wins from integer-coded matches.
+
+    Args:
+        model_a, model_b, winner: Integer model codes per match (winner -1 for no winner)
+        n_models: Number of distinct models
+
+    Returns:
+        np.ndarray: wins[i, j] = number of matches between i and j that i won
+    """
+    wins = np.zeros((n_models, n_models), dtype=np.int64)
+    model_a = np.asarray(model_a)
+    model_b = np.asarray(model_b)
+    winner = np.asarray(winner)
+
+    a_won = (winner == model_a) & (model_a != model_b)
+    b_won = (winner == model_b) & (model_a != model_b)
+    np.add.at(wins, (model_a[a_won], model_b[a_won]), 1)
+    np.add.at(wins, (model_b[b_won], model_a[b_won]), 1)
+    return wins
+
+
+def binomial_test_p_values(successes, trials, exact_max_matches=EXACT_MAX_MATCHES):
+    """
+    Two-sided binomial test against p = 0.5 for arrays of (successes, trials).
+
+    Small samples use the exact test: the pmf is symmetric, so
+    p = 2 * P(X <= min(k, n - k)), summed over a padded grid from a log-factorial
+    table. Larger samples use the normal approximation with continuity correction.
+    Pairs with no trials get p = 1.
+    """
+    successes = np.asarray(successes, dtype=np.int64)
+    trials = np.asarray(trials, dtype=np.int64)
+    p_values = np.ones(trials.shape, dtype=float)
+
+    tail = np.minimum(successes, trials - successes)
+
+    exact = (trials > 0) & (trials <= exact_max_matches)
+    if exact.any():
+        n = trials[exact]
+        k = tail[exact]
+        max_n = int(n.max())
+        log_factorial = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, max_n + 1)))])
+
+        j = np.arange(max_n + 1)
+        in_tail = j[None, :] <= k[:, None]
+        remaining = np.clip(n[:, None] - j[None, :], 0, None)
+        log_pmf = (
+            log_factorial[n][:, None] - log_factorial[j][None, :] - log_factorial[remaining]
+            - n[:, None] * np.log(2.0)
+        )
+        tail_probability = np.where(in_tail, np.exp(log_pmf), 0.0).sum(axis=1)
+        p_values[exact] = np.minimum(1.0, 2.0 * tail_probability)
+
+    approximate = trials > exact_max_matches
+    if approximate.any():
+        n = trials[approximate].astype(float)
+        deviation = np.abs(successes[approximate] - n / 2.0)
+        z = np.maximum(deviation - 0.5, 0.0) / np.sqrt(n / 4.0)
+        p_values[approximate] = np.minimum(1.0, _erfc(z / np.sqrt(2.0)))
+
+    return p_values
+
+
+def adjust_p_values(p_values, method="holm"):
+    """
+    Correct a flat array of p-values for multiple comparisons.
+
+    Args:
+        p_values: 1-D array of raw p-values
+        method: "holm" (family-wise error, default), "bh" (Benjamini-Hochberg
+            false discovery rate) or "none"
+    """
+    p_values = np.asarray(p_values, dtype=float)
+    m = len(p_values)
+    if m == 0 or method == "none":
+        return p_values.copy()
+
+    order = np.argsort(p_values, kind='stable')
+    ranked = p_values[order]
+
+    if method == "holm":
+        adjusted = np.maximum.accumulate(ranked * (m - np.arange(m)))
+    elif method == "bh":
+        adjusted = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+    else:
+        raise ValueError(f"Unknown correction method: {method}")
+
+    result = np.empty(m)
+    result[order] = np.minimum(adjusted, 1.0)
+    return result
+
+
+def pairwise_significance(wins, alpha=0.05, correction="holm", exact_max_matches=EXACT_MAX_MATCHES):
+    """
+    Test every model pair for a real head-to-head difference.
+
+    Args:
+        wins: Head-to-head win matrix from head_to_head_counts
+        alpha: Significance level after correction
+        correction: Multiple-comparison correction passed to adjust_p_values
+        exact_max_matches: Largest sample tested exactly
+
+    Returns:
+        dict of models x models arrays: 'matches', 'win_probability' (NaN where the
+        pair never met), 'p_value', 'p_adjusted' and 'significant'. All are symmetric
+        except win_probability, which is P(row model beats column model).
+    """
+    wins = np.asarray(wins)
+    n_models = wins.shape[0]
+    matches = wins + wins.T
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        win_probability = np.where(matches > 0, wins / matches, np.nan)
+
+    # Test each unordered pair once (upper triangle), then mirror
+    upper_i, upper_j = np.triu_indices(n_models, k=1)
+    pair_matches = matches[upper_i, upper_j]
+    raw = binomial_test_p_values(wins[upper_i, upper_j], pair_matches, exact_max_matches)
+
+    # Only pairs that actually met count toward the correction
+    adjusted = np.ones_like(raw)
+    played = pair_matches > 0
+    adjusted[played] = adjust_p_values(raw[played], correction)
+
+    p_value = np.ones((n_models, n_models))
+    p_adjusted = np.ones((n_models, n_models))
+    p_value[upper_i, upper_j] = raw
+    p_value[upper_j, upper_i] = raw
+    p_adjusted[upper_i, upper_j] = adjusted
+    p_adjusted[upper_j, upper_i] = adjusted
+
+    return {
+        'matches': matches,
+        'win_probability': win_probability,
+        'p_value': p_value,
+        'p_adjusted': p_adjusted,
+        'significant': p_adjusted < alpha,
+    }
+
+
+def assign_tiers(ranked, wins, significant):
+    """
+    Group a ranked list of models into statistically tied tiers.
+
+    Walking down the ranking, a model opens a new tier only when the first model
+    of the current tier beats it head-to-head with a significant difference;
+    otherwise the two are statistically tied and share a tier.
+
+    Args:
+        ranked: Model codes in leaderboard order
+        wins: Head-to-head win matrix
+        significant: Corrected significance matrix from pairwise_significance
+
+    Returns:
+        list: Tier number (1-based) for each entry of ranked
+    """
+    tiers = []
+    tier = 0
+    leader = None
+    for model in ranked:
+        if leader is None or (significant[leader, model] and wins[leader, model] > wins[model, leader]):
+            tier += 1
+            leader = model
+        tiers.append(tier)
+    return tiers
@@ -0,0 +1,416 @@
+"""
+Versioned, immutable data snapshots maintained by a watch daemon.
+
+Layout of the store directory:
+
+    snapshots/
+        CURRENT                       # name of the live version (replaced atomically)
+        watch_state.json              # incremental fetch watermark
+        20250812T122719123456Z-8190145d/
+            leaderboard_data.json
+            leaderboard_artifacts.json
+            dataset.arrow             # the same data, memory-mapped by app processes
+            cube.arrow                # match counts per day, category and model pair (match_cube.py)
+            manifest.json             # categories, counts, date ranges, partition files
+            partitions/
+                extract_claims.json   # or extract_claims/2025-08.json when partitioned by month
+
+Versions are written to a temporary directory and renamed into place before
+the pointer moves, so readers never see a partial snapshot. Running apps
+detect a new version by stat()-ing the pointer file and only re-read data
+when its mtime changes.
+
+Task pages read only their own category's partition, and navigation and
+summary stats come from the manifest, so a page's load cost does not grow
+with the other categories. App processes map the version's dataset.arrow
+(see mapped_dataset.py) instead of parsing JSON, so every worker on a host
+shares one copy of the data. Each version's match cube is the previous
+version's cube plus the matches the merge added and removed, so it is never
+re-aggregated from scratch while the daemon runs.
+"""
+
+import json
+import os
+import random
+import re
+import shutil
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from artifacts import ARTIFACTS_FILENAME, compute_data_fingerprint, load_artifacts, materialize_artifacts
+from data_utils import (
+    MATCH_COLUMNS, fetch_mlflow_runs, get_all_models, get_summary_stats, load_data_from_json, merge_match_delta,
+    runs_to_matches, save_data_to_json
+)
+from judgments import iter_run_judgments
+from mapped_dataset import MAPPED_DATASET_FILENAME, attach_mapped_dataset, write_mapped_dataset
+from match_cube import CUBE_FILENAME, MatchCube, load_match_cube
+
+SNAPSHOT_DIR = os.getenv("LEADERBOARD_SNAPSHOT_DIR", "snapshots")
+POINTER_FILENAME = "CURRENT"
+STATE_FILENAME = "watch_state.json"
+DATA_FILENAME = "leaderboard_data.json"
+MANIFEST_FILENAME = "manifest.json"
+PARTITIONS_DIRNAME = "partitions"
+MANIFEST_VERSION = 1
+DEFAULT_RETAIN = 10
+
+# Each poll re-reads runs that started this long before the watermark. Runs that
+# were still in progress at the last poll finish with an older start_time; the
+# deduplicating merge makes re-reading runs we already have harmless.
+WATERMARK_OVERLAP_MS = 60 * 60 * 1000
+
+
+def _write_atomic(path, text):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def snapshot_pointer_key(store_dir=SNAPSHOT_DIR):
+    """
+    Cheap change token for the current snapshot: the pointer's mtime in ns.
+
+    Costs a single stat() call, so apps can check it on every rerun.
+    Returns None when no snapshot has been published.
+    """
+    try:
+        return os.stat(os.path.join(store_dir, POINTER_FILENAME)).st_mtime_ns
+    except OSError:
+        return None
+
+
+def current_version(store_dir=SNAPSHOT_DIR):
+    """Name of the live snapshot version, or None."""
+    try:
+        with open(os.path.join(store_dir, POINTER_FILENAME), 'r') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def version_path(version, store_dir=SNAPSHOT_DIR):
+    return os.path.join(store_dir, version)
+
+
+def list_versions(store_dir=SNAPSHOT_DIR):
+    """All published versions, oldest first (version names sort chronologically)."""
+    if not os.path.isdir(store_dir):
+        return []
+    return sorted(
+        name for name in os.listdir(store_dir)
+        if os.path.isdir(os.path.join(store_dir, name)) and not name.startswith('.')
+    )
+
+
+def prune_snapshots(store_dir=SNAPSHOT_DIR, retain=DEFAULT_RETAIN):
+    """Delete all but the newest `retain` versions. The live version is never deleted."""
+    live = current_version(store_dir)
+    versions = list_versions(store_dir)
+    removed = []
+    for version in versions[:max(0, len(versions) - retain)]:
+        if version == live:
+            continue
+        shutil.rmtree(version_path(version, store_dir), ignore_errors=True)
+        removed.append(version)
+    return removed
+
+
+def _slug(category):
+    return re.sub(r'[^a-z0-9]+', '_', str(category).lower()).strip('_') or 'category'
+
+
+def write_partitions(df, directory, by_month=False):
+    """
+    Write one data file per category (or per category and month) plus a manifest.
+
+    The manifest holds everything navigation and the overview header need
+    (category names, match counts, date ranges, summary stats) without
+    touching any partition.
+
+    Returns:
+        dict: The manifest
+    """
+    partitions_dir = os.path.join(directory, PARTITIONS_DIRNAME)
+    os.makedirs(partitions_dir, exist_ok=True)
+    timestamps = pd.to_datetime(df['timestamp'], utc=True)
+
+    categories = {}
+    used_slugs = set()
+    for category in df['task_category'].unique().tolist():
+        slug = _slug(category)
+        while slug in used_slugs:
+            slug += '_'
+        used_slugs.add(slug)
+
+        in_category = (df['task_category'] == category).to_numpy()
+        part = df[in_category]
+        part_times = timestamps[in_category]
+
+        if by_month:
+            months = part_times.dt.strftime('%Y-%m')
+            os.makedirs(os.path.join(partitions_dir, slug), exist_ok=True)
+            groups = [(month, part[(months == month).to_numpy()]) for month in sorted(months.unique())]
+        else:
+            groups = [(None, part)]
+
+        files = []
+        for month, rows in groups:
+            relative = os.path.join(PARTITIONS_DIRNAME, slug, f"{month}.json") if month else \
+                os.path.join(PARTITIONS_DIRNAME, f"{slug}.json")
+            save_data_to_json(rows, os.path.join(directory, relative))
+            files.append({'file': relative, 'month': month, 'matches': len(rows)})
+
+        categories[category] = {
+            'matches': int(in_category.sum()),
+            'models': get_all_models(part),
+            'first_match': part_times.min().isoformat(),
+            'last_match': part_times.max().isoformat(),
+            'partitions': files,
+        }
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'fingerprint': compute_data_fingerprint(df),
+        'partitioned_by_month': by_month,
+        'summary_stats': get_summary_stats(df),
+        'categories': categories,
+    }
+    _write_atomic(os.path.join(directory, MANIFEST_FILENAME), json.dumps(manifest, indent=2, default=str))
+    return manifest
+
+
+def publish_snapshot(df, store_dir=SNAPSHOT_DIR, retain=DEFAULT_RETAIN, by_month=False, cube=None):
+    """
+    Write df as a new immutable version (data, partitions, manifest, cube and artifacts) and make it current.
+
+    Args:
+        by_month: Split each category's partition further into one file per month
+        cube: MatchCube of df if already maintained incrementally (built from df otherwise)
+
+    Returns:
+        str: The new version name
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    version = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S%fZ}-{compute_data_fingerprint(df)[:8]}"
+    staging = os.path.join(store_dir, f".staging-{version}")
+    os.makedirs(staging)
+
+    try:
+        if not save_data_to_json(df, os.path.join(staging, DATA_FILENAME)):
+            raise IOError(f"Failed to write snapshot {version}")
+        write_partitions(df, staging, by_month)
+        try:
+            write_mapped_dataset(df, os.path.join(staging, MAPPED_DATASET_FILENAME), version=version)
+            if cube is None or cube.total_matches != len(df):
+                cube = MatchCube.from_frame(df)
+            cube.save(os.path.join(staging, CUBE_FILENAME))
+        except ImportError:
+            print("⚠️ pyarrow is not installed; apps will read this snapshot from JSON")
+        materialize_artifacts(df, os.path.join(staging, ARTIFACTS_FILENAME))
+
+        os.rename(staging, version_path(version, store_dir))
+    except BaseException:
+        # A half-written version must not linger in the store
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    _write_atomic(os.path.join(store_dir, POINTER_FILENAME), version)
+    print(f"📦 Published snapshot {version} ({len(df)} records)")
+
+    removed = prune_snapshots(store_dir, retain)
+    if removed:
+        print(f"🧹 Pruned {len(removed)} old snapshot(s)")
+    return version
+
+
+def load_snapshot(store_dir=SNAPSHOT_DIR, version=None):
+    """Load a snapshot's match data (the current one by default)."""
+    version = version or current_version(store_dir)
+    if version is None:
+        return pd.DataFrame(columns=MATCH_COLUMNS)
+    return load_data_from_json(os.path.join(version_path(version, store_dir), DATA_FILENAME))
+
+
+def attach_snapshot_dataset(store_dir=SNAPSHOT_DIR, version=None):
+    """Memory-map a snapshot's dataset.arrow (the current one by default), or None if it has none."""
+    version = version or current_version(store_dir)
+    if version is None:
+        return None
+    return attach_mapped_dataset(os.path.join(version_path(version, store_dir), MAPPED_DATASET_FILENAME))
+
+
+def load_snapshot_cube(store_dir=SNAPSHOT_DIR, version=None):
+    """Load a snapshot's match cube (the current one by default), or None if it has none."""
+    version = version or current_version(store_dir)
+    if version is None:
+        return None
+    return load_match_cube(os.path.join(version_path(version, store_dir), CUBE_FILENAME))
+
+
+def load_snapshot_artifacts(store_dir=SNAPSHOT_DIR, version=None):
+    """Load a snapshot's precomputed artifacts (the current one by default)."""
+    version = version or current_version(store_dir)
+    if version is None:
+        return None
+    filename = os.path.join(version_path(version, store_dir), ARTIFACTS_FILENAME)
+    # load_artifacts falls back to the repo copy, which must not stand in for a snapshot's
+    return load_artifacts(filename) if os.path.exists(filename) else None
+
+
+def load_manifest(store_dir=SNAPSHOT_DIR, version=None):
+    """Load a snapshot's manifest (the current one by default), or None."""
+    version = version or current_version(store_dir)
+    if version is None:
+        return None
+    try:
+        with open(os.path.join(version_path(version, store_dir), MANIFEST_FILENAME), 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    manifest['snapshot'] = version
+    return manifest
+
+
+def load_category_partition(category, manifest, store_dir=SNAPSHOT_DIR, months=None):
+    """
+    Load one category's matches from a snapshot without reading any other category.
+
+    Args:
+        manifest: The snapshot's manifest from load_manifest
+        months: Optional collection of 'YYYY-MM' strings to restrict month partitions to
+
+    Returns:
+        pd.DataFrame: The category's match rows
+    """
+    entry = manifest['categories'].get(category)
+    if entry is None:
+        return pd.DataFrame(columns=MATCH_COLUMNS)
+
+    directory = version_path(manifest['snapshot'], store_dir)
+    frames = [
+        load_data_from_json(os.path.join(directory, part['file']))
+        for part in entry['partitions']
+        if months is None or part['month'] is None or part['month'] in months
+    ]
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=MATCH_COLUMNS)
+    if len(frames) == 1:
+        return frames[0]
+    # Month files are listed oldest first; put the newest month first, like the full data
+    return pd.concat(frames[::-1], ignore_index=True)
+
+
+def read_watch_state(store_dir=SNAPSHOT_DIR):
+    try:
+        with open(os.path.join(store_dir, STATE_FILENAME), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_watch_state(state, store_dir=SNAPSHOT_DIR):
+    os.makedirs(store_dir, exist_ok=True)
+    _write_atomic(os.path.join(store_dir, STATE_FILENAME), json.dumps(state, indent=2))
+
+
+def _jittered(delay, jitter):
+    return max(0.0, delay * (1 + random.uniform(-jitter, jitter)))
+
+
+def poll_once(store_dir=SNAPSHOT_DIR, tracking_uri=None, retain=DEFAULT_RETAIN, current=None,
+              overlap_ms=WATERMARK_OVERLAP_MS, by_month=False, with_judgments=False):
+    """
+    Fetch runs around and after the stored watermark and publish a new version if anything changed.
+
+    Args:
+        current: The live snapshot's data if already in memory (avoids re-reading it)
+        overlap_ms: How far before the watermark to re-read (see WATERMARK_OVERLAP_MS)
+        by_month: Partition each category by month as well (see publish_snapshot)
+        with_judgments: Ingest runs' per-sample judgment artifacts (see judgments.py).
+            Artifacts are cached by run id, so re-read overlap runs are not downloaded again.
+
+    Returns:
+        tuple: (data now current, new version name or None)
+    """
+    state = read_watch_state(store_dir)
+    live = current_version(store_dir)
+
+    # Incremental only when the watermark belongs to the live snapshot
+    incremental = live is not None and state.get('version') == live and 'last_run_start_ms' in state
+    since_ms = state['last_run_start_ms'] - overlap_ms if incremental else None
+
+    runs = fetch_mlflow_runs(tracking_uri=tracking_uri, since_ms=since_ms)
+    if runs.empty:
+        print(f"💤 No runs since {since_ms}")
+        return current, None
+
+    judgments = iter_run_judgments(runs, tracking_uri=tracking_uri) if with_judgments else None
+    new_matches = runs_to_matches(runs, judgments)
+    watermark = int(pd.to_datetime(runs['start_time'], utc=True).max().value // 1_000_000)
+
+    cube = None
+    if incremental:
+        if current is None:
+            current = load_snapshot(store_dir, live)
+        df, changed, added, removed = merge_match_delta(current, new_matches)
+        if changed:
+            # The live version's cube plus the merge delta, instead of re-aggregating every match
+            cube = load_snapshot_cube(store_dir, live)
+            if cube is not None:
+                cube.update(added, removed)
+    else:
+        df, changed = new_matches, True
+
+    version = None
+    if changed:
+        version = publish_snapshot(df, store_dir, retain, by_month, cube=cube)
+    else:
+        print(f"💤 {len(runs)} run(s) re-read, nothing new")
+
+    write_watch_state({
+        'version': version or live,
+        'last_run_start_ms': max(watermark, state.get('last_run_start_ms', 0) if incremental else 0),
+        'last_poll': datetime.now(timezone.utc).isoformat(),
+    }, store_dir)
+    return df, version
+
+
+def watch(store_dir=SNAPSHOT_DIR, tracking_uri=None, interval=300, jitter=0.1, max_backoff=3600,
+          retain=DEFAULT_RETAIN, max_iterations=None, sleep=time.sleep, by_month=False, with_judgments=False):
+    """
+    Poll MLflow forever, publishing a new snapshot version whenever new runs appear.
+
+    Args:
+        interval: Seconds between polls
+        jitter: Fractional random spread applied to every delay (0.1 = ±10%)
+        max_backoff: Upper bound in seconds on the exponential backoff after failures
+        retain: Number of snapshot versions to keep
+        max_iterations: Stop after this many polls (None runs forever)
+        by_month: Partition each category by month as well as by category
+        with_judgments: Ingest per-sample judgment artifacts instead of win counts
+        sleep: Sleep function (injectable for tests)
+    """
+    print(f"👀 Watching MLflow every ~{interval}s, snapshots in {store_dir} (keeping {retain})")
+    current = None
+    failures = 0
+    iteration = 0
+    while max_iterations is None or iteration < max_iterations:
+        iteration += 1
+        try:
+            current, _ = poll_once(store_dir, tracking_uri, retain, current, by_month=by_month,
+                                   with_judgments=with_judgments)
+            failures = 0
+            delay = _jittered(interval, jitter)
+        except Exception as e:
+            failures += 1
+            delay = _jittered(min(max_backoff, interval * 2 ** failures), jitter)
+            print(f"❌ Poll failed ({failures} in a row): {e}. Retrying in {delay:.0f}s")
+
+        if max_iterations is None or iteration < max_iterations:
+            sleep(delay)
@@ -0,0 +1,314 @@
+"""
+Static HTML/JSON bundle of the leaderboards for read-only viewers.
+
+Most visits only read the rankings, yet each one runs the whole Streamlit
+script: login, data loading and leaderboard computation. build_site() renders
+the same content once per data version into plain files that any web server
+(or object store) can serve with no compute per view:
+
+    site/
+        index.html                    # overview: summary stats, category cards, overall leaderboard
+        categories/extract_claims.html  # one page per category: leaderboard and recent matches
+        data/overview.json            # the numbers behind each page
+        data/extract_claims.json
+        build_state.json              # fingerprints of what each page was rendered from
+
+Pages use the app's CSS and card markup (page_style.py). A category page is
+re-rendered only when the fingerprint of its category's matches changes (or
+the styling, SITE_FORMAT_VERSION or the rating engine's ARTIFACTS_VERSION
+does). The overview depends on every
+match, so it is re-rendered whenever anything changed. Leaderboards come from
+the snapshot's precomputed artifacts when they match the data, so a build
+from a fresh snapshot computes nothing but fingerprints.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from html import escape
+
+import pandas as pd
+
+from artifacts import ARTIFACTS_VERSION, _leaderboard_from_json, _leaderboard_to_json, _recent_matches, compute_data_fingerprint
+from data_utils import calculate_elo_history, create_all_leaderboards, empty_leaderboard, get_summary_stats
+from page_style import (
+    APP_CSS, CARD_CLOSE_HTML, LEADERBOARD_DISPLAY_COLUMNS, STYLE_FINGERPRINT, category_card_open_html,
+    top_model_rows_html
+)
+from snapshot_store import _slug, _write_atomic
+
+SITE_FORMAT_VERSION = 1  # Bump when the page templates below change
+BUILD_STATE_FILENAME = "build_state.json"
+OVERVIEW_PAGE = "index.html"
+CATEGORIES_DIRNAME = "categories"
+DATA_DIRNAME = "data"
+
+# Page layout and tables; the cards themselves use APP_CSS
+SITE_CSS = """
+    body {
+        font-family: "Source Sans Pro", -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
+        color: #31333f;
+        margin: 0;
+    }
+    main { max-width: 1100px; margin: 0 auto; padding: 2rem 1.5rem 4rem; }
+    h1 { font-size: 2.2rem; margin-bottom: 0.25rem; }
+    h2 { margin-top: 2.5rem; }
+    a.back { color: #764ba2; text-decoration: none; font-weight: 600; }
+    .metrics { display: flex; gap: 2rem; margin: 1.5rem 0; }
+    .metric-label { font-size: 0.9rem; opacity: 0.7; }
+    .metric-value { font-size: 2.2rem; }
+    .cards { display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 1rem; }
+    .cards a.view-all-btn { display: inline-block; margin-top: 0.75rem; text-decoration: none; }
+    table.board { border-collapse: collapse; width: 100%; font-size: 0.9rem; }
+    table.board th, table.board td { padding: 0.45rem 0.6rem; border-bottom: 1px solid #e6e9ef; text-align: left; }
+    table.board th { background: #f7f8fb; font-weight: 600; }
+    .win-bar { background: #e6e9ef; border-radius: 4px; height: 0.5rem; width: 6rem; display: inline-block; margin-right: 0.5rem; }
+    .win-bar > span { background: #667eea; border-radius: 4px; height: 100%; display: block; }
+    footer { margin-top: 3rem; font-size: 0.8rem; opacity: 0.6; }
+"""
+
+
+def _cell(value):
+    """Escaped table cell text; missing values show as a dash."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return '—'
+    return escape(str(value))
+
+
+def leaderboard_table_html(leaderboard):
+    """A full leaderboard as an HTML table with the app's column names and win-rate bars."""
+    header = ''.join(f'<th>{escape(name)}</th>' for name in LEADERBOARD_DISPLAY_COLUMNS.values())
+    rows = []
+    for row in leaderboard[list(LEADERBOARD_DISPLAY_COLUMNS)].to_dict('records'):
+        cells = []
+        for column, value in row.items():
+            if column == 'win_rate' and not pd.isna(value):
+                width = min(max(float(value), 0.0), 100.0)
+                cells.append(f'<td><span class="win-bar"><span style="width: {width:.1f}%"></span></span>{value:.1f}%</td>')
+            else:
+                cells.append(f'<td>{_cell(value)}</td>')
+        rows.append(f"<tr>{''.join(cells)}</tr>")
+    return f'<table class="board"><thead><tr>{header}</tr></thead><tbody>{"".join(rows)}</tbody></table>'
+
+
+def recent_matches_table_html(recent):
+    """Recent matches (records of timestamp, model_a, model_b, winner) as an HTML table."""
+    header = ''.join(f'<th>{name}</th>' for name in ('Timestamp', 'Model A', 'Model B', 'Winner'))
+    rows = ''.join(
+        f"<tr>{''.join(f'<td>{_cell(match.get(key))}</td>' for key in ('timestamp', 'model_a', 'model_b', 'winner'))}</tr>"
+        for match in recent
+    )
+    return f'<table class="board"><thead><tr>{header}</tr></thead><tbody>{rows}</tbody></table>'
+
+
+def page_html(title, body, built_at):
+    """A complete page with the app's styles."""
+    return f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{escape(title)}</title>
+<style>{APP_CSS}{SITE_CSS}</style>
+</head>
+<body>
+<main>
+{body}
+<footer>Generated {escape(built_at)} from the leaderboard data. Static snapshot; the live app has filters and ranking views.</footer>
+</main>
+</body>
+</html>
+'''
+
+
+def _metrics_html(metrics):
+    items = ''.join(
+        f'<div><div class="metric-label">{escape(label)}</div><div class="metric-value">{_cell(value)}</div></div>'
+        for label, value in metrics
+    )
+    return f'<div class="metrics">{items}</div>'
+
+
+def category_page_body(category, content):
+    """Body of a category page: match count, the full leaderboard and the recent matches."""
+    parts = [
+        f'<a class="back" href="../{OVERVIEW_PAGE}">← Back to Overview</a>',
+        f'<h1>{escape(category)} Leaderboard</h1>',
+        f'<p><strong>Detailed performance analysis for {escape(category)} task</strong></p>',
+        _metrics_html([("Total Matches in Category", content['matches'])]),
+        f'<h2>{escape(category)} Rankings</h2>',
+    ]
+    leaderboard = _leaderboard_from_json(content['leaderboard'])
+    parts.append(leaderboard_table_html(leaderboard) if not leaderboard.empty
+                 else f'<p>No data available for {escape(category)} category.</p>')
+    parts.append('<h2>Recent Matches</h2>')
+    parts.append(recent_matches_table_html(content['recent_matches']) if content['recent_matches']
+                 else f'<p>No recent matches found for {escape(category)} category.</p>')
+    return '\n'.join(parts)
+
+
+def overview_page_body(overview, category_contents, slugs):
+    """Body of the overview: summary stats, one card per category linking to its page, the overall leaderboard."""
+    stats = overview['summary_stats']
+    parts = [
+        '<h1>🏆 Internal LLM Leaderboard</h1>',
+        '<p><strong>Compare AI model performance across different task categories</strong></p>',
+        _metrics_html([("Total Matches", stats['total_matches']), ("Active Models", stats['unique_models']),
+                       ("Active Tasks", len(overview['categories']))]),
+        '<h2>Task Leaderboards</h2>',
+        '<div class="cards">',
+    ]
+    for category in overview['categories']:
+        leaderboard = _leaderboard_from_json(category_contents[category]['leaderboard'])
+        parts.append(category_card_open_html(category))
+        parts.extend(top_model_rows_html(leaderboard))
+        parts.append(f'<a class="view-all-btn" href="{CATEGORIES_DIRNAME}/{slugs[category]}.html">View Detailed Rankings</a>')
+        parts.append(CARD_CLOSE_HTML)
+    parts.append('</div>')
+    parts.append('<h2>Overall Leaderboard</h2>')
+    overall = _leaderboard_from_json(overview['overall_leaderboard'])
+    parts.append(leaderboard_table_html(overall) if not overall.empty else '<p>No leaderboard data available.</p>')
+    return '\n'.join(parts)
+
+
+def category_fingerprints(df):
+    """Fingerprint of each category's matches, which is all its page depends on."""
+    if df.empty:
+        return {}
+    return {
+        category: compute_data_fingerprint(df[(df['task_category'] == category).to_numpy()])
+        for category in df['task_category'].unique().tolist()
+    }
+
+
+def read_build_state(out_dir):
+    """The previous build's fingerprints, or an empty state when there is none."""
+    try:
+        with open(os.path.join(out_dir, BUILD_STATE_FILENAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def build_site(df, out_dir, artifacts=None, force=False):
+    """
+    Render the static site for a data snapshot, re-rendering only the pages whose data changed.
+
+    Args:
+        df: Match data
+        out_dir: Site directory (created if needed); the previous build there is updated in place
+        artifacts: Precomputed artifacts as returned by load_artifacts; used only if their fingerprint matches df
+        force: Re-render every page
+
+    Returns:
+        dict: Names of the category pages 'rendered', 'unchanged' and 'removed',
+            and whether the 'overview' was rendered
+    """
+    state = read_build_state(out_dir)
+    fingerprint = compute_data_fingerprint(df)
+    fingerprints = category_fingerprints(df)
+    same_templates = (state.get('format') == SITE_FORMAT_VERSION and state.get('style') == STYLE_FINGERPRINT
+                      and state.get('engine') == ARTIFACTS_VERSION)
+    previous = state.get('categories', {}) if same_templates and not force else {}
+
+    if artifacts is not None and artifacts.get('fingerprint') != fingerprint:
+        print("⚠️ Leaderboard artifacts are stale, computing live")
+        artifacts = None
+
+    # Slugs stay stable across builds, so page URLs do not move
+    slugs = {category: entry['slug'] for category, entry in state.get('categories', {}).items() if category in fingerprints}
+    used = set(slugs.values())
+    for category in fingerprints:
+        if category not in slugs:
+            slug = _slug(category)
+            while slug in used:
+                slug += '_'
+            used.add(slug)
+            slugs[category] = slug
+
+    computed = {}
+
+    def leaderboards():
+        # One pass over the matches yields every category board and the overall board
+        if 'leaderboards' not in computed:
+            computed['leaderboards'] = artifacts['leaderboards'] if artifacts else create_all_leaderboards(df)
+        return computed['leaderboards']
+
+    def category_content(category):
+        rows = df[(df['task_category'] == category).to_numpy()]
+        if artifacts:
+            recent = artifacts['recent_matches'].get(category, [])
+            history = artifacts['rating_histories'].get(category, [])
+        else:
+            recent = _recent_matches(df, category)
+            history = calculate_elo_history(rows, category).to_dict('records')
+        return {
+            'category': category,
+            'fingerprint': fingerprints[category],
+            'matches': len(rows),
+            'leaderboard': _leaderboard_to_json(leaderboards().get(category, empty_leaderboard())),
+            'recent_matches': recent,
+            'rating_history': history,
+        }
+
+    os.makedirs(os.path.join(out_dir, CATEGORIES_DIRNAME), exist_ok=True)
+    os.makedirs(os.path.join(out_dir, DATA_DIRNAME), exist_ok=True)
+    built_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')
+
+    contents, rendered, unchanged = {}, [], []
+    for category, category_fingerprint in fingerprints.items():
+        data_path = os.path.join(out_dir, DATA_DIRNAME, f"{slugs[category]}.json")
+        page_path = os.path.join(out_dir, CATEGORIES_DIRNAME, f"{slugs[category]}.html")
+        if previous.get(category, {}).get('fingerprint') == category_fingerprint and os.path.exists(page_path):
+            content = _read_json(data_path)
+            if content is not None:
+                contents[category] = content
+                unchanged.append(category)
+                continue
+        contents[category] = category_content(category)
+        _write_atomic(data_path, json.dumps(contents[category], default=str))
+        _write_atomic(page_path, page_html(f"{category} Leaderboard", category_page_body(category, contents[category]), built_at))
+        rendered.append(category)
+
+    removed = []
+    for category, entry in state.get('categories', {}).items():
+        if category not in fingerprints:
+            for path in (os.path.join(out_dir, CATEGORIES_DIRNAME, f"{entry['slug']}.html"),
+                         os.path.join(out_dir, DATA_DIRNAME, f"{entry['slug']}.json")):
+                if os.path.exists(path):
+                    os.remove(path)
+            removed.append(category)
+
+    overview_path = os.path.join(out_dir, OVERVIEW_PAGE)
+    render_overview = not (previous and state.get('fingerprint') == fingerprint and os.path.exists(overview_path))
+    if render_overview:
+        overview = {
+            'fingerprint': fingerprint,
+            'summary_stats': artifacts['summary_stats'] if artifacts else get_summary_stats(df),
+            'categories': list(fingerprints),
+            'category_match_counts': {category: contents[category]['matches'] for category in fingerprints},
+            'overall_leaderboard': _leaderboard_to_json(leaderboards().get(None, empty_leaderboard())),
+        }
+        _write_atomic(os.path.join(out_dir, DATA_DIRNAME, "overview.json"), json.dumps(overview, default=str))
+        _write_atomic(overview_path, page_html("Internal LLM Leaderboard", overview_page_body(overview, contents, slugs), built_at))
+
+    # Written last: an interrupted build leaves the old state, so the next build redoes its pages
+    _write_atomic(os.path.join(out_dir, BUILD_STATE_FILENAME), json.dumps({
+        'format': SITE_FORMAT_VERSION,
+        'style': STYLE_FINGERPRINT,
+        'engine': ARTIFACTS_VERSION,
+        'fingerprint': fingerprint,
+        'built_at': built_at,
+        'categories': {
+            category: {'fingerprint': fingerprints[category], 'slug': slugs[category]} for category in fingerprints
+        },
+    }, indent=2))
+    return {'rendered': rendered, 'unchanged': unchanged, 'removed': removed, 'overview': render_overview}
@@ -0,0 +1,43 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# The app's modules live at the repository root rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CATEGORIES = ['Extract Dramatis', 'Extract Claims', 'Summarize Relief']
+
+
+def synthetic_matches(n_models=5, n_matches=1200, seed=0, judgments_per_run=4):
+    """
+    Matches between models with hidden strengths, ten minutes apart, with a few ties.
+
+    Timestamps are distinct so every engine replays the matches in the same
+    order. Every judgments_per_run consecutive matches form one run.
+    """
+    rng = np.random.default_rng(seed)
+    models = np.array([f"model-{i}" for i in range(n_models)], dtype=object)
+    strength = rng.normal(0, 1, n_models)
+
+    a = rng.integers(0, n_models, n_matches)
+    b = (a + rng.integers(1, n_models, n_matches)) % n_models
+    a_wins = rng.random(n_matches) < 1 / (1 + np.exp(strength[b] - strength[a]))
+    winner = np.where(a_wins, models[a], models[b])
+    winner[rng.random(n_matches) < 0.05] = 'Tie'
+    return pd.DataFrame({
+        'timestamp': pd.Timestamp('2025-01-01', tz='UTC') + pd.to_timedelta(np.arange(n_matches) * 600, unit='s'),
+        'task_category': np.array(CATEGORIES, dtype=object)[rng.integers(0, len(CATEGORIES), n_matches)],
+        'model_a': models[a],
+        'model_b': models[b],
+        'winner': winner,
+        'run_id': [f"run-{i // judgments_per_run}" for i in range(n_matches)],
+        'judgment_index': np.arange(n_matches) % judgments_per_run,
+    })
+
+
+@pytest.fixture
+def matches():
+    return synthetic_matches
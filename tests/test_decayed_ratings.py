@@ -0,0 +1,55 @@
+import pandas as pd
+
+from decayed_ratings import DecayedRatings
+
+HALF_LIFE_DAYS = 2.0
+
+
+def assert_same_leaderboards(tracker, expected, as_of):
+    boards = tracker.leaderboards(as_of=as_of)
+    expected_boards = expected.leaderboards(as_of=as_of)
+    assert list(boards) == list(expected_boards)
+    for category, board in boards.items():
+        pd.testing.assert_frame_equal(board, expected_boards[category])
+
+
+def test_appended_rows_match_a_full_build(matches):
+    df = matches()
+    as_of = df['timestamp'].max() + pd.Timedelta(days=1)
+    tracker = DecayedRatings(half_life_days=HALF_LIFE_DAYS)
+
+    for end in (100, 101, 600, len(df)):
+        tracker.update_from_frame(df.iloc[:end])
+
+    assert tracker.n_rebuilds == 0
+    assert tracker.n_updates == len(df)
+    assert_same_leaderboards(tracker, DecayedRatings.from_frame(df, half_life_days=HALF_LIFE_DAYS), as_of)
+
+
+def test_single_updates_match_a_full_build(matches):
+    df = matches(n_matches=400)
+    tracker = DecayedRatings(half_life_days=HALF_LIFE_DAYS)
+    for row in df.itertuples(index=False):
+        tracker.update(row.timestamp, row.task_category, row.model_a, row.model_b, row.winner)
+
+    expected = DecayedRatings.from_frame(df, half_life_days=HALF_LIFE_DAYS)
+    assert_same_leaderboards(tracker, expected, as_of=None)
+    assert_same_leaderboards(tracker, expected, as_of=df['timestamp'].max() + pd.Timedelta(days=3))
+
+
+def test_feeding_the_same_frame_again_is_a_no_op(matches):
+    df = matches(n_matches=300)
+    tracker = DecayedRatings.from_frame(df, half_life_days=HALF_LIFE_DAYS)
+
+    assert tracker.update_from_frame(df) == 0
+    assert tracker.n_updates == len(df)
+
+
+def test_backfill_rebuilds_from_the_whole_frame(matches):
+    df = matches()
+    tracker = DecayedRatings.from_frame(df.iloc[len(df) // 2:], half_life_days=HALF_LIFE_DAYS)
+
+    # The older half arrives late: it lands before the newest match already fed
+    assert tracker.update_from_frame(df) == len(df)
+    assert tracker.n_rebuilds == 1
+    assert_same_leaderboards(tracker, DecayedRatings.from_frame(df, half_life_days=HALF_LIFE_DAYS), as_of=None)
@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+
+from data_utils import (
+    calculate_elo_ratings, calculate_glicko_ratings, calculate_tiers, calculate_win_rates, combine_leaderboard,
+    create_all_leaderboards, create_leaderboard, get_top_models_by_category
+)
+
+
+def reference_leaderboard(df, category=None):
+    """A leaderboard built from the per-category functions, one filter-and-recompute each."""
+    win_stats = calculate_win_rates(df, category)
+    glicko = pd.DataFrame.from_dict(calculate_glicko_ratings(df, category), orient='index')
+    return combine_leaderboard(
+        win_stats, calculate_elo_ratings(df, category), calculate_tiers(df, win_stats, category), glicko
+    )
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_all_leaderboards_match_per_category_computation(matches, seed):
+    df = matches(seed=seed)
+    leaderboards = create_all_leaderboards(df)
+
+    assert set(leaderboards) == set(df['task_category'].unique()) | {None}
+    for category, leaderboard in leaderboards.items():
+        pd.testing.assert_frame_equal(leaderboard.reset_index(drop=True),
+                                      reference_leaderboard(df, category).reset_index(drop=True))
+
+
+def test_create_leaderboard_is_the_batch_board(matches):
+    df = matches()
+    leaderboards = create_all_leaderboards(df)
+
+    pd.testing.assert_frame_equal(create_leaderboard(df), leaderboards[None])
+    for category in df['task_category'].unique():
+        pd.testing.assert_frame_equal(create_leaderboard(df, category), leaderboards[category])
+
+
+def test_top_models_follow_category_order(matches):
+    df = matches()
+    top = get_top_models_by_category(df, top_n=2)
+
+    assert list(top) == list(df['task_category'].unique())
+    assert all(len(board) == 2 for board in top.values())
+
+
+def test_empty_data():
+    df = pd.DataFrame(columns=['timestamp', 'task_category', 'model_a', 'model_b', 'winner'])
+    assert list(create_all_leaderboards(df)) == [None]
+    assert create_all_leaderboards(df)[None].empty
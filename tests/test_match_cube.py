@@ -0,0 +1,75 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from data_utils import calculate_tiers, calculate_win_rates, combine_leaderboard, get_summary_stats
+from match_cube import MatchCube
+
+START, END = date(2025, 1, 3), date(2025, 1, 6)
+MODELS = ['model-0', 'model-1', 'model-2', 'model-4']
+
+
+def filter_rows(df, start=None, end=None, categories=None, models=None):
+    """The matches a cube slice should count, selected row by row."""
+    days = df['timestamp'].dt.date
+    keep = pd.Series(True, index=df.index)
+    if start is not None:
+        keep &= days >= start
+    if end is not None:
+        keep &= days <= end
+    if categories is not None:
+        keep &= df['task_category'].isin(categories)
+    if models is not None:
+        keep &= df['model_a'].isin(models) & df['model_b'].isin(models)
+    return df[keep]
+
+
+def row_leaderboard(rows):
+    win_stats = calculate_win_rates(rows)
+    return combine_leaderboard(win_stats, {}, calculate_tiers(rows, win_stats))
+
+
+@pytest.mark.parametrize('start, end, models', [
+    (None, None, None),
+    (START, END, None),
+    (START, None, MODELS),
+    (None, END, MODELS),
+])
+def test_slices_match_row_filtering(matches, start, end, models):
+    df = matches()
+    cube = MatchCube.from_frame(df)
+
+    for categories in (None, ['Extract Claims'], ['Extract Claims', 'Summarize Relief']):
+        rows = filter_rows(df, start, end, categories, models)
+        cube_slice = cube.slice(start, end, categories=categories, models=models)
+
+        pd.testing.assert_frame_equal(cube_slice.leaderboard().reset_index(drop=True),
+                                      row_leaderboard(rows).reset_index(drop=True))
+        stats, expected = cube_slice.summary_stats(), get_summary_stats(rows)
+        assert stats['total_matches'] == expected['total_matches']
+        assert stats['unique_models'] == expected['unique_models']
+        assert set(stats['categories']) == set(expected['categories'])
+
+
+def test_leaderboards_match_row_filtering_per_category(matches):
+    df = matches()
+    boards = MatchCube.from_frame(df).leaderboards(START, END, models=MODELS)
+    rows = filter_rows(df, START, END, models=MODELS)
+
+    assert set(boards) == set(rows['task_category'].unique()) | {None}
+    for category, board in boards.items():
+        in_category = rows if category is None else rows[rows['task_category'] == category]
+        pd.testing.assert_frame_equal(board.reset_index(drop=True), row_leaderboard(in_category).reset_index(drop=True))
+
+
+def test_update_matches_a_rebuild(matches):
+    df = matches()
+    old, added = df.iloc[:800], df.iloc[800:]
+    removed = old.iloc[::7]
+    merged = pd.concat([old.drop(removed.index), added])
+
+    cube = MatchCube.from_frame(old).update(added=added, removed=removed)
+    rebuilt = MatchCube.from_frame(merged)
+    pd.testing.assert_frame_equal(cube.slice(START, END).leaderboard(), rebuilt.slice(START, END).leaderboard())
+    assert cube.total_matches == rebuilt.total_matches == len(merged)
@@ -0,0 +1,63 @@
+import pandas as pd
+
+from data_utils import MATCH_KEY, dedupe_matches, merge_match_delta, merge_matches
+
+
+def test_duplicate_keys_in_new_rows_keep_the_first_copy(matches):
+    new = matches(n_matches=40)
+    # A run listed twice, e.g. across overlapping pages; the second copy is older and has other winners
+    stale = new[new['run_id'] == 'run-3'].assign(winner='Tie')
+    merged, changed, added, removed = merge_match_delta(new.iloc[:0], pd.concat([new, stale], ignore_index=True))
+
+    assert changed
+    assert len(merged) == len(added) == len(new)
+    assert not merged.duplicated(MATCH_KEY).any()
+    pd.testing.assert_frame_equal(merged, new)
+    assert removed.empty
+
+
+def test_merging_the_same_rows_twice_is_a_no_op(matches):
+    df = matches(n_matches=80)
+    merged, changed = merge_matches(df, df)
+    assert not changed
+    assert merged is df
+
+    # Duplicated and reordered copies of the same rows change nothing either
+    again = pd.concat([df, df.iloc[:10]], ignore_index=True).iloc[::-1]
+    merged, changed, added, removed = merge_match_delta(df, again)
+    assert not changed and merged is df
+    assert added.empty and removed.empty
+
+
+def test_a_relogged_run_replaces_all_of_its_rows(matches):
+    existing = matches(n_matches=80)
+    # run-5 is logged again with one judgment fewer and a different outcome
+    relogged = existing[existing['run_id'] == 'run-5'].iloc[:-1].assign(winner='Tie')
+    merged, changed, added, removed = merge_match_delta(existing, relogged)
+
+    assert changed
+    assert len(merged) == len(existing) - 1
+    pd.testing.assert_frame_equal(added, relogged.reset_index(drop=True))
+    assert removed.index.tolist() == existing.index[existing['run_id'] == 'run-5'].tolist()
+    assert (merged[merged['run_id'] == 'run-5']['winner'] == 'Tie').all()
+    assert not merged.duplicated(MATCH_KEY).any()
+
+
+def test_new_runs_are_added_first_and_legacy_rows_are_kept(matches):
+    df = matches(n_matches=80)
+    legacy = df.iloc[:40].drop(columns=['run_id', 'judgment_index'])
+    new = df.iloc[40:]
+    merged, changed, added, removed = merge_match_delta(legacy, new)
+
+    assert changed and removed.empty
+    assert len(merged) == len(legacy) + len(new)
+    # Legacy rows have no judgment_index, so the merged column holds NaN and is float
+    pd.testing.assert_frame_equal(merged.iloc[:len(new)], new.reset_index(drop=True), check_dtype=False)
+    assert merged.iloc[len(new):]['run_id'].isna().all()
+
+
+def test_dedupe_is_idempotent(matches):
+    df = matches(n_matches=40)
+    doubled = dedupe_matches(pd.concat([df, df], ignore_index=True))
+    pd.testing.assert_frame_equal(doubled, df)
+    pd.testing.assert_frame_equal(dedupe_matches(doubled), doubled)
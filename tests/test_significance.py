@@ -0,0 +1,86 @@
+import math
+
+import numpy as np
+import pytest
+
+from significance import EXACT_MAX_MATCHES, adjust_p_values, binomial_test_p_values, pairwise_significance
+
+
+def exact_p_value(successes, trials):
+    """Two-sided exact binomial test against p = 0.5, from binomial coefficients."""
+    return exact_p_values(trials)[successes]
+
+
+def exact_p_values(trials):
+    """exact_p_value for every possible number of successes, from running sums of the coefficients."""
+    tails, total = [], 0
+    for j in range(trials + 1):
+        total += math.comb(trials, j)
+        tails.append(total)
+    return [min(1.0, 2 * tails[min(k, trials - k)] / 2 ** trials) for k in range(trials + 1)]
+
+
+def win_matrix(n_models=6, seed=0):
+    """Head-to-head wins with small, exact-test and approximate-test sample sizes, and one pair that never met."""
+    rng = np.random.default_rng(seed)
+    matches = rng.integers(1, 2 * EXACT_MAX_MATCHES, (n_models, n_models))
+    matches = np.triu(matches, 1)
+    matches[0, 1] = 0
+    wins = rng.binomial(matches, rng.uniform(0.2, 0.8, matches.shape))
+    return wins + np.triu(matches - wins, 1).T
+
+
+def test_small_samples_are_exact():
+    for trials in range(EXACT_MAX_MATCHES + 1):
+        successes = np.arange(trials + 1)
+        expected = exact_p_values(trials)
+        np.testing.assert_allclose(binomial_test_p_values(successes, np.full(trials + 1, trials)), expected,
+                                   rtol=1e-9)
+
+
+def test_large_samples_are_close_to_exact():
+    for trials in (EXACT_MAX_MATCHES + 1, 500, 1000):
+        successes = np.arange(trials + 1)
+        expected = exact_p_values(trials)
+        np.testing.assert_allclose(binomial_test_p_values(successes, np.full(trials + 1, trials)), expected,
+                                   atol=1e-3)
+
+
+def test_pairwise_significance_matches_binomtest():
+    stats = pytest.importorskip("scipy.stats")
+    wins = win_matrix()
+    result = pairwise_significance(wins)
+
+    n_models = len(wins)
+    for i in range(n_models):
+        for j in range(i + 1, n_models):
+            trials = int(wins[i, j] + wins[j, i])
+            expected = stats.binomtest(int(wins[i, j]), trials, 0.5).pvalue if trials else 1.0
+            tolerance = {'rtol': 1e-9} if trials <= EXACT_MAX_MATCHES else {'atol': 1e-3}
+            np.testing.assert_allclose(result['p_value'][i, j], expected, **tolerance)
+            assert result['p_value'][j, i] == result['p_value'][i, j]
+
+
+def test_pairwise_significance_against_the_exact_test():
+    wins = win_matrix(seed=1)
+    result = pairwise_significance(wins, exact_max_matches=10 ** 6)
+    i, j = np.triu_indices(len(wins), k=1)
+    trials = wins[i, j] + wins[j, i]
+
+    expected = [exact_p_value(int(k), int(n)) for k, n in zip(wins[i, j], trials)]
+    np.testing.assert_allclose(result['p_value'][i, j], expected, rtol=1e-9)
+
+    # Only pairs that met count toward the Holm correction
+    played = trials > 0
+    adjusted = np.ones(len(i))
+    adjusted[played] = adjust_p_values(result['p_value'][i, j][played], 'holm')
+    np.testing.assert_allclose(result['p_adjusted'][i, j], adjusted)
+    np.testing.assert_array_equal(result['significant'][i, j], adjusted < 0.05)
+    assert np.isnan(result['win_probability'][0, 1])
+
+
+def test_holm_and_bh_corrections():
+    p_values = np.array([0.01, 0.04, 0.03, 0.005])
+    # Holm: sorted p times (m - rank), made monotone; BH: sorted p times m / (rank + 1), made monotone from the top
+    np.testing.assert_allclose(adjust_p_values(p_values, 'holm'), [0.03, 0.06, 0.06, 0.02])
+    np.testing.assert_allclose(adjust_p_values(p_values, 'bh'), [0.02, 0.04, 0.04, 0.02])
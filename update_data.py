@@ -3,25 +3,79 @@
 Script to update the saved leaderboard data from MLflow.
 Run this locally to refresh the data file for deployment.
 
+Also materializes leaderboard_artifacts.json (every leaderboard, summary
+stats, recent matches and rating histories) so app containers can serve
+precomputed results instead of recomputing them at startup.
+
+With --watch it runs as a daemon instead: it polls MLflow for runs newer
+than the last one seen and publishes each change as a new immutable
+snapshot version (see snapshot_store.py), which running apps pick up
+without a redeploy.
+
+With --judgments, each run's per-sample judgments are downloaded from its
+MLflow artifacts (in parallel, cached on disk by run id) and ingested as
+real matches instead of being expanded from the run's win counts.
+
 Usage:
     python update_data.py
+    python update_data.py --artifacts-only   # rebuild artifacts from the saved data file
+    python update_data.py --watch --interval 300 --retain 10
+    python update_data.py --judgments       # ingest per-sample judgment artifacts
 """
 
-from data_utils import update_saved_data
+import argparse
+
+from data_utils import update_saved_data, load_data_from_json
 
 if __name__ == "__main__":
-    print("🔄 Updating leaderboard data from MLflow...")
-    print("=" * 50)
-    
-    success = update_saved_data()
+    parser = argparse.ArgumentParser(description="Refresh the saved leaderboard data and artifacts")
+    parser.add_argument('--artifacts-only', action='store_true',
+                        help="Rebuild leaderboard_artifacts.json from leaderboard_data.json without contacting MLflow")
+    parser.add_argument('--watch', action='store_true',
+                        help="Keep polling MLflow and publish a new snapshot version whenever runs arrive")
+    parser.add_argument('--interval', type=float, default=300, help="Seconds between polls in watch mode")
+    parser.add_argument('--jitter', type=float, default=0.1, help="Random spread applied to each delay (0.1 = ±10%%)")
+    parser.add_argument('--max-backoff', type=float, default=3600,
+                        help="Longest delay in seconds after repeated poll failures")
+    parser.add_argument('--retain', type=int, default=10, help="Snapshot versions to keep")
+    parser.add_argument('--partition-by-month', action='store_true',
+                        help="Split each category's snapshot partition into one file per month")
+    parser.add_argument('--snapshot-dir', help="Snapshot store directory (default: $LEADERBOARD_SNAPSHOT_DIR or snapshots)")
+    parser.add_argument('--tracking-uri', help="MLflow tracking URI (default: $MLFLOW_TRACKING_URI)")
+    parser.add_argument('--judgments', action='store_true',
+                        help="Ingest each run's per-sample judgment artifact instead of its aggregate win counts")
+    args = parser.parse_args()
+
+    if args.watch:
+        from snapshot_store import SNAPSHOT_DIR, watch
+
+        try:
+            watch(store_dir=args.snapshot_dir or SNAPSHOT_DIR, tracking_uri=args.tracking_uri,
+                  interval=args.interval, jitter=args.jitter, max_backoff=args.max_backoff, retain=args.retain,
+                  by_month=args.partition_by_month, with_judgments=args.judgments)
+        except KeyboardInterrupt:
+            print("👋 Watch stopped")
+        raise SystemExit(0)
+
+    if args.artifacts_only:
+        from artifacts import materialize_artifacts
+
+        print("🔄 Rebuilding leaderboard artifacts from saved data...")
+        print("=" * 50)
+        df = load_data_from_json()
+        success = not df.empty and materialize_artifacts(df)
+    else:
+        print("🔄 Updating leaderboard data from MLflow...")
+        print("=" * 50)
+        success = update_saved_data(tracking_uri=args.tracking_uri, with_judgments=args.judgments)
     
     print("=" * 50)
     if success:
         print("✅ Data update completed successfully!")
         print("📤 Next steps:")
-        print("   1. git add leaderboard_data.json")
+        print("   1. git add leaderboard_data.json leaderboard_artifacts.json")
         print("   2. git commit -m 'Update leaderboard data'")
         print("   3. git push")
         print("   4. Your Streamlit deployment will use the fresh data!")
     else:
-        print("❌ Data update failed. Check your MLflow connection.") 
\ No newline at end of file
+        print("❌ Data update failed. Check your MLflow connection.")